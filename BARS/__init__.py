@@ -1,28 +1,129 @@
-from ._base import ClientObject
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from ._client import BClient
+if TYPE_CHECKING:
+    from ._base import ClientObject
 
-from ._client_async import BClientAsync
+    from ._lazy import LazyList
 
-from ._diary import DiaryDay, DiaryLesson
+    from ._client import BClient
 
-from ._homework import HomeworkDay, HomeworkLesson
+    from ._client_async import BClientAsync
 
-from ._account import AccountInfo, PupilInfo, UnlockedDiscilpine
+    from ._transport import BTransport, get_default_transport
 
-from ._schedule import ScheduleLesson, ScheduleDay, ScheduleMonth
+    from ._batch import BBatchClient, BatchResult
 
-from ._school import SchoolInfo, ClassInfo, Pupil, Employee
+    from ._cache import BaseCache, MemoryCache, DiskCache, DEFAULT_TTL
 
-from ._marks import (SummaryMarks, Mark, TotalMarks, TotalMarksDiscipline,
-                     SummaryMarksDiscipline, AttendaceData, ProgressData, Subperiod)
+    from ._resilience import ResiliencePolicy, CircuitBreaker, DEFAULT_TIMEOUTS
+
+    from ._ratelimit import RateLimiter, TokenBucket, RateLimitStats
+
+    from ._endpoints import Endpoint, ENDPOINTS
+
+    from ._drift import SchemaDrift, schema_drift
+
+    from ._json import JSONDecoder, OrjsonDecoder, MsgspecDecoder, DECODERS, get_decoder
+
+    from ._dates import DateLike, format_date
+
+    from ._diary import DiaryDay, DiaryLesson
+
+    from ._homework import HomeworkDay, HomeworkLesson
+
+    from ._account import AccountInfo, PupilInfo, UnlockedDiscilpine
+
+    from ._schedule import ScheduleLesson, ScheduleDay, ScheduleMonth
+
+    from ._school import SchoolInfo, ClassInfo, Pupil, Employee
+
+    from ._marks import (SummaryMarks, Mark, TotalMarks, TotalMarksDiscipline,
+                         SummaryMarksDiscipline, AttendaceData, ProgressData, Subperiod)
+
+    from ._marks_table import MarksTable
+
+    from ._misc import Event, Birthday
+
+    from ._digest import Digest
+
+# Модуль -> имена. Модули импортируются при первом обращении к имени (PEP 562), поэтому ``import BARS``
+# не загружает httpx, asyncio и клиенты, если нужны только модели.
+_MODULES: dict[str, tuple[str, ...]] = {
+    '._base': ('ClientObject',),
+    '._lazy': ('LazyList',),
+    '._client': ('BClient',),
+    '._client_async': ('BClientAsync',),
+    '._transport': ('BTransport', 'get_default_transport'),
+    '._batch': ('BBatchClient', 'BatchResult'),
+    '._cache': ('BaseCache', 'MemoryCache', 'DiskCache', 'DEFAULT_TTL'),
+    '._resilience': ('ResiliencePolicy', 'CircuitBreaker', 'DEFAULT_TIMEOUTS'),
+    '._ratelimit': ('RateLimiter', 'TokenBucket', 'RateLimitStats'),
+    '._endpoints': ('Endpoint', 'ENDPOINTS'),
+    '._drift': ('SchemaDrift', 'schema_drift'),
+    '._json': ('JSONDecoder', 'OrjsonDecoder', 'MsgspecDecoder', 'DECODERS', 'get_decoder'),
+    '._dates': ('DateLike', 'format_date'),
+    '._diary': ('DiaryDay', 'DiaryLesson'),
+    '._homework': ('HomeworkDay', 'HomeworkLesson'),
+    '._account': ('AccountInfo', 'PupilInfo', 'UnlockedDiscilpine'),
+    '._schedule': ('ScheduleLesson', 'ScheduleDay', 'ScheduleMonth'),
+    '._school': ('SchoolInfo', 'ClassInfo', 'Pupil', 'Employee'),
+    '._marks': (
+        'SummaryMarks', 'Mark', 'TotalMarks', 'TotalMarksDiscipline',
+        'SummaryMarksDiscipline', 'AttendaceData', 'ProgressData', 'Subperiod'
+    ),
+    '._marks_table': ('MarksTable',),
+    '._misc': ('Event', 'Birthday'),
+    '._digest': ('Digest',),
+}
+_ATTRIBUTES: dict[str, str] = {name: module for module, names in _MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'exceptions':  # Подмодуль, доступный как ``BARS.exceptions`` после ``import BARS``
+        return importlib.import_module('.exceptions', __name__)
+    module = _ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
 
-from ._misc import Event, Birthday
 
 __all__ = [
     'ClientObject',
+    'LazyList',
     'BClient',
     'BClientAsync',
+    'BTransport',
+    'get_default_transport',
+    'BBatchClient',
+    'BatchResult',
+    'BaseCache',
+    'MemoryCache',
+    'DiskCache',
+    'DEFAULT_TTL',
+    'ResiliencePolicy',
+    'CircuitBreaker',
+    'DEFAULT_TIMEOUTS',
+    'RateLimiter',
+    'TokenBucket',
+    'RateLimitStats',
+    'Endpoint',
+    'ENDPOINTS',
+    'SchemaDrift',
+    'schema_drift',
+    'JSONDecoder',
+    'OrjsonDecoder',
+    'MsgspecDecoder',
+    'DECODERS',
+    'get_decoder',
+    'DateLike',
+    'format_date',
     'DiaryDay',
     'DiaryLesson',
     'HomeworkDay',
@@ -44,7 +145,9 @@ __all__ = [
     'SummaryMarksDiscipline',
     'AttendaceData',
     'ProgressData',
+    'MarksTable',
     'Event',
     'Birthday',
+    'Digest',
     'Subperiod'
 ]
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from collections.abc import Sequence
+from typing import ClassVar
 
 from ._base import ClientObject
 
@@ -45,18 +46,14 @@ class AccountInfo(ClientObject):
     pupilid: int
     student_id_param_name: str
 
+    _renames: ClassVar[dict[str, str]] = {'pupil_id': 'pupilid'}
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'AccountInfo':
 
-        data['pupilid'] = data['pupil_id']
-        del data['pupil_id']
-
-        for i, discipline in enumerate(data['disciplines']):
-            data['disciplines'][i] = UnlockedDiscilpine.de_json(discipline)
-
         data = super(AccountInfo, cls).de_json(data)
 
         return cls(**data)
@@ -1,16 +1,25 @@
 import dataclasses
-import logging
-import re
-from bs4 import BeautifulSoup
+import functools
+import types
+import typing
 from abc import ABCMeta
-from typing import Self, Any
-from collections.abc import MutableSequence
+from typing import Self, Any, ClassVar, Optional
+from collections.abc import Callable, Iterable, MutableSequence, Sequence
+
+from ._drift import schema_drift
+from ._html import clean_html
+from ._lazy import LazyList
 
 class ClientObject:
     """Базовый класс для всех объектов библиотеки."""
 
     __metaclass__ = ABCMeta
 
+    # Описание преобразования ответа сайта. Используется при первой десериализации класса, см. ``_Deserializer``.
+    _renames: ClassVar[dict[str, str]] = {}  # Название на сайте -> название поля.
+    _coercions: ClassVar[dict[str, Callable[[Any], Any]]] = {}  # Название поля -> преобразование значения.
+    _defaults: ClassVar[dict[str, Callable[[], Any]]] = {}  # Название поля -> значение, если поле отсутствует.
+
     def remove_html_tags(self, __obj: str | dict | MutableSequence | Self = '__dataclass__', *, replace_p_with='\n') -> str | dict | MutableSequence | Self:
         """Преобразует словари, изменяемые последовательности, классы и строки в читабельный формат, без HTML тегов.
         Также заменяет теги <a> на гиперссылки для отправки в Телеграм.
@@ -18,38 +27,62 @@ class ClientObject:
         Аргумент ``replace_p_with`` заменяет теги <p> на введённый символ. По умолчанию новая строка.
 
         Возвращаемый предмет зависит от типа данных __obj. Не меняйте __obj если используете на датаклассе.
+        Объекты библиотеки изменяются на месте, посещаются только поля, которые могут содержать текст.
+        Чтобы не изменять объект, используйте ``without_html_tags``.
         """
 
         if __obj == '__dataclass__':
             __obj = self
 
-        if isinstance(__obj, str):
-            links = re.findall(r'<a href="[^"]+">.+[</a>]', __obj)
-            for link in links:  # Заменяет теги <a> на гиперссылки
-                tag = BeautifulSoup(link, 'lxml').find('a')
-                if tag is None:
-                    raise ValueError("Произошла внутрення ошибка. Найденные ссылки и теги не совпадают.")
-                __obj = __obj.replace(link, f'[{tag.text}]({tag.get('href')}) ')  # pyright: ignore Проблема с bs4
-            __obj = re.sub(r'<[^>]+>', '', __obj.replace('<p', f'{replace_p_with}<p'))
-            if replace_p_with == ' ':
-                __obj = __obj.replace('  ', ' ')  # исключаем двойные <p>
-            return __obj.strip()
+        if isinstance(__obj, ClientObject):
+            _get_cleaner(type(__obj))(__obj, replace_p_with)
+        elif isinstance(__obj, str):
+            return clean_html(__obj, replace_p_with)
         elif isinstance(__obj, MutableSequence):
             for i, item in enumerate(__obj):
-                __obj[i] = self.remove_html_tags(item)
+                __obj[i] = self.remove_html_tags(item, replace_p_with=replace_p_with)
         elif isinstance(__obj, dict):
             for k, v in __obj.copy().items():
-                __obj[k] = self.remove_html_tags(v)
+                __obj[k] = self.remove_html_tags(v, replace_p_with=replace_p_with)
         elif dataclasses.is_dataclass(__obj):
             for f in dataclasses.fields(__obj):
-                __obj.__setattr__(f.name, self.remove_html_tags(__obj.__getattribute__(f.name)))
+                __obj.__setattr__(f.name, self.remove_html_tags(__obj.__getattribute__(f.name), replace_p_with=replace_p_with))
 
         return __obj
 
+    def without_html_tags(self, *, replace_p_with: str = '\n') -> Self:
+        """Получить копию объекта без HTML тегов, см. ``remove_html_tags``. Исходный объект не изменяется.
+
+        Копируются только поля, которые могут содержать текст, остальные значения общие с исходным объектом.
+        """
+
+        return _get_cleaner(type(self))(self, replace_p_with, copy=True)
+
+    @classmethod
+    def batch_without_html_tags(cls, objects: Iterable[Self], *, replace_p_with: str = '\n') -> list[Self]:
+        """Получить копии объектов без HTML тегов, например всех дней недели. Исходные объекты не изменяются.
+
+        Args:
+            objects (Iterable[`BARS.ClientObject`]): Объекты этого класса.
+            replace_p_with (`str`, optional): Замена тегов <p>. По умолчанию новая строка.
+
+        Returns:
+            list[`BARS.ClientObject`]: Очищенные копии в том же порядке.
+        """
+
+        cleaner = _get_cleaner(cls)
+        return [
+            cleaner(obj, replace_p_with, copy=True) if type(obj) is cls else obj.without_html_tags(replace_p_with=replace_p_with)
+            for obj in objects
+        ]
+
     @classmethod
     def de_json(cls, data: dict) -> Any:
         """Десериализация объекта.
 
+        Переименовывает поля, отбрасывает неизвестные, преобразует значения и вложенные объекты
+        согласно аннотациям класса. Исходный словарь не изменяется.
+
         Args:
             data (:obj:`dict`): Поля и значения десериализуемого объекта.
 
@@ -57,23 +90,208 @@ class ClientObject:
             :obj:`dict`, optional: Словарь с валидными аттрибутами для создания датакласса.
         """
 
+        try:
+            deserializer = _deserializers[cls]
+        except KeyError:
+            deserializer = _deserializers[cls] = _Deserializer(cls)
+        return deserializer(data)
+
+    @classmethod
+    def view(cls, data: dict) -> Self:
+        """Создать объект, вложенные последовательности которого (``BARS.LazyList``) преобразуются при обращении.
+
+        В отличие от ``de_json`` не вызывает переопределённые ``de_json`` подклассов.
+
+        Args:
+            data (:obj:`dict`): Поля и значения объекта.
+        """
+
+        try:
+            deserializer = _lazy_deserializers[cls]
+        except KeyError:
+            deserializer = _lazy_deserializers[cls] = _Deserializer(cls, lazy=True)
+        return cls(**deserializer(data))
+
+
+class _Deserializer:
+    """Десериализатор одного класса. Поля, переименования и преобразования вычисляются один раз при создании.
+
+    Если ``lazy``, вложенные последовательности становятся ``BARS.LazyList``, а вложенные объекты создаются через ``view``.
+    """
+
+    __slots__ = ('cls', 'fields', 'renames', 'converters', 'defaults')
+
+    def __init__(self, cls: type[ClientObject], lazy: bool = False) -> None:
         if not dataclasses.is_dataclass(cls):
             raise TypeError("Ожидался датакласс.")
 
-        data = data.copy()
+        self.cls = cls
+        self.fields = frozenset(f.name for f in dataclasses.fields(cls))
+        self.renames = tuple(cls._renames.items())
+        self.defaults = tuple(cls._defaults.items())
+
+        converters = {}
+        hints = typing.get_type_hints(cls)
+        for name in self.fields:
+            model, is_sequence = _nested_model(hints.get(name))
+            if model is not None:
+                if lazy:
+                    converters[name] = functools.partial(LazyList, model=model) if is_sequence else model.view
+                else:
+                    converters[name] = _sequence_converter(model) if is_sequence else _object_converter(model)
+        converters.update(cls._coercions)
+        self.converters = tuple(converters.items())
+
+    def __call__(self, data: dict) -> dict:
+        cleaned = dict(data)
+        for key, name in self.renames:
+            if key in cleaned:
+                cleaned[name] = cleaned.pop(key)
+
+        if not cleaned.keys() <= self.fields:
+            unknown_data = {k: cleaned.pop(k) for k in cleaned.keys() - self.fields}
+            schema_drift.report(self.cls, unknown_data)
+
+        for name, converter in self.converters:
+            value = cleaned.get(name)
+            if value is not None:
+                cleaned[name] = converter(value)
+        for name, default in self.defaults:
+            if name not in cleaned:
+                cleaned[name] = default()
+
+        return cleaned
+
+
+_deserializers: dict[type, _Deserializer] = {}
+_lazy_deserializers: dict[type, _Deserializer] = {}
+
+
+class _HtmlCleaner:
+    """Очистка HTML одного класса. Поля, которые могут содержать текст, вычисляются по аннотациям один раз при создании.
+
+    Числа, логические значения и последовательности чисел не посещаются.
+    """
+
+    __slots__ = ('cls', 'names', 'fields')
+
+    def __init__(self, cls: type[ClientObject]) -> None:
+        if not dataclasses.is_dataclass(cls):
+            raise TypeError("Ожидался датакласс.")
+
+        self.cls = cls
+        self.names = tuple(f.name for f in dataclasses.fields(cls) if f.init)
+        hints = typing.get_type_hints(cls)
+        fields = []
+        for name in self.names:
+            kind = _text_kind(hints.get(name))
+            if kind is not None:
+                fields.append((name, kind))
+        self.fields = tuple(fields)
+
+    def __call__(self, obj: Any, replace_p_with: str, copy: bool = False) -> Any:
+        """Очистить объект на месте или, если ``copy``, вернуть очищенную копию."""
+
+        values = {}
+        for name, kind in self.fields:
+            value = getattr(obj, name)
+            if value is None:
+                continue
+            match kind:
+                case 'str' if isinstance(value, str):
+                    values[name] = clean_html(value, replace_p_with)
+                case 'strs' if isinstance(value, list):
+                    values[name] = [
+                        clean_html(item, replace_p_with) if isinstance(item, str) else _clean_any(item, replace_p_with)
+                        for item in value
+                    ]
+                case 'object' if isinstance(value, ClientObject):
+                    if copy:
+                        values[name] = _get_cleaner(type(value))(value, replace_p_with, copy)
+                    else:
+                        _get_cleaner(type(value))(value, replace_p_with)
+                case 'objects' if copy:
+                    values[name] = [_clean_any(item, replace_p_with) for item in value]
+                case 'objects':
+                    for i, item in enumerate(value):
+                        if isinstance(item, ClientObject):
+                            _get_cleaner(type(item))(item, replace_p_with)
+                        else:
+                            value[i] = _clean_any(item, replace_p_with)
+                case _:
+                    values[name] = _clean_any(value, replace_p_with)
+
+        if copy:
+            return self.cls(**{name: values.get(name, getattr(obj, name)) for name in self.names})
+        for name, value in values.items():
+            setattr(obj, name, value)
+        return obj
+
+
+_cleaners: dict[type, _HtmlCleaner] = {}
+
+
+def _get_cleaner(cls: type[ClientObject]) -> _HtmlCleaner:
+    try:
+        return _cleaners[cls]
+    except KeyError:
+        cleaner = _cleaners[cls] = _HtmlCleaner(cls)
+        return cleaner
+
+
+def _text_kind(hint: Any) -> Optional[str]:
+    """Определить по аннотации поля, как его очищать. None - поле не может содержать текст."""
+
+    if typing.get_origin(hint) in (typing.Union, types.UnionType):
+        hint = next((arg for arg in typing.get_args(hint) if arg is not type(None)), None)
+    if hint in (int, float, bool):
+        return None
+    if hint is str:
+        return 'str'
+    model, is_sequence = _nested_model(hint)
+    if model is not None:
+        return 'objects' if is_sequence else 'object'
+    if typing.get_origin(hint) in (Sequence, MutableSequence, list, tuple):
+        args = typing.get_args(hint)
+        if args and args[0] in (int, float, bool):
+            return None
+        if args and args[0] is str:
+            return 'strs'
+    return 'any'
+
+
+def _clean_any(value: Any, replace_p_with: str) -> Any:
+    """Очистить значение неизвестного типа (например, словари материалов), не изменяя его."""
+
+    if isinstance(value, str):
+        return clean_html(value, replace_p_with)
+    if isinstance(value, ClientObject):
+        return _get_cleaner(type(value))(value, replace_p_with, copy=True)
+    if isinstance(value, dict):
+        return {k: _clean_any(v, replace_p_with) for k, v in value.items()}
+    if isinstance(value, (list, tuple, MutableSequence)):
+        return [_clean_any(item, replace_p_with) for item in value]
+    return value
+
+
+def _nested_model(hint: Any) -> tuple[Optional[type[ClientObject]], bool]:
+    """Найти вложенный класс библиотеки в аннотации поля. Возвращает класс и является ли поле последовательностью."""
 
-        fields = {f.name for f in dataclasses.fields(cls)}
+    if typing.get_origin(hint) in (typing.Union, types.UnionType):
+        hint = next((arg for arg in typing.get_args(hint) if arg is not type(None)), None)
+    if isinstance(hint, type) and issubclass(hint, ClientObject):
+        return hint, False
+    if typing.get_origin(hint) in (Sequence, MutableSequence, list, tuple):
+        args = typing.get_args(hint)
+        if args and isinstance(args[0], type) and issubclass(args[0], ClientObject):
+            return args[0], True
+    return None, False
 
-        cleaned_data = {}
-        unknown_data = {}
 
-        for k, v in data.items():
-            if k in fields:
-                cleaned_data[k] = v
-            else:
-                unknown_data[k] = v
+def _object_converter(model: type[ClientObject]) -> Callable[[dict], ClientObject]:
+    return model.de_json
 
-        if unknown_data:
-            logging.warning(f'Были получены неизвестные аттриубты для класса {cls} :: {unknown_data}')
 
-        return cleaned_data
+def _sequence_converter(model: type[ClientObject]) -> Callable[[list], list]:
+    de_json = model.de_json
+    return lambda items: [de_json(item) for item in items]
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from collections.abc import AsyncIterator, Iterable
+from typing import Optional, Any
+
+from ._base import ClientObject
+from ._client_async import BClientAsync
+from ._transport import BTransport, get_default_transport
+from ._cache import BaseCache
+from ._json import JSONDecoder
+from ._resilience import ResiliencePolicy
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+@dataclass(slots=True)
+class BatchResult(ClientObject):
+    """Класс, представляющий результат запроса для одной сессии.
+
+    Attributes:
+        sessionid (`str`): Идентификатор сессии.
+        result (`Any`, optional): Результат запроса. None, если запрос завершился ошибкой.
+        error (`Exception`, optional): Ошибка запроса. None, если запрос выполнен успешно.
+    """
+
+    sessionid: str
+    result: Any = None
+    error: Optional[Exception] = None
+
+
+class BBatchClient:
+    """Класс, представляющий клиент для выполнения одного и того же запроса от имени многих сессий.
+
+    Все запросы выполняются через общий пул соединений с ограничением одновременных запросов.
+    Частота запросов ограничивается ``BARS.RateLimiter`` транспорта, как и для остальных клиентов.
+
+    Пример::
+
+        async for item in BBatchClient(sessionids).stream('get_diary', date):
+            ...
+
+    Args:
+        sessionids (Iterable[`str`]): Идентификаторы сессий.
+        transport (`BARS.BTransport`, optional): Общий транспорт с пулом соединений.
+            Если не указан, используется общий для процесса транспорт.
+        concurrency (`int`, optional): Максимальное кол-во одновременно выполняемых запросов.
+        base_url (`str`, optional): Ссылка на домен сайта.
+        headers (`dict`, optional): Словарь, содержащий сведения об устройстве, с которого выполняются запросы.
+        cache (`BARS.BaseCache`, optional): Общий для всех сессий кэш ответов.
+        policy (`BARS.ResiliencePolicy`, optional): Общая для всех сессий политика устойчивости запросов.
+        lazy (`bool`, optional): Возвращать ли ленивые объекты, см. ``BARS.BClientAsync``.
+        decoder (`BARS.JSONDecoder`, optional): Декодер JSON ответов. По умолчанию самый быстрый из установленных.
+
+    Attributes:
+        sessionids (Sequence[`str`]): Идентификаторы сессий.
+        transport (`BARS.BTransport`): Общий транспорт с пулом соединений.
+        concurrency (`int`): Максимальное кол-во одновременно выполняемых запросов.
+    """
+
+    def __init__(
+            self,
+            sessionids: Iterable[str],
+            *,
+            transport: Optional[BTransport] = None,
+            concurrency: int = 50,
+            base_url: Optional[str] = None,
+            headers: Optional[dict] = None,
+            cache: Optional[BaseCache] = None,
+            policy: Optional[ResiliencePolicy] = None,
+            lazy: bool = False,
+            decoder: Optional[JSONDecoder] = None) -> None:
+
+        if concurrency < 1:
+            raise ValueError("Кол-во одновременных запросов должно быть положительным.")
+
+        self.sessionids = list(sessionids)
+        self.transport = transport or get_default_transport()
+        self.concurrency = concurrency
+        self.base_url = base_url
+        self.headers = headers
+        self.cache = cache
+        self.policy = policy or ResiliencePolicy()
+        self.lazy = lazy
+        self.decoder = decoder
+
+    def _get_client(self, sessionid: str) -> BClientAsync:
+        return BClientAsync(
+            sessionid,
+            base_url=self.base_url,
+            headers=self.headers,
+            transport=self.transport,
+            cache=self.cache,
+            policy=self.policy,
+            lazy=self.lazy,
+            decoder=self.decoder
+        )
+
+    async def _call(self, sessionid: str, method: str, args: tuple, kwargs: dict) -> BatchResult:
+        try:
+            client = self._get_client(sessionid)
+            return BatchResult(sessionid, await getattr(client, method)(*args, **kwargs))
+        except Exception as e:
+            logging.getLogger(__name__).debug(f'Запрос {method} завершился ошибкой :: {e!r}')
+            return BatchResult(sessionid, error=e)
+
+    async def stream(self, method: str, *args, **kwargs) -> AsyncIterator[BatchResult]:
+        """Выполнить запрос для всех сессий, возвращая результаты по мере их получения.
+
+        Args:
+            method (`str`): Название метода ``BClientAsync``, например ``'get_diary'``.
+            *args, **kwargs: Аргументы метода.
+
+        Yields:
+            `BARS.BatchResult`: Результат запроса для одной сессии. Порядок не гарантируется.
+        """
+
+        if not method.startswith('get_') or not callable(getattr(BClientAsync, method, None)):
+            raise ValueError(f"Неизвестный метод '{method}'.")
+
+        sessionids = iter(self.sessionids)
+        results: asyncio.Queue[BatchResult] = asyncio.Queue()
+
+        async def worker() -> None:
+            for sessionid in sessionids:  # Итератор общий для всех воркеров
+                results.put_nowait(await self._call(sessionid, method, args, kwargs))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(self.sessionids)))]
+        try:
+            for _ in range(len(self.sessionids)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def run(self, method: str, *args, **kwargs) -> list[BatchResult]:
+        """Выполнить запрос для всех сессий и дождаться всех результатов.
+
+        Args:
+            method (`str`): Название метода ``BClientAsync``, например ``'get_diary'``.
+            *args, **kwargs: Аргументы метода.
+
+        Returns:
+            list[`BARS.BatchResult`]: Результаты в порядке переданных сессий.
+        """
+
+        order = {sessionid: i for i, sessionid in enumerate(self.sessionids)}
+        results = [item async for item in self.stream(method, *args, **kwargs)]
+        return sorted(results, key=lambda item: order[item.sessionid])
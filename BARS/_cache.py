@@ -0,0 +1,230 @@
+import json
+import time
+import sqlite3
+import threading
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Any
+
+# Время жизни ответов по умолчанию в секундах. Данные этих вкладок меняются не чаще раза в день.
+DEFAULT_TTL: dict[str, float] = {
+    'api/SchoolService/getSchoolInfo': 24 * 60 * 60,
+    'api/SchoolService/getClassYearInfo': 24 * 60 * 60,
+    'api/MarkService/GetVisualizationData': 24 * 60 * 60,
+    'api/MarkService/GetTotalMarks': 24 * 60 * 60,
+    'api/ProfileService/GetPersonData': 24 * 60 * 60,
+}
+
+
+class BaseCache(metaclass=ABCMeta):
+    """Базовый класс для кэша ответов сайта.
+
+    Ключом записи является (sessionid, адрес запроса, параметры), значением - текст ответа.
+    Кэшируются только запросы, для адреса которых указано время жизни.
+
+    Args:
+        ttl (`dict[str, float]`, optional): Время жизни ответов в секундах по адресу запроса.
+            По умолчанию ``BARS.DEFAULT_TTL``.
+        default_ttl (`float`, optional): Время жизни ответов для адресов, не указанных в ``ttl``.
+            По умолчанию такие ответы не кэшируются.
+        maxsize (`int`, optional): Максимальное кол-во записей. При превышении удаляются давно не используемые записи.
+    """
+
+    def __init__(
+            self,
+            *,
+            ttl: Optional[dict[str, float]] = None,
+            default_ttl: Optional[float] = None,
+            maxsize: int = 1024) -> None:
+
+        self.ttl = DEFAULT_TTL.copy() if ttl is None else ttl
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+
+    def get_ttl(self, endpoint: str) -> Optional[float]:
+        """Получить время жизни ответов для адреса запроса. None, если ответы не кэшируются."""
+
+        return self.ttl.get(endpoint, self.default_ttl)
+
+    @staticmethod
+    def make_key(sessionid: str, endpoint: str, params: Optional[dict]) -> str:
+        """Сформировать ключ записи."""
+
+        return json.dumps([sessionid, endpoint, sorted((params or {}).items())], default=str, ensure_ascii=False)
+
+    def get(self, sessionid: str, endpoint: str, params: Optional[dict] = None, *, allow_stale: bool = False) -> Optional[str]:
+        """Получить текст ответа из кэша. None, если записи нет или её время жизни истекло.
+
+        Если ``allow_stale`` истинно, возвращает и устаревшие записи, которые ещё не были вытеснены.
+        """
+
+        if self.get_ttl(endpoint) is None:
+            return None
+        return self._get(self.make_key(sessionid, endpoint, params), allow_stale)
+
+    def set(self, sessionid: str, endpoint: str, params: Optional[dict], value: str) -> None:
+        """Записать текст ответа в кэш, если для адреса запроса указано время жизни."""
+
+        ttl = self.get_ttl(endpoint)
+        if ttl is None:
+            return
+        self._set(self.make_key(sessionid, endpoint, params), sessionid, endpoint, value, time.time() + ttl)
+
+    @abstractmethod
+    def _get(self, key: str, allow_stale: bool) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, sessionid: str, endpoint: str, value: str, expires: float) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate(self, sessionid: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        """Удалить записи, соответствующие sessionid и/или адресу запроса. Без аргументов очищает весь кэш.
+
+        Returns:
+            `int`: Кол-во удалённых записей.
+        """
+
+    def clear(self) -> None:
+        """Очистить кэш."""
+
+        self.invalidate()
+
+
+@dataclass(slots=True)
+class _Entry:
+    sessionid: str
+    endpoint: str
+    value: str
+    expires: float
+
+
+class MemoryCache(BaseCache):
+    """Класс, представляющий кэш ответов в памяти процесса (LRU). Безопасен для использования из нескольких потоков.
+
+    Args:
+        ttl (`dict[str, float]`, optional): Время жизни ответов в секундах по адресу запроса.
+            По умолчанию ``BARS.DEFAULT_TTL``.
+        default_ttl (`float`, optional): Время жизни ответов для адресов, не указанных в ``ttl``.
+        maxsize (`int`, optional): Максимальное кол-во записей.
+    """
+
+    def __init__(
+            self,
+            *,
+            ttl: Optional[dict[str, float]] = None,
+            default_ttl: Optional[float] = None,
+            maxsize: int = 1024) -> None:
+
+        super().__init__(ttl=ttl, default_ttl=default_ttl, maxsize=maxsize)
+        self._data: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _get(self, key: str, allow_stale: bool) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry.expires < time.time() and not allow_stale:
+                return None  # Запись остаётся на случай недоступности сайта
+            self._data.move_to_end(key)
+            return entry.value
+
+    def _set(self, key: str, sessionid: str, endpoint: str, value: str, expires: float) -> None:
+        with self._lock:
+            self._data[key] = _Entry(sessionid, endpoint, value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, sessionid: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        with self._lock:
+            keys = [
+                key for key, entry in self._data.items()
+                if (sessionid is None or entry.sessionid == sessionid) and (endpoint is None or entry.endpoint == endpoint)
+            ]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+
+class DiskCache(BaseCache):
+    """Класс, представляющий кэш ответов на диске (SQLite). Переживает перезапуск процесса.
+
+    Args:
+        path (`str` | `Path`): Путь к файлу кэша.
+        ttl (`dict[str, float]`, optional): Время жизни ответов в секундах по адресу запроса.
+            По умолчанию ``BARS.DEFAULT_TTL``.
+        default_ttl (`float`, optional): Время жизни ответов для адресов, не указанных в ``ttl``.
+        maxsize (`int`, optional): Максимальное кол-во записей.
+    """
+
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            ttl: Optional[dict[str, float]] = None,
+            default_ttl: Optional[float] = None,
+            maxsize: int = 65536) -> None:
+
+        super().__init__(ttl=ttl, default_ttl=default_ttl, maxsize=maxsize)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, sessionid TEXT, endpoint TEXT, value TEXT, expires REAL, used REAL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS cache_used ON cache (used)')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def _get(self, key: str, allow_stale: bool) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute('SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now and not allow_stale:
+                return None  # Запись остаётся на случай недоступности сайта
+            self._connection.execute('UPDATE cache SET used = ? WHERE key = ?', (now, key))
+            return row[0]
+
+    def _set(self, key: str, sessionid: str, endpoint: str, value: str, expires: float) -> None:
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)',
+                (key, sessionid, endpoint, value, expires, time.time())
+            )
+            self._connection.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                (self.maxsize,)
+            )
+
+    def invalidate(self, sessionid: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        conditions: list[str] = []
+        args: list[Any] = []
+        if sessionid is not None:
+            conditions.append('sessionid = ?')
+            args.append(sessionid)
+        if endpoint is not None:
+            conditions.append('endpoint = ?')
+            args.append(endpoint)
+        query = 'DELETE FROM cache' + (' WHERE ' + ' AND '.join(conditions) if conditions else '')
+        with self._lock:
+            return self._connection.execute(query, args).rowcount
+
+    def close(self) -> None:
+        """Закрыть файл кэша."""
+
+        with self._lock:
+            self._connection.close()
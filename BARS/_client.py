@@ -1,20 +1,27 @@
-import json
+import time
 import httpx
 import logging
 import functools
-from collections.abc import Sequence, Callable
+from collections.abc import Sequence, Callable, Iterator
 from typing import Optional, Literal, Any, Self, Type
 from types import TracebackType
 
-from .exceptions import Unauthorized, BClientException, InternalError
+from .exceptions import InternalError, CircuitOpenError
 from ._base import ClientObject
 from ._diary import DiaryDay
 from ._schedule import ScheduleDay, ScheduleMonth
 from ._marks import SummaryMarks, TotalMarks, AttendaceData, ProgressData
 from ._account import AccountInfo, PupilInfo
-from ._school import SchoolInfo, ClassInfo
+from ._school import SchoolInfo, ClassInfo, Employee
 from ._homework import HomeworkDay
 from ._misc import Event, Birthday
+from ._endpoints import ENDPOINTS
+from ._json import JSONDecoder, get_decoder
+from ._dates import DateLike
+from ._stream import StreamParser
+from ._transport import BTransport, get_default_transport
+from ._cache import BaseCache
+from ._resilience import ResiliencePolicy
 
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -46,6 +53,13 @@ class BClient(ClientObject):
         base_url (`str`, optional): Ссылка на домен сайта.
         headers (`dict`, optional): Словарь, содержащий сведения об устройстве, с которого выполняются запросы.
             Используется при каждом запросе на сайт.
+        transport (`BARS.BTransport`, optional): Общий транспорт с пулом соединений. Если не указан,
+            вне контекстного менеджера используется общий для процесса транспорт.
+        cache (`BARS.BaseCache`, optional): Кэш ответов. По умолчанию ответы не кэшируются.
+        policy (`BARS.ResiliencePolicy`, optional): Политика таймаутов, повторов и автоматического выключателя.
+        lazy (`bool`, optional): Возвращать ли ленивые объекты: вложенные объекты создаются при первом обращении,
+            последовательности возвращаются как ``BARS.LazyList``. Уменьшает время и память для больших ответов.
+        decoder (`BARS.JSONDecoder`, optional): Декодер JSON ответов. По умолчанию самый быстрый из установленных.
 
     Attributes:
         sessionid (`str`): Идентификатор вашей сессии.
@@ -53,6 +67,11 @@ class BClient(ClientObject):
         base_url (`str`, optional): Ссылка на домен сайта.
         headers (`dict`, optional): Словарь, содержащий сведения об устройстве, с которого выполняются запросы.
             Используется при каждом запросе на сайт.
+        transport (`BARS.BTransport`, optional): Общий транспорт с пулом соединений.
+        cache (`BARS.BaseCache`, optional): Кэш ответов.
+        policy (`BARS.ResiliencePolicy`): Политика таймаутов, повторов и автоматического выключателя.
+        lazy (`bool`): Возвращаются ли ленивые объекты.
+        decoder (`BARS.JSONDecoder`): Декодер JSON ответов.
     """
 
     def __init__(
@@ -61,7 +80,12 @@ class BClient(ClientObject):
             *,
             proxy: Optional[str] = None,
             base_url: Optional[str] = None,
-            headers: Optional[dict] = None) -> None:
+            headers: Optional[dict] = None,
+            transport: Optional[BTransport] = None,
+            cache: Optional[BaseCache] = None,
+            policy: Optional[ResiliencePolicy] = None,
+            lazy: bool = False,
+            decoder: Optional[JSONDecoder] = None) -> None:
 
         self.sessionid = sessionid
 
@@ -79,9 +103,15 @@ class BClient(ClientObject):
 
         self._httpx_client: Optional[httpx.Client] = None
         self.proxy = proxy
+        self.transport = transport
+        self.cache = cache
+        self.policy = policy or ResiliencePolicy()
+        self.lazy = lazy
+        self.decoder = decoder or get_decoder()
 
     def __enter__(self) -> Self:
-        self._httpx_client = httpx.Client(proxy=self.proxy)
+        if self.transport is None:
+            self._httpx_client = httpx.Client(proxy=self.proxy)
         return self
 
     def __exit__(
@@ -92,112 +122,239 @@ class BClient(ClientObject):
     ) -> None:
         if self._httpx_client:
             self._httpx_client.close()
+            self._httpx_client = None
+
+    @property
+    def _client(self) -> httpx.Client:
+        """Пул соединений, через который выполняются запросы."""
+
+        if self._httpx_client is not None:
+            return self._httpx_client
+        return (self.transport or get_default_transport()).client
+
+    def _get_headers(self) -> dict:
+        """Заголовки запроса. Сессия передаётся заголовком: cookie пула соединений общие для всех клиентов транспорта."""
+
+        return {**self.headers, 'cookie': f'sessionid={self.sessionid}'}
+
+    def _get_timeout(self, endpoint: str) -> Any:
+        """Таймаут запроса из ``policy``. Если он не указан, используется таймаут пула соединений."""
+
+        timeout = self.policy.get_timeout(endpoint)
+        return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+
+    def _send(
+            self,
+            method: Literal['GET', 'POST'],
+            endpoint: str,
+            params: Optional[dict],
+            data: Optional[dict]) -> tuple[Any, bytes]:
+        """Выполнить один запрос к сайту. Сетевые ошибки, ответы 5xx и ответы не в формате JSON вызывают ``InternalError``.
+
+        Returns:
+            tuple[`Any`, `bytes`]: Декодированный JSON ответ и тело ответа.
+        """
+
+        limiter = (self.transport or get_default_transport()).rate_limiter
+        if limiter is not None:
+            limiter.acquire(self.sessionid)
+
+        try:
+            response = self._client.request(
+                method,
+                self.base_url + endpoint,
+                headers=self._get_headers(),
+                params=params,
+                data=data,
+                timeout=self._get_timeout(endpoint)
+            )
+            if response.is_server_error:
+                raise InternalError(f'Сайт вернул код {response.status_code}.')
+            content = response.content
+            return self.decoder.loads(content), content
+        except (httpx.TransportError, ValueError) as e:
+            raise InternalError('В данный момент сайт недоступен.') from e
+
+    def _request(
+            self,
+            method: Literal['GET', 'POST'],
+            endpoint: str,
+            *,
+            params: Optional[dict] = None,
+            data: Optional[dict] = None) -> Any:
+        """Выполнить запрос к сайту и декодировать ответ. Если указан кэш, сначала ищет ответ в нём.
+
+        Неудачные запросы повторяются и учитываются согласно ``policy``.
+
+        Args:
+            method (`LiteralString`): HTTP метод.
+            endpoint (`str`): Адрес запроса относительно ``base_url``.
+            params (`dict`, optional): Параметры запроса.
+            data (`dict`, optional): Тело POST запроса.
+
+        Returns:
+            `Any`: Декодированный JSON ответ.
+        """
+
+        key_params = params if params is not None else data
+        if self.cache is not None:
+            cached = self.cache.get(self.sessionid, endpoint, key_params)
+            if cached is not None:
+                return self.decoder.loads(cached)
+
+        error: InternalError = CircuitOpenError('Сайт временно недоступен.')
+        for attempt in range(self.policy.get_attempts(method)):
+            if attempt:
+                time.sleep(self.policy.get_delay(attempt))
+            if not self.policy.allow():
+                break
+            try:
+                result, content = self._send(method, endpoint, params, data)
+            except InternalError as e:
+                logging.getLogger(__name__).debug(f'Попытка {attempt + 1} запроса {endpoint} не удалась :: {e.__cause__ or e}')
+                self.policy.record(False)
+                error = e
+                continue
+
+            self.policy.record(True)
+            if self.cache is not None and not (isinstance(result, dict) and 'faultcode' in result):
+                self.cache.set(self.sessionid, endpoint, key_params, content.decode())
+            return result
+
+        if self.cache is not None and self.policy.serve_stale:
+            cached = self.cache.get(self.sessionid, endpoint, key_params, allow_stale=True)
+            if cached is not None:
+                return self.decoder.loads(cached)
+        raise error
+
+    def _call(self, name: str, **arguments: Any) -> Any:
+        """Выполнить метод API из ``BARS.ENDPOINTS`` и преобразовать ответ в объекты библиотеки.
+
+        Args:
+            name (`str`): Название метода клиента.
+            **arguments: Аргументы метода.
+
+        Returns:
+            `Any`: Результат метода.
+        """
+
+        endpoint = ENDPOINTS[name]
+        params, data = endpoint.build(arguments)
+        result = self._request(endpoint.method, endpoint.path, params=params, data=data)
+        return endpoint.parse(result, self.base_url, self.lazy)
+
+    def _read_stream(
+            self,
+            method: Literal['GET', 'POST'],
+            endpoint: str,
+            params: Optional[dict],
+            data: Optional[dict],
+            parser: StreamParser) -> Iterator[list[Any]]:
+        """Выполнить один потоковый запрос и передавать части тела ответа в ``parser``. Ошибки как в ``_send``.
+
+        Returns:
+            Iterator[list[`Any`]]: Элементы, полученные из каждой части ответа.
+        """
+
+        try:
+            with self._client.stream(
+                method,
+                self.base_url + endpoint,
+                headers=self._get_headers(),
+                params=params,
+                data=data,
+                timeout=self._get_timeout(endpoint)
+            ) as response:
+                if response.is_server_error:
+                    raise InternalError(f'Сайт вернул код {response.status_code}.')
+                for chunk in response.iter_bytes():
+                    yield parser.feed(chunk)
+                yield parser.close()
+        except (httpx.TransportError, ValueError) as e:
+            raise InternalError('В данный момент сайт недоступен.') from e
+
+    def _stream(self, name: str, path: tuple[str, ...], model: Type[ClientObject], **arguments: Any) -> Iterator[Any]:
+        """Выполнить метод API из ``BARS.ENDPOINTS`` и возвращать объекты по пути ``path`` по мере чтения ответа.
+
+        Ответ не хранится целиком, поэтому кэш и повторы не используются. Ограничение частоты запросов,
+        таймауты и автоматический выключатель работают как у обычных методов.
+
+        Args:
+            name (`str`): Название метода клиента.
+            path (tuple[`str`, ...]): Путь до элементов в ответе, см. ``StreamParser``.
+            model (`type[BARS.ClientObject]`): Класс элементов.
+            **arguments: Аргументы метода.
+
+        Returns:
+            Iterator[`Any`]: Объекты библиотеки.
+        """
+
+        endpoint = ENDPOINTS[name]
+        params, data = endpoint.build(arguments)
+
+        limiter = (self.transport or get_default_transport()).rate_limiter
+        if limiter is not None:
+            limiter.acquire(self.sessionid)
+        if not self.policy.allow():
+            raise CircuitOpenError('Сайт временно недоступен.')
+
+        convert = model.view if self.lazy else model.de_json
+        parser = StreamParser(path)
+        try:
+            for items in self._read_stream(endpoint.method, endpoint.path, params, data, parser):
+                for item in items:
+                    yield convert(item)
+        except InternalError:
+            self.policy.record(False)
+            raise
+        self.policy.record(True)
+        endpoint.check(parser.rest)
 
     @log
-    def get_diary(self, date: str) -> Sequence[DiaryDay]:
+    def get_diary(self, date: DateLike) -> Sequence[DiaryDay]:
         """Получить данные из вкладки 'Дневник'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.DiaryDay`]: Неделя из дневника.
         """
 
-        url = self.base_url + 'api/ScheduleService/GetDiary'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                params={'date': date, 'is_diary': True},
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return [DiaryDay.de_json(day) for day in result['days']]
+        return self._call('get_diary', date=date)
 
     @log
-    def get_week_schedule(self, date: str) -> Sequence[ScheduleDay]:
+    def get_week_schedule(self, date: DateLike) -> Sequence[ScheduleDay]:
         """Получить данные из вкладки 'Расписание > Неделя'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.DiaryDay`]: Расписание на неделю.
         """
 
-        url = self.base_url + 'api/ScheduleService/GetWeekSchedule'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                params={'date': date},
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return_data = []
-        for day in result['days']:
-            return_data.append(ScheduleDay.de_json(day))
-        return return_data
+        return self._call('get_week_schedule', date=date)
 
     @log
-    def get_month_schedule(self, date: str) -> Sequence[ScheduleMonth]:
+    def get_month_schedule(self, date: DateLike) -> Sequence[ScheduleMonth]:
         """Получить данные из вкладки 'Расписание > Месяц'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.ScheduleMonth`]: Расписание на месяц.
         """
 
-        url = self.base_url + 'api/ScheduleService/GetMonthSchedule'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                params={'date': date},
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return_data = []
-        for month in result:
-            return_data.append(ScheduleMonth.de_json(month))
-        return return_data
+        return self._call('get_month_schedule', date=date)
 
     @log
-    def get_schedule_report_link(self, date: str, interval: Literal['week', 'month'] = 'week') -> str:
+    def get_schedule_report_link(self, date: DateLike, interval: Literal['week', 'month'] = 'week') -> str:
         """Поулчить абсолютную ссылку на загрузку таблицы расписания.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
             interval (`LiteralString`): Интервал расписания.
                 'week' - Неделя (по умолчанию).
                 'month' - Месяц.
@@ -206,58 +363,20 @@ class BClient(ClientObject):
             `str`: Абсолютная ссылка на загрузку таблицы расписания.
         """
 
-        url = self.base_url + 'api/ScheduleService/ScheduleReport'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                params={'date': date, 'interval': interval},
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, str):
-            return 'https://xn--80atdl2c.xn--33-6kcadhwnl3cfdx.xn--p1ai' + result.replace('"', "")
-        else:
-            raise ValueError(f"Был получен непредусмотренный тип '{type(result).__name__}' вместо ожидаемого 'dict' или 'str'.")
+        return self._call('get_schedule_report_link', date=date, interval=interval)
 
     @log
-    def get_summary_marks(self, date: str) -> SummaryMarks:
+    def get_summary_marks(self, date: DateLike) -> SummaryMarks:
         """Поулчить данные из вкладки 'Оценки > Сводная'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, четверть которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, четверть которой будет возвращена.
 
         Returns:
             `BARS.SummaryMarks`: Сводные оценки.
         """
 
-        url = self.base_url + 'api/MarkService/GetSummaryMarks'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                params={'date': date},
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return SummaryMarks.de_json(result)
+        return self._call('get_summary_marks', date=date)
 
     @log
     def get_total_marks(self) -> TotalMarks:
@@ -267,24 +386,7 @@ class BClient(ClientObject):
             `BARS.SummaryMarks`: Итоговые оценки.
         """
 
-        url = self.base_url + 'api/MarkService/GetTotalMarks'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return TotalMarks.de_json(result)
+        return self._call('get_total_marks')
 
     @log
     def get_account_info(self) -> AccountInfo:
@@ -294,24 +396,7 @@ class BClient(ClientObject):
             `BARS.AccountInfo`: Информация об аккаунте.
         """
 
-        url = self.base_url + 'api/MarkService/GetVisualizationData'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return AccountInfo.de_json(result)
+        return self._call('get_account_info')
 
     @log
     def get_pupil_info(self) -> PupilInfo:
@@ -321,106 +406,55 @@ class BClient(ClientObject):
             `BARS.PupilInfo`: Информация об ученике.
         """
 
-        url = self.base_url + 'api/ProfileService/GetPersonData'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return PupilInfo.de_json(result)
+        return self._call('get_pupil_info')
 
     @log
-    def get_attendace_data(self, pupilid: int, date_begin: str, date_end: str, subjectid: int = 0) -> AttendaceData:
+    def get_attendace_data(self, pupilid: int, date_begin: DateLike, date_end: DateLike, subjectid: int = 0) -> AttendaceData:
         """Получить данные о посещаемости.
 
         Для получения данных аргументов См. get_account_info.
 
         Args:
             pupilid (`int`): Уникальный идентификатор ученика.
-            date_begin (`int`): Год-Месяц-День, начала отсчёта.
-            date_end (`int`): Год-Месяц-День, конца отсчёта.
+            date_begin (`str` | `datetime.date`): Год-Месяц-День, начала отсчёта.
+            date_end (`str` | `datetime.date`): Год-Месяц-День, конца отсчёта.
             subjectid (`int`): Уникальный идентификатор предмета. 0 - общая статистика.
 
         Returns:
             `BARS.AttendanceData`: Данные о посещаемости.
         """
 
-        url = self.base_url + 'actions/web_edu.core.pupil.chart.ChartPack/attendancedata'
-        try:
-            result = httpx.post(
-                url,
-                headers=self.headers,
-                data={
-                    'web_edu.plugins.corrective_school.corrective_card.actions.StudentPack_id': pupilid,
-                    'subject': subjectid,
-                    'date_begin': date_begin,
-                    'date_end': date_end
-                },
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return AttendaceData.de_json(result)
+        return self._call(
+            'get_attendace_data',
+            pupilid=pupilid,
+            date_begin=date_begin,
+            date_end=date_end,
+            subjectid=subjectid
+        )
 
     @log
-    def get_progress_data(self, pupilid: int, date_begin: str, date_end: str, subjectid: int = 0) -> ProgressData:
+    def get_progress_data(self, pupilid: int, date_begin: DateLike, date_end: DateLike, subjectid: int = 0) -> ProgressData:
         """Получить данные об успеваемости.
 
         Для получения данных аргументов См. get_account_info.
 
         Args:
             pupilid (`int`): Уникальный идентификатор ученика.
-            date_begin (`int`): Год-Месяц-День, начала отсчёта.
-            date_end (`int`): Год-Месяц-День, конца отсчёта.
+            date_begin (`str` | `datetime.date`): Год-Месяц-День, начала отсчёта.
+            date_end (`str` | `datetime.date`): Год-Месяц-День, конца отсчёта.
             subjectid (`int`): Уникальный идентификатор предмета. 0 - общая статистика.
 
         Returns:
             `ProgressData`: Данные об успеваемости.
         """
 
-        url = self.base_url + 'actions/web_edu.core.pupil.chart.ChartPack/progressdata'
-        try:
-            result = httpx.post(
-                url,
-                headers=self.headers,
-                data={
-                    'web_edu.plugins.corrective_school.corrective_card.actions.StudentPack_id': pupilid,
-                    'subject': subjectid,
-                    'date_begin': date_begin,
-                    'date_end': date_end
-                },
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return ProgressData.de_json(result)
+        return self._call(
+            'get_progress_data',
+            pupilid=pupilid,
+            date_begin=date_begin,
+            date_end=date_end,
+            subjectid=subjectid
+        )
 
     @log
     def get_school_info(self) -> SchoolInfo:
@@ -430,24 +464,33 @@ class BClient(ClientObject):
             `BARS.SchoolInfo`: Информация о школе.
         """
 
-        url = self.base_url + 'api/SchoolService/getSchoolInfo'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return SchoolInfo.de_json(result)
+        return self._call('get_school_info')
+
+    def iter_month_schedule(self, date: DateLike) -> Iterator[ScheduleDay]:
+        """Получить дни из вкладки 'Расписание > Месяц' по мере загрузки ответа.
+
+        В отличие от ``get_month_schedule``, дни возвращаются подряд без разбиения на недели,
+        а первый день доступен до получения всего ответа.
+
+        Args:
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, месяц которой будет возвращён.
+
+        Returns:
+            Iterator[`BARS.ScheduleDay`]: Дни расписания на месяц.
+        """
+
+        yield from self._stream('get_month_schedule', ('*', 'days', '*'), ScheduleDay, date=date)
+
+    def iter_school_employees(self) -> Iterator[Employee]:
+        """Получить рабочий персонал учебного заведения по мере загрузки ответа.
+
+        Остальные данные о школе не сохраняются, см. ``get_school_info``.
+
+        Returns:
+            Iterator[`BARS.Employee`]: Работники учебного заведения.
+        """
+
+        yield from self._stream('get_school_info', ('employees', '*'), Employee)
 
     @log
     def get_class_info(self) -> ClassInfo:
@@ -457,118 +500,37 @@ class BClient(ClientObject):
             `BARS.ClassInfo`: Информация о классе.
         """
 
-        url = self.base_url + 'api/SchoolService/getClassYearInfo'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return ClassInfo.de_json(result)
+        return self._call('get_class_info')
 
     @log
-    def get_homework(self, date: str) -> Sequence[HomeworkDay]:
+    def get_homework(self, date: DateLike) -> Sequence[HomeworkDay]:
         """Получить данные из вкладки 'Домашнее задание'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.HomeworkDay`]: Неделя домашнего задания.
         """
 
-        url = self.base_url + 'api/HomeworkService/GetHomeworkFromRange'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                params={'date': date, 'is_diary': True},
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, list):
-            for i, birthday in enumerate(result):
-                result[i] = Birthday.de_json(birthday)
-            return result
-        else:
-            return []
+        return self._call('get_homework', date=date)
 
     @log
-    def get_birthdays(self) -> Optional[Sequence[Birthday]]:
+    def get_birthdays(self) -> Sequence[Birthday]:
         """Получить список текущих дней рождений.
 
         Returns:
-            Sequence[`BARS.Birthday`], optional: Список текущих дней рождений. None если нет.
+            Sequence[`BARS.Birthday`]: Список текущих дней рождений. Пустой список, если их нет.
         """
 
-        url = self.base_url + 'api/WidgetService/getBirthdays'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, list):
-            for i, birthday in enumerate(result):
-                result[i] = Birthday.de_json(birthday)
-            return result
-        else:
-            return []
+        return self._call('get_birthdays')
 
     @log
     def get_events(self) -> Sequence[Event]:
         """Получить список текущих праздников.
 
         Returns:
-            Sequence[`BARS.Event`], optional: Список текущих праздников. None если нет.
+            Sequence[`BARS.Event`]: Список текущих праздников. Пустой список, если их нет.
         """
 
-        url = self.base_url + 'api/WidgetService/getEvents'
-        try:
-            result = (self._httpx_client or httpx).get(
-                url,
-                headers=self.headers,
-                cookies={'sessionid': self.sessionid}
-            ).json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, list):
-            for i, event in enumerate(result):
-                result[i] = Event.de_json(event)
-            return result
-        else:
-            return []
+        return self._call('get_events')
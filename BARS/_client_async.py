@@ -1,23 +1,34 @@
-import json
+import asyncio
 import httpx
 import logging
 import functools
-from collections.abc import Sequence, Callable
+from collections.abc import Sequence, Callable, Awaitable, AsyncIterator
 from typing import Optional, Literal, Any, Self, Type
 from types import TracebackType
 
-from .exceptions import Unauthorized, BClientException, InternalError
+from .exceptions import InternalError, CircuitOpenError
 from ._base import ClientObject
 from ._diary import DiaryDay
 from ._schedule import ScheduleDay, ScheduleMonth
 from ._marks import SummaryMarks, TotalMarks, AttendaceData, ProgressData
 from ._account import AccountInfo, PupilInfo
-from ._school import SchoolInfo, ClassInfo
+from ._school import SchoolInfo, ClassInfo, Employee
 from ._homework import HomeworkDay
 from ._misc import Event, Birthday
+from ._endpoints import ENDPOINTS
+from ._json import JSONDecoder, get_decoder
+from ._dates import DateLike
+from ._stream import StreamParser
+from ._digest import Digest
+from ._transport import BTransport, get_default_transport
+from ._cache import BaseCache
+from ._resilience import ResiliencePolicy
+from ._singleflight import SingleFlight
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+_flights = SingleFlight()  # Общие для процесса выполняющиеся запросы
+
 def log(method: Callable[..., Any]) -> Any:
     logger = logging.getLogger(method.__module__)
 
@@ -34,6 +45,23 @@ def log(method: Callable[..., Any]) -> Any:
 
     return wrapper
 
+def single_flight(method: Callable[..., Any]) -> Any:
+    """Объединяет одновременные вызовы метода с одинаковыми sessionid и аргументами в один запрос."""
+
+    @functools.wraps(method)
+    async def wrapper(self: 'BClientAsync', *args, **kwargs) -> Any:
+        if not self.coalesce:
+            return await method(self, *args, **kwargs)
+
+        key = (self.base_url, self.sessionid, self.lazy, method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:  # Аргументы нельзя использовать как ключ
+            return await method(self, *args, **kwargs)
+        return await _flights.do(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
 
 class BClientAsync(ClientObject):
     """Класс, представляющий клиент для оращение к БАРСу.
@@ -45,6 +73,16 @@ class BClientAsync(ClientObject):
         base_url (`str`, optional): Ссылка на домен сайта.
         headers (`dict`, optional): Словарь, содержащий сведения об устройстве, с которого выполняются запросы.
             Используется при каждом запросе на сайт.
+        transport (`BARS.BTransport`, optional): Общий транспорт с пулом соединений. Если не указан,
+            вне контекстного менеджера используется общий для процесса транспорт.
+        cache (`BARS.BaseCache`, optional): Кэш ответов. По умолчанию ответы не кэшируются.
+        policy (`BARS.ResiliencePolicy`, optional): Политика таймаутов, повторов и автоматического выключателя.
+        lazy (`bool`, optional): Возвращать ли ленивые объекты: вложенные объекты создаются при первом обращении,
+            последовательности возвращаются как ``BARS.LazyList``. Уменьшает время и память для больших ответов.
+        decoder (`BARS.JSONDecoder`, optional): Декодер JSON ответов. По умолчанию самый быстрый из установленных.
+        coalesce (`bool`, optional): Объединять ли одновременные одинаковые запросы (в рамках процесса) в один.
+            Результат такого запроса общий для всех ожидающих: это одни и те же объекты, поэтому их изменение
+            (например, ``remove_html_tags``) видно всем. По умолчанию выключено.
 
     Attributes:
         sessionid (`str`): Идентификатор вашей сессии.
@@ -52,6 +90,12 @@ class BClientAsync(ClientObject):
         base_url (`str`, optional): Ссылка на домен сайта.
         headers (`dict`, optional): Словарь, содержащий сведения об устройстве, с которого выполняются запросы.
             Используется при каждом запросе на сайт.
+        transport (`BARS.BTransport`, optional): Общий транспорт с пулом соединений.
+        cache (`BARS.BaseCache`, optional): Кэш ответов.
+        policy (`BARS.ResiliencePolicy`): Политика таймаутов, повторов и автоматического выключателя.
+        lazy (`bool`): Возвращаются ли ленивые объекты.
+        decoder (`BARS.JSONDecoder`): Декодер JSON ответов.
+        coalesce (`bool`): Объединяются ли одновременные одинаковые запросы в один.
     """
 
     def __init__(
@@ -60,7 +104,13 @@ class BClientAsync(ClientObject):
             *,
             proxy: Optional[str] = None,
             base_url: Optional[str] = None,
-            headers: Optional[dict] = None) -> None:
+            headers: Optional[dict] = None,
+            transport: Optional[BTransport] = None,
+            cache: Optional[BaseCache] = None,
+            policy: Optional[ResiliencePolicy] = None,
+            lazy: bool = False,
+            decoder: Optional[JSONDecoder] = None,
+            coalesce: bool = False) -> None:
 
         self.sessionid = sessionid
 
@@ -75,10 +125,19 @@ class BClientAsync(ClientObject):
                 'manufacturer': 'Lemon4ksan',
             }
         self.headers = headers
+
+        self._httpx_client: Optional[httpx.AsyncClient] = None
         self.proxy = proxy
+        self.transport = transport
+        self.cache = cache
+        self.policy = policy or ResiliencePolicy()
+        self.lazy = lazy
+        self.decoder = decoder or get_decoder()
+        self.coalesce = coalesce
 
     async def __aenter__(self) -> Self:
-        self._httpx_client = httpx.AsyncClient(proxy=self.proxy)
+        if self.transport is None:
+            self._httpx_client = httpx.AsyncClient(proxy=self.proxy)
         return self
 
     async def __aexit__(
@@ -87,119 +146,309 @@ class BClientAsync(ClientObject):
         value: Optional[BaseException],
         traceback: Optional[TracebackType]
     ) -> None:
-        await self._httpx_client.aclose()
+        if self._httpx_client:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Пул соединений, через который выполняются запросы."""
+
+        if self._httpx_client is not None:
+            return self._httpx_client
+        return (self.transport or get_default_transport()).async_client
+
+    def _get_headers(self) -> dict:
+        """Заголовки запроса. Сессия передаётся заголовком: cookie пула соединений общие для всех клиентов транспорта."""
+
+        return {**self.headers, 'cookie': f'sessionid={self.sessionid}'}
+
+    def _get_timeout(self, endpoint: str) -> Any:
+        """Таймаут запроса из ``policy``. Если он не указан, используется таймаут пула соединений."""
+
+        timeout = self.policy.get_timeout(endpoint)
+        return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+
+    async def _send(
+            self,
+            method: Literal['GET', 'POST'],
+            endpoint: str,
+            params: Optional[dict],
+            data: Optional[dict]) -> tuple[Any, bytes]:
+        """Выполнить один запрос к сайту. Сетевые ошибки, ответы 5xx и ответы не в формате JSON вызывают ``InternalError``.
+
+        Returns:
+            tuple[`Any`, `bytes`]: Декодированный JSON ответ и тело ответа.
+        """
+
+        limiter = (self.transport or get_default_transport()).rate_limiter
+        if limiter is not None:
+            await limiter.acquire_async(self.sessionid)
+
+        try:
+            response = await self._client.request(
+                method,
+                self.base_url + endpoint,
+                headers=self._get_headers(),
+                params=params,
+                data=data,
+                timeout=self._get_timeout(endpoint)
+            )
+            if response.is_server_error:
+                raise InternalError(f'Сайт вернул код {response.status_code}.')
+            content = response.content
+            return self.decoder.loads(content), content
+        except (httpx.TransportError, ValueError) as e:
+            raise InternalError('В данный момент сайт недоступен.') from e
+
+    async def _request(
+            self,
+            method: Literal['GET', 'POST'],
+            endpoint: str,
+            *,
+            params: Optional[dict] = None,
+            data: Optional[dict] = None) -> Any:
+        """Выполнить запрос к сайту и декодировать ответ. Если указан кэш, сначала ищет ответ в нём.
+
+        Неудачные запросы повторяются и учитываются согласно ``policy``.
+
+        Args:
+            method (`LiteralString`): HTTP метод.
+            endpoint (`str`): Адрес запроса относительно ``base_url``.
+            params (`dict`, optional): Параметры запроса.
+            data (`dict`, optional): Тело POST запроса.
+
+        Returns:
+            `Any`: Декодированный JSON ответ.
+        """
+
+        key_params = params if params is not None else data
+        if self.cache is not None:
+            cached = self.cache.get(self.sessionid, endpoint, key_params)
+            if cached is not None:
+                return self.decoder.loads(cached)
+
+        error: InternalError = CircuitOpenError('Сайт временно недоступен.')
+        for attempt in range(self.policy.get_attempts(method)):
+            if attempt:
+                await asyncio.sleep(self.policy.get_delay(attempt))
+            if not self.policy.allow():
+                break
+            try:
+                result, content = await self._send(method, endpoint, params, data)
+            except InternalError as e:
+                logging.getLogger(__name__).debug(f'Попытка {attempt + 1} запроса {endpoint} не удалась :: {e.__cause__ or e}')
+                self.policy.record(False)
+                error = e
+                continue
+
+            self.policy.record(True)
+            if self.cache is not None and not (isinstance(result, dict) and 'faultcode' in result):
+                self.cache.set(self.sessionid, endpoint, key_params, content.decode())
+            return result
+
+        if self.cache is not None and self.policy.serve_stale:
+            cached = self.cache.get(self.sessionid, endpoint, key_params, allow_stale=True)
+            if cached is not None:
+                return self.decoder.loads(cached)
+        raise error
+
+    async def _call(self, name: str, **arguments: Any) -> Any:
+        """Выполнить метод API из ``BARS.ENDPOINTS`` и преобразовать ответ в объекты библиотеки.
+
+        Args:
+            name (`str`): Название метода клиента.
+            **arguments: Аргументы метода.
+
+        Returns:
+            `Any`: Результат метода.
+        """
+
+        endpoint = ENDPOINTS[name]
+        params, data = endpoint.build(arguments)
+        result = await self._request(endpoint.method, endpoint.path, params=params, data=data)
+        return endpoint.parse(result, self.base_url, self.lazy)
+
+    async def gather(
+            self,
+            *calls: Awaitable[Any],
+            limit: Optional[int] = None,
+            return_exceptions: bool = True) -> list[Any]:
+        """Выполнить несколько запросов одновременно через общий пул соединений.
+
+        Пример::
+
+            diary, marks = await client.gather(client.get_diary(date), client.get_summary_marks(date))
+
+        Args:
+            *calls (`Awaitable`): Корутины методов клиента.
+            limit (`int`, optional): Максимальное кол-во одновременно выполняемых запросов. По умолчанию без ограничений.
+            return_exceptions (`bool`): Возвращать ли ошибки на месте результатов вместо их вызова.
+
+        Returns:
+            `list`: Результаты в порядке переданных корутин.
+        """
+
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def run(call: Awaitable[Any]) -> Any:
+            if semaphore is None:
+                return await call
+            async with semaphore:
+                return await call
+
+        return list(await asyncio.gather(*(run(call) for call in calls), return_exceptions=return_exceptions))
+
+    async def get_digest(self, date: DateLike, *, limit: Optional[int] = None) -> Digest:
+        """Получить дневник, домашнее задание, расписание на неделю и сводные оценки одновременно.
+
+        Время выполнения примерно равно самому долгому запросу, а не их сумме.
+        Ошибки отдельных запросов не прерывают остальные и сохраняются в ``Digest.errors``.
+        Отмена отдельного запроса (``asyncio.CancelledError``) вызывается, а не сохраняется.
+
+        Args:
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
+            limit (`int`, optional): Максимальное кол-во одновременно выполняемых запросов.
+
+        Returns:
+            `BARS.Digest`: Сводка на неделю.
+        """
+
+        names = ('diary', 'homework', 'week_schedule', 'summary_marks')
+        results = await self.gather(
+            self.get_diary(date),
+            self.get_homework(date),
+            self.get_week_schedule(date),
+            self.get_summary_marks(date),
+            limit=limit
+        )
+
+        digest = Digest()
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                digest.errors[name] = result
+            elif isinstance(result, BaseException):  # Отмена и прерывание - не ошибки запроса
+                raise result
+            else:
+                setattr(digest, name, result)
+        return digest
+
+    async def _read_stream(
+            self,
+            method: Literal['GET', 'POST'],
+            endpoint: str,
+            params: Optional[dict],
+            data: Optional[dict],
+            parser: StreamParser) -> AsyncIterator[list[Any]]:
+        """Выполнить один потоковый запрос и передавать части тела ответа в ``parser``. Ошибки как в ``_send``.
+
+        Returns:
+            AsyncIterator[list[`Any`]]: Элементы, полученные из каждой части ответа.
+        """
+
+        try:
+            async with self._client.stream(
+                method,
+                self.base_url + endpoint,
+                headers=self._get_headers(),
+                params=params,
+                data=data,
+                timeout=self._get_timeout(endpoint)
+            ) as response:
+                if response.is_server_error:
+                    raise InternalError(f'Сайт вернул код {response.status_code}.')
+                async for chunk in response.aiter_bytes():
+                    yield parser.feed(chunk)
+                yield parser.close()
+        except (httpx.TransportError, ValueError) as e:
+            raise InternalError('В данный момент сайт недоступен.') from e
+
+    async def _stream(self, name: str, path: tuple[str, ...], model: Type[ClientObject], **arguments: Any) -> AsyncIterator[Any]:
+        """Выполнить метод API из ``BARS.ENDPOINTS`` и возвращать объекты по пути ``path`` по мере чтения ответа.
+
+        Ответ не хранится целиком, поэтому кэш и повторы не используются. Ограничение частоты запросов,
+        таймауты и автоматический выключатель работают как у обычных методов.
+
+        Args:
+            name (`str`): Название метода клиента.
+            path (tuple[`str`, ...]): Путь до элементов в ответе, см. ``StreamParser``.
+            model (`type[BARS.ClientObject]`): Класс элементов.
+            **arguments: Аргументы метода.
+
+        Returns:
+            AsyncIterator[`Any`]: Объекты библиотеки.
+        """
+
+        endpoint = ENDPOINTS[name]
+        params, data = endpoint.build(arguments)
+
+        limiter = (self.transport or get_default_transport()).rate_limiter
+        if limiter is not None:
+            await limiter.acquire_async(self.sessionid)
+        if not self.policy.allow():
+            raise CircuitOpenError('Сайт временно недоступен.')
+
+        convert = model.view if self.lazy else model.de_json
+        parser = StreamParser(path)
+        try:
+            async for items in self._read_stream(endpoint.method, endpoint.path, params, data, parser):
+                for item in items:
+                    yield convert(item)
+        except InternalError:
+            self.policy.record(False)
+            raise
+        self.policy.record(True)
+        endpoint.check(parser.rest)
 
     @log
-    async def get_diary(self, date: str) -> Sequence[DiaryDay]:
+    @single_flight
+    async def get_diary(self, date: DateLike) -> Sequence[DiaryDay]:
         """Получить данные из вкладки 'Дневник'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.DiaryDay`]: Неделя из дневника.
         """
 
-        url = self.base_url + 'api/ScheduleService/GetDiary'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            params={'date': date, 'is_diary': True},
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return_data = []
-        for day in result['days']:
-            return_data.append(DiaryDay.de_json(day))
-        return return_data
+        return await self._call('get_diary', date=date)
 
     @log
-    async def get_week_schedule(self, date: str) -> Sequence[ScheduleDay]:
+    @single_flight
+    async def get_week_schedule(self, date: DateLike) -> Sequence[ScheduleDay]:
         """Получить данные из вкладки 'Расписание > Неделя'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.DiaryDay`]: Расписание на неделю.
         """
 
-        url = self.base_url + 'api/ScheduleService/GetWeekSchedule'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            params={'date': date},
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return_data = []
-        for day in result['days']:
-            return_data.append(ScheduleDay.de_json(day))
-        return return_data
+        return await self._call('get_week_schedule', date=date)
 
     @log
-    async def get_month_schedule(self, date: str) -> Sequence[ScheduleMonth]:
+    @single_flight
+    async def get_month_schedule(self, date: DateLike) -> Sequence[ScheduleMonth]:
         """Получить данные из вкладки 'Расписание > Месяц'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.ScheduleMonth`]: Расписание на месяц.
         """
 
-        url = self.base_url + 'api/ScheduleService/GetMonthSchedule'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            params={'date': date},
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return_data = []
-        for month in result:
-            return_data.append(ScheduleMonth.de_json(month))
-        return return_data
+        return await self._call('get_month_schedule', date=date)
 
     @log
-    async def get_schedule_report_link(self, date: str, interval: Literal['week', 'month'] = 'week') -> str:
+    @single_flight
+    async def get_schedule_report_link(self, date: DateLike, interval: Literal['week', 'month'] = 'week') -> str:
         """Поулчить абсолютную ссылку на загрузку таблицы расписания.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
             interval (`LiteralString`): Интервал расписания.
                 'week' - Неделя (по умолчанию).
                 'month' - Месяц.
@@ -208,62 +457,24 @@ class BClientAsync(ClientObject):
             `str`: Абсолютная ссылка на загрузку таблицы расписания.
         """
 
-        url = self.base_url + 'api/ScheduleService/ScheduleReport'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            params={'date': date, 'interval': interval},
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f"Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}")
-        elif isinstance(result, str):
-            return 'https://xn--80atdl2c.xn--33-6kcadhwnl3cfdx.xn--p1ai' + result.replace('"', "")
-        else:
-            raise ValueError(f"Был получен непредусмотренный тип '{type(result).__name__}' вместо ожидаемого 'dict' или 'str'.")
+        return await self._call('get_schedule_report_link', date=date, interval=interval)
 
     @log
-    async def get_summary_marks(self, date: str) -> SummaryMarks:
+    @single_flight
+    async def get_summary_marks(self, date: DateLike) -> SummaryMarks:
         """Поулчить данные из вкладки 'Оценки > Сводная'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, четверть которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, четверть которой будет возвращена.
 
         Returns:
             `BARS.SummaryMarks`: Сводные оценки.
         """
 
-        url = self.base_url + 'api/MarkService/GetSummaryMarks'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            params={'date': date},
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return SummaryMarks.de_json(result)
+        return await self._call('get_summary_marks', date=date)
 
     @log
+    @single_flight
     async def get_total_marks(self) -> TotalMarks:
         """Поулчить данные из вкладки 'Оценки > Итоговые'. Данные ограничены этим годом.
 
@@ -271,27 +482,10 @@ class BClientAsync(ClientObject):
             `BARS.SummaryMarks`: Итоговые оценки.
         """
 
-        url = self.base_url + 'api/MarkService/GetTotalMarks'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return TotalMarks.de_json(result)
+        return await self._call('get_total_marks')
 
     @log
+    @single_flight
     async def get_account_info(self) -> AccountInfo:
         """Получить скрытую информацию об аккаунте. Реализуется через GetVisualizationData.
 
@@ -299,27 +493,10 @@ class BClientAsync(ClientObject):
             `BARS.AccountInfo`: Информация об аккаунте.
         """
 
-        url = self.base_url + 'api/MarkService/GetVisualizationData'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return AccountInfo.de_json(result)
+        return await self._call('get_account_info')
 
     @log
+    @single_flight
     async def get_pupil_info(self) -> PupilInfo:
         """Получить данные об ученике.
 
@@ -327,111 +504,60 @@ class BClientAsync(ClientObject):
             `BARS.PupilInfo`: Информация об ученике.
         """
 
-        url = self.base_url + 'api/ProfileService/GetPersonData'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return PupilInfo.de_json(result)
+        return await self._call('get_pupil_info')
 
     @log
-    async def get_attendace_data(self, pupilid: int, date_begin: str, date_end: str, subjectid: int = 0) -> AttendaceData:
+    @single_flight
+    async def get_attendace_data(self, pupilid: int, date_begin: DateLike, date_end: DateLike, subjectid: int = 0) -> AttendaceData:
         """Получить данные о посещаемости.
 
         Для получения данных аргументов См. get_account_info.
 
         Args:
             pupilid (`int`): Уникальный идентификатор ученика.
-            date_begin (`int`): Год-Месяц-День, начала отсчёта.
-            date_end (`int`): Год-Месяц-День, конца отсчёта.
+            date_begin (`str` | `datetime.date`): Год-Месяц-День, начала отсчёта.
+            date_end (`str` | `datetime.date`): Год-Месяц-День, конца отсчёта.
             subjectid (`int`): Уникальный идентификатор предмета. 0 - общая статистика.
 
         Returns:
             `BARS.AttendanceData`: Данные о посещаемости.
         """
 
-        url = self.base_url + 'actions/web_edu.core.pupil.chart.ChartPack/attendancedata'
-        result = await self._httpx_client.post(
-            url,
-            headers=self.headers,
-            data={
-                'web_edu.plugins.corrective_school.corrective_card.actions.StudentPack_id': pupilid,
-                'subject': subjectid,
-                'date_begin': date_begin,
-                'date_end': date_end
-            },
-            cookies={'sessionid': self.sessionid}
+        return await self._call(
+            'get_attendace_data',
+            pupilid=pupilid,
+            date_begin=date_begin,
+            date_end=date_end,
+            subjectid=subjectid
         )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return AttendaceData.de_json(result)
 
     @log
-    async def get_progress_data(self, pupilid: int, date_begin: str, date_end: str, subjectid: int = 0) -> ProgressData:
+    @single_flight
+    async def get_progress_data(self, pupilid: int, date_begin: DateLike, date_end: DateLike, subjectid: int = 0) -> ProgressData:
         """Получить данные об успеваемости.
 
         Для получения данных аргументов См. get_account_info.
 
         Args:
             pupilid (`int`): Уникальный идентификатор ученика.
-            date_begin (`int`): Год-Месяц-День, начала отсчёта.
-            date_end (`int`): Год-Месяц-День, конца отсчёта.
+            date_begin (`str` | `datetime.date`): Год-Месяц-День, начала отсчёта.
+            date_end (`str` | `datetime.date`): Год-Месяц-День, конца отсчёта.
             subjectid (`int`): Уникальный идентификатор предмета. 0 - общая статистика.
 
         Returns:
             `ProgressData`: Данные об успеваемости.
         """
 
-        url = self.base_url + 'actions/web_edu.core.pupil.chart.ChartPack/progressdata'
-        result = await self._httpx_client.post(
-            url,
-            headers=self.headers,
-            data={
-                'web_edu.plugins.corrective_school.corrective_card.actions.StudentPack_id': pupilid,
-                'subject': subjectid,
-                'date_begin': date_begin,
-                'date_end': date_end
-            },
-            cookies={'sessionid': self.sessionid}
+        return await self._call(
+            'get_progress_data',
+            pupilid=pupilid,
+            date_begin=date_begin,
+            date_end=date_end,
+            subjectid=subjectid
         )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return ProgressData.de_json(result)
 
     @log
+    @single_flight
     async def get_school_info(self) -> SchoolInfo:
         """Получить информацию об учебном заведении.
 
@@ -439,150 +565,79 @@ class BClientAsync(ClientObject):
             `BARS.SchoolInfo`: Информация о школе.
         """
 
-        url = self.base_url + 'api/SchoolService/getSchoolInfo'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
+        return await self._call('get_school_info')
 
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
+    async def iter_month_schedule(self, date: DateLike) -> AsyncIterator[ScheduleDay]:
+        """Получить дни из вкладки 'Расписание > Месяц' по мере загрузки ответа.
 
-        return SchoolInfo.de_json(result)
+        В отличие от ``get_month_schedule``, дни возвращаются подряд без разбиения на недели,
+        а первый день доступен до получения всего ответа.
+
+        Args:
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, месяц которой будет возвращён.
+
+        Returns:
+            AsyncIterator[`BARS.ScheduleDay`]: Дни расписания на месяц.
+        """
+
+        async for day in self._stream('get_month_schedule', ('*', 'days', '*'), ScheduleDay, date=date):
+            yield day
+
+    async def iter_school_employees(self) -> AsyncIterator[Employee]:
+        """Получить рабочий персонал учебного заведения по мере загрузки ответа.
+
+        Остальные данные о школе не сохраняются, см. ``get_school_info``.
+
+        Returns:
+            AsyncIterator[`BARS.Employee`]: Работники учебного заведения.
+        """
+
+        async for employee in self._stream('get_school_info', ('employees', '*'), Employee):
+            yield employee
 
     @log
-    async def get_class_info(self):
+    @single_flight
+    async def get_class_info(self) -> ClassInfo:
         """Получить информацию о классе.
 
         Returns:
             `BARS.ClassInfo`: Информация о классе.
         """
 
-        url = self.base_url + 'api/SchoolService/getClassYearInfo'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid.')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-
-        return ClassInfo.de_json(result)
+        return await self._call('get_class_info')
 
     @log
-    async def get_homework(self, date: str) -> Sequence[HomeworkDay]:
+    @single_flight
+    async def get_homework(self, date: DateLike) -> Sequence[HomeworkDay]:
         """Получить данные из вкладки 'Домашнее задание'.
 
         Args:
-            date (`str`): Дата формата Год-Месяц-День, неделя которой будет возвращена.
+            date (`str` | `datetime.date`): Дата формата Год-Месяц-День или `datetime.date`, неделя которой будет возвращена.
 
         Returns:
             Sequence[`BARS.DiaryDay`]: Неделя домашнего задания.
         """
 
-        url = self.base_url + 'api/HomeworkService/GetHomeworkFromRange'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            params={'date': date, 'is_diary': True},
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid.')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, list):
-            for i, day in enumerate(result):
-                result[i] = HomeworkDay.de_json(day)
-            return result
-        else:
-            raise TypeError(f"Был получен непредусмотренный тип {type(result).__name__} вместо ожидаемого 'dict' или 'list'.")
+        return await self._call('get_homework', date=date)
 
     @log
+    @single_flight
     async def get_birthdays(self) -> Sequence[Birthday]:
         """Получить список текущих дней рождений.
 
         Returns:
-            Sequence[`BARS.Birthday`], optional: Список текущих дней рождений. None если нет.
+            Sequence[`BARS.Birthday`]: Список текущих дней рождений. Пустой список, если их нет.
         """
 
-        url = self.base_url + 'api/WidgetService/getBirthdays'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid.')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, list):
-            for i, birthday in enumerate(result):
-                result[i] = Birthday.de_json(birthday)
-            return result
-        else:
-            return []
+        return await self._call('get_birthdays')
 
     @log
+    @single_flight
     async def get_events(self) -> Sequence[Event]:
         """Получить список текущих праздников.
 
         Returns:
-            Sequence[`BARS.Events`], optional: Неделя домашнего задания.
+            Sequence[`BARS.Event`]: Список текущих праздников. Пустой список, если их нет.
         """
 
-        url = self.base_url + 'api/WidgetService/getEvents'
-        result = await self._httpx_client.get(
-            url,
-            headers=self.headers,
-            cookies={'sessionid': self.sessionid}
-        )
-        try:
-            result = result.json()
-        except json.JSONDecodeError:
-            raise InternalError('В данный момент сайт недоступен.')
-
-        if isinstance(result, dict) and 'faultcode' in result:
-            match result['faultcode']:
-                case 'Server.UserNotAuthenticated':
-                    raise Unauthorized('Недействительный sessionid.')
-                case _:
-                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result['faultstring']}')
-        elif isinstance(result, list):
-            for i, event in enumerate(result):
-                result[i] = Event.de_json(event)
-            return result
-        else:
-            return []
+        return await self._call('get_events')
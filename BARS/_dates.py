@@ -0,0 +1,38 @@
+import functools
+from datetime import date, datetime, time
+
+# Дата для методов клиентов: `datetime.date`, `datetime.datetime` или ISO строка.
+DateLike = str | date
+
+# Названия аргументов методов клиентов, которые являются датами.
+DATE_ARGUMENTS: frozenset[str] = frozenset({'date', 'date_begin', 'date_end'})
+
+
+def format_date(value: DateLike) -> str:
+    """Привести дату к формату Год-Месяц-День, который принимает сайт.
+
+    Строки могут быть в любом ISO формате, например ``2024-09-02`` или ``2024-09-02T10:00``.
+    Неверная строка вызывает ``ValueError``.
+    """
+
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return parse_date(value).isoformat()
+    raise TypeError(f"Был получен непредусмотренный тип '{type(value).__name__}' вместо ожидаемого 'date' или 'str'.")
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_date(value: str) -> date:
+    """Преобразовать ISO строку в `datetime.date`. Результаты кэшируются, так как даты в ответах повторяются."""
+
+    return datetime.fromisoformat(value).date()
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_time(value: str) -> time:
+    """Преобразовать строку формата Час:Минута[:Секунда] в `datetime.time`. Результаты кэшируются."""
+
+    return time.fromisoformat(value)
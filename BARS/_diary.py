@@ -1,8 +1,10 @@
+import datetime
 from dataclasses import dataclass
-from collections.abc import Sequence
-from typing import Optional
+from collections.abc import Sequence, Callable
+from typing import Optional, ClassVar, Any
 
 from ._base import ClientObject
+from ._dates import parse_date, parse_time
 
 @dataclass(slots=True)
 class DiaryLesson(ClientObject):
@@ -55,6 +57,24 @@ class DiaryLesson(ClientObject):
     time_begin: str
     time_end: str
 
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
+    @property
+    def parsed_time_begin(self) -> Optional[datetime.time]:
+        """Начало урока как `datetime.time`. None, если время не указано. Разбор строки кэшируется."""
+
+        return parse_time(self.time_begin) if self.time_begin else None
+
+    @property
+    def parsed_time_end(self) -> Optional[datetime.time]:
+        """Конец урока как `datetime.time`. None, если время не указано. Разбор строки кэшируется."""
+
+        return parse_time(self.time_end) if self.time_end else None
+
     @classmethod
     def de_json(
             cls,
@@ -82,18 +102,20 @@ class DiaryDay(ClientObject):
     is_weekend: bool = False
     is_vacation: bool = False
 
+    _defaults: ClassVar[dict[str, Callable[[], Any]]] = {'lessons': list}
+
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'DiaryDay':
 
-        try:
-            for i, lesson in enumerate(data['lessons']):
-                data['lessons'][i] = DiaryLesson.de_json(lesson)
-        except KeyError:
-            data['lessons'] = []
-
         data = super(DiaryDay, cls).de_json(data)
 
         return cls(**data)
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from collections.abc import Sequence
+from typing import Optional
+
+from ._base import ClientObject
+from ._diary import DiaryDay
+from ._homework import HomeworkDay
+from ._schedule import ScheduleDay
+from ._marks import SummaryMarks
+
+@dataclass(slots=True)
+class Digest(ClientObject):
+    """Класс, представляющий сводку на неделю, полученную одновременными запросами.
+
+    Attributes:
+        diary (Sequence[`BARS.DiaryDay`], optional): Неделя из дневника. None, если запрос завершился ошибкой.
+        homework (Sequence[`BARS.HomeworkDay`], optional): Неделя домашнего задания. None, если запрос завершился ошибкой.
+        week_schedule (Sequence[`BARS.ScheduleDay`], optional): Расписание на неделю. None, если запрос завершился ошибкой.
+        summary_marks (`BARS.SummaryMarks`, optional): Сводные оценки. None, если запрос завершился ошибкой.
+        errors (`dict[str, Exception]`): Ошибки запросов. Ключ - название соответствующего поля.
+    """
+
+    diary: Optional[Sequence[DiaryDay]] = None
+    homework: Optional[Sequence[HomeworkDay]] = None
+    week_schedule: Optional[Sequence[ScheduleDay]] = None
+    summary_marks: Optional[SummaryMarks] = None
+    errors: dict[str, Exception] = field(default_factory=dict)
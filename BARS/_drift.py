@@ -0,0 +1,94 @@
+import time
+import atexit
+import logging
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class SchemaDrift:
+    """Класс, представляющий учёт неизвестных аттрибутов в ответах сайта (изменений схемы ответов).
+
+    Каждое сочетание класса и набора неизвестных ключей попадает в лог при первом появлении,
+    а дальше не чаще раза в ``interval`` секунд, со счётчиком появлений за это время.
+    Сообщения форматируются только если уровень логирования позволяет их вывести.
+
+    Args:
+        interval (`float`, optional): Минимальный интервал между повторными сообщениями в секундах.
+            Если None, каждое сочетание сообщается один раз за время работы процесса.
+
+    Attributes:
+        interval (`float`, optional): Минимальный интервал между повторными сообщениями в секундах.
+    """
+
+    def __init__(self, interval: Optional[float] = 3600.0) -> None:
+        self.interval = interval
+
+        # (класс, ключи) -> [всего появлений, появлений с последнего сообщения, время последнего сообщения]
+        self._entries: dict[tuple[type, frozenset[str]], list] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def counts(self) -> dict[tuple[str, tuple[str, ...]], int]:
+        """Кол-во появлений по названию класса и отсортированным неизвестным ключам."""
+
+        with self._lock:
+            return {(cls.__name__, tuple(sorted(keys))): entry[0] for (cls, keys), entry in self._entries.items()}
+
+    def report(self, cls: type, unknown_data: dict[str, Any]) -> None:
+        """Учесть объект класса ``cls`` с неизвестными аттрибутами ``unknown_data``."""
+
+        key = (cls, frozenset(unknown_data))
+        repeated = 0
+        with self._lock:  # Счётчики изменяются под блокировкой, иначе из нескольких потоков появления теряются
+            entry = self._entries.get(key)
+            first = entry is None
+            if entry is None:
+                entry = self._entries[key] = [1, 0, time.monotonic()]
+            else:
+                entry[0] += 1
+                entry[1] += 1
+                if self.interval is not None and time.monotonic() - entry[2] >= self.interval:
+                    repeated = self._take(entry)
+            total = entry[0]
+
+        if first:
+            logger.warning('Были получены неизвестные аттрибуты для класса %s :: %s', cls.__name__, sorted(key[1]))
+            logger.debug('Пример неизвестных аттрибутов для класса %s :: %r', cls.__name__, unknown_data)
+        elif repeated:
+            self._log(key, repeated, total)
+
+    def flush(self) -> None:
+        """Сообщить о появлениях, накопленных с последнего сообщения."""
+
+        with self._lock:
+            pending = [(key, self._take(entry), entry[0]) for key, entry in self._entries.items() if entry[1]]
+        for key, repeated, total in pending:
+            self._log(key, repeated, total)
+
+    def reset(self) -> None:
+        """Забыть все сочетания. Следующее появление каждого снова попадёт в лог."""
+
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _take(entry: list) -> int:
+        """Сбросить счётчик появлений с последнего сообщения. Вызывается под блокировкой."""
+
+        repeated, entry[1], entry[2] = entry[1], 0, time.monotonic()
+        return repeated
+
+    @staticmethod
+    def _log(key: tuple[type, frozenset[str]], repeated: int, total: int) -> None:
+        logger.warning(
+            'Неизвестные аттрибуты для класса %s :: %s встречены ещё %d раз (всего %d).',
+            key[0].__name__, sorted(key[1]), repeated, total
+        )
+
+
+# Общий для процесса учёт. Используется ``ClientObject.de_json``.
+schema_drift = SchemaDrift()
+atexit.register(schema_drift.flush)
@@ -0,0 +1,129 @@
+from dataclasses import dataclass, field
+from typing import Optional, Literal, Any
+
+from .exceptions import Unauthorized, BClientException
+from ._base import ClientObject
+from ._lazy import LazyList
+from ._dates import DATE_ARGUMENTS, format_date
+from ._diary import DiaryDay
+from ._schedule import ScheduleDay, ScheduleMonth
+from ._marks import SummaryMarks, TotalMarks, AttendaceData, ProgressData
+from ._account import AccountInfo, PupilInfo
+from ._school import SchoolInfo, ClassInfo
+from ._homework import HomeworkDay
+from ._misc import Event, Birthday
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """Класс, представляющий описание метода API сайта.
+
+    Attributes:
+        path (`str`): Адрес запроса относительно ``base_url``.
+        model (`type[BARS.ClientObject]`, optional): Класс, в который преобразуется ответ.
+        shape (`LiteralString`): Форма ответа.
+            'object' - один объект.
+            'list' - список объектов. Ответ другого типа означает пустой список.
+            'days' - список объектов под ключом 'days'.
+            'link' - неабсолютная ссылка в виде строки.
+        method (`LiteralString`): HTTP метод. Параметры GET запроса передаются в адресе, POST запроса - в теле.
+        fields (`dict[str, str]`): Параметры запроса. Ключ - название параметра на сайте, значение - название аргумента метода.
+        constants (`dict[str, Any]`): Постоянные параметры запроса.
+    """
+
+    path: str
+    model: Optional[type[ClientObject]] = None
+    shape: Literal['object', 'list', 'days', 'link'] = 'object'
+    method: Literal['GET', 'POST'] = 'GET'
+    fields: dict[str, str] = field(default_factory=dict)
+    constants: dict[str, Any] = field(default_factory=dict)
+
+    def build(self, arguments: dict[str, Any]) -> tuple[Optional[dict], Optional[dict]]:
+        """Сформировать параметры запроса из аргументов метода. Даты приводятся к формату Год-Месяц-День.
+
+        Returns:
+            tuple[`dict`, `dict`]: Параметры адреса и тело запроса. Одно из значений всегда None.
+        """
+
+        payload = {
+            name: format_date(arguments[argument]) if argument in DATE_ARGUMENTS else arguments[argument]
+            for name, argument in self.fields.items()
+        }
+        payload.update(self.constants)
+        if self.method == 'GET':
+            return payload or None, None
+        return None, payload
+
+    def check(self, result: Any) -> None:
+        """Вызвать исключение, если ответ сайта является ошибкой."""
+
+        if isinstance(result, dict) and 'faultcode' in result:
+            match result['faultcode']:
+                case 'Server.UserNotAuthenticated':
+                    raise Unauthorized('Недействительный sessionid.')
+                case _:
+                    raise BClientException(f'Неизвестная ошибка :: {result['faultcode']}: {result.get('faultstring')}')
+
+    def parse(self, result: Any, base_url: str, lazy: bool = False) -> Any:
+        """Проверить ответ сайта на ошибки и преобразовать его в объекты библиотеки.
+
+        Если ``lazy``, последовательности возвращаются как ``BARS.LazyList``, а объекты создаются через ``view``.
+        """
+
+        self.check(result)
+
+        match self.shape:
+            case 'link':
+                if isinstance(result, str):
+                    return base_url.rstrip('/') + result.replace('"', "")
+                raise ValueError(f"Был получен непредусмотренный тип '{type(result).__name__}' вместо ожидаемого 'dict' или 'str'.")
+            case 'days':
+                if lazy:
+                    return LazyList(result['days'], self.model)
+                return [self.model.de_json(day) for day in result['days']]  # type: ignore
+            case 'list':
+                if not isinstance(result, list):
+                    return []
+                if lazy:
+                    return LazyList(result, self.model)
+                return [self.model.de_json(item) for item in result]  # type: ignore
+            case _:
+                if lazy:
+                    return self.model.view(result)  # type: ignore
+                return self.model.de_json(result)  # type: ignore
+
+
+CHART_FIELDS: dict[str, str] = {
+    'web_edu.plugins.corrective_school.corrective_card.actions.StudentPack_id': 'pupilid',
+    'subject': 'subjectid',
+    'date_begin': 'date_begin',
+    'date_end': 'date_end'
+}
+
+# Ключ - название метода клиента.
+ENDPOINTS: dict[str, Endpoint] = {
+    'get_diary': Endpoint(
+        'api/ScheduleService/GetDiary', DiaryDay, 'days', fields={'date': 'date'}, constants={'is_diary': True}
+    ),
+    'get_week_schedule': Endpoint('api/ScheduleService/GetWeekSchedule', ScheduleDay, 'days', fields={'date': 'date'}),
+    'get_month_schedule': Endpoint('api/ScheduleService/GetMonthSchedule', ScheduleMonth, 'list', fields={'date': 'date'}),
+    'get_schedule_report_link': Endpoint(
+        'api/ScheduleService/ScheduleReport', shape='link', fields={'date': 'date', 'interval': 'interval'}
+    ),
+    'get_summary_marks': Endpoint('api/MarkService/GetSummaryMarks', SummaryMarks, fields={'date': 'date'}),
+    'get_total_marks': Endpoint('api/MarkService/GetTotalMarks', TotalMarks),
+    'get_account_info': Endpoint('api/MarkService/GetVisualizationData', AccountInfo),
+    'get_pupil_info': Endpoint('api/ProfileService/GetPersonData', PupilInfo),
+    'get_attendace_data': Endpoint(
+        'actions/web_edu.core.pupil.chart.ChartPack/attendancedata', AttendaceData, method='POST', fields=CHART_FIELDS
+    ),
+    'get_progress_data': Endpoint(
+        'actions/web_edu.core.pupil.chart.ChartPack/progressdata', ProgressData, method='POST', fields=CHART_FIELDS
+    ),
+    'get_school_info': Endpoint('api/SchoolService/getSchoolInfo', SchoolInfo),
+    'get_class_info': Endpoint('api/SchoolService/getClassYearInfo', ClassInfo),
+    'get_homework': Endpoint(
+        'api/HomeworkService/GetHomeworkFromRange', HomeworkDay, 'list', fields={'date': 'date'}, constants={'is_diary': True}
+    ),
+    'get_birthdays': Endpoint('api/WidgetService/getBirthdays', Birthday, 'list'),
+    'get_events': Endpoint('api/WidgetService/getEvents', Event, 'list'),
+}
@@ -1,7 +1,10 @@
+import datetime
 from dataclasses import dataclass
 from collections.abc import Sequence
+from typing import ClassVar
 
 from ._base import ClientObject
+from ._dates import parse_date
 
 @dataclass(slots=True)
 class HomeworkLesson(ClientObject):
@@ -36,21 +39,25 @@ class HomeworkLesson(ClientObject):
     teacher: str
     theme: str
 
+    _renames: ClassVar[dict[str, str]] = {
+        'individualHomeworks': 'individual_homeworks',
+        'nextHomework': 'next_homework',
+        'nextIndividualHomeworks': 'next_individual_homeworks',
+        'nextMaterials': 'next_materials'
+    }
+
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'HomeworkLesson':
 
-        data.update({
-            'individual_homeworks': data['individualHomeworks'],
-            'next_homework': data['nextHomework'],
-            'next_individual_homeworks': data['nextIndividualHomeworks'],
-            'next_materials': data['nextMaterials']
-        })
-        del data['individualHomeworks'], data['nextHomework'], data['nextIndividualHomeworks'], data['nextMaterials']
-        # TODO: Это надо добавить
-
         data = super(HomeworkLesson, cls).de_json(data)
 
         return cls(**data)
@@ -69,15 +76,18 @@ class HomeworkDay(ClientObject):
     homeworks: Sequence[HomeworkLesson]
     name: str
 
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'HomeworkDay':
 
-        for i, homework in enumerate(data['homeworks']):
-            data['homeworks'][i] = HomeworkLesson.de_json(homework)
-
         data = super(HomeworkDay, cls).de_json(data)
 
         return cls(**data)
@@ -0,0 +1,39 @@
+import functools
+import html
+import re
+
+# Ссылка, открывающий тег <p>, любой другой тег или HTML сущность. Разбор в один проход через re.sub.
+_TOKEN = re.compile(
+    r'<a\b[^>]*?\bhref\s*=\s*["\']([^"\']*)["\'][^>]*>(.*?)</a\s*>'
+    r'|<(p)\b[^>]*>'
+    r'|<[^>]*>'
+    r'|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);?',
+    re.DOTALL | re.IGNORECASE
+)
+_TAG = re.compile(r'<[^>]*>')
+
+
+@functools.lru_cache(maxsize=4096)
+def clean_html(text: str, replace_p_with: str = '\n') -> str:
+    """Преобразовать HTML строку в читабельный текст для отправки в Телеграм.
+
+    Теги <a> заменяются на гиперссылки ``[текст](ссылка)``, открывающие теги <p> - на ``replace_p_with``,
+    остальные теги удаляются, HTML сущности (``&mdash;``, ``&#171;``) декодируются.
+    Результаты кэшируются, так как одни и те же строки (ФИО учителей, темы, задания) повторяются из недели в неделю.
+    """
+
+    if '<' in text or '&' in text:
+        def replace(match: re.Match) -> str:
+            href, content, p = match.group(1, 2, 3)
+            if href is not None:
+                return f'[{html.unescape(_TAG.sub('', content))}]({html.unescape(href)}) '
+            if p is not None:
+                return replace_p_with
+            if match[0][0] == '<':
+                return ''
+            return html.unescape(match[0])
+
+        text = _TOKEN.sub(replace, text)
+    if replace_p_with == ' ':
+        text = text.replace('  ', ' ')  # исключаем двойные <p>
+    return text.strip()
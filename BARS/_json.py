@@ -0,0 +1,74 @@
+import json
+from typing import Any, Optional
+
+
+class JSONDecoder:
+    """Класс, представляющий декодер JSON ответов сайта на стандартной библиотеке.
+
+    Декодеры принимают тело ответа в байтах (или кэшированный текст) и при ошибке вызывают ``ValueError``.
+    Быстрые декодеры на ``orjson`` и ``msgspec`` используются автоматически, если пакеты установлены,
+    см. ``BARS.get_decoder``.
+
+    Attributes:
+        name (`str`): Название декодера.
+    """
+
+    name: str = 'json'
+
+    def loads(self, data: bytes | str) -> Any:
+        """Декодировать JSON."""
+
+        return json.loads(data)
+
+
+class OrjsonDecoder(JSONDecoder):
+    """Класс, представляющий декодер на ``orjson``. Требует установленный пакет ``orjson``."""
+
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+
+        self.loads = orjson.loads  # type: ignore
+
+
+class MsgspecDecoder(JSONDecoder):
+    """Класс, представляющий декодер на ``msgspec``. Требует установленный пакет ``msgspec``."""
+
+    name = 'msgspec'
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self.loads = msgspec.json.Decoder().decode  # type: ignore
+
+
+# В порядке предпочтения.
+DECODERS: dict[str, type[JSONDecoder]] = {
+    'orjson': OrjsonDecoder,
+    'msgspec': MsgspecDecoder,
+    'json': JSONDecoder,
+}
+
+_default_decoder: Optional[JSONDecoder] = None
+
+
+def get_decoder(name: Optional[str] = None) -> JSONDecoder:
+    """Получить декодер JSON по названию из ``BARS.DECODERS``.
+
+    Если название не указано, возвращает общий для процесса декодер: первый из ``DECODERS``, пакет которого установлен.
+    """
+
+    global _default_decoder
+
+    if name is not None:
+        return DECODERS[name]()
+
+    if _default_decoder is None:
+        for decoder in DECODERS.values():
+            try:
+                _default_decoder = decoder()
+                break
+            except ImportError:
+                continue
+    return _default_decoder  # type: ignore
@@ -0,0 +1,85 @@
+from collections.abc import MutableSequence, Iterable, Iterator
+from typing import Any, Generic, TypeVar, overload
+
+T = TypeVar('T')
+
+_MISSING: Any = object()
+
+
+class LazyList(MutableSequence, Generic[T]):
+    """Класс, представляющий список объектов библиотеки, которые создаются из ответа сайта при первом обращении.
+
+    Хранит ссылки на исходные словари ответа без копирования. Срез возвращает ``LazyList`` с теми же словарями.
+    Изменение списка работает как у обычного списка.
+
+    Args:
+        raw (list[`dict`]): Исходные словари из ответа сайта.
+        model (`type[BARS.ClientObject]`): Класс элементов. Элементы создаются через ``model.view``,
+            поэтому их вложенные последовательности тоже ленивые.
+    """
+
+    __slots__ = ('_raw', '_model', '_items')
+
+    def __init__(self, raw: list[dict], model: Any) -> None:
+        self._raw = raw
+        self._model = model
+        self._items: list = [_MISSING] * len(raw)
+
+    @property
+    def materialized(self) -> int:
+        """Кол-во уже созданных элементов."""
+
+        return sum(item is not _MISSING for item in self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'LazyList[T]': ...
+
+    def __getitem__(self, index: int | slice) -> 'T | LazyList[T]':
+        if isinstance(index, slice):
+            view = LazyList.__new__(LazyList)
+            view._raw = self._raw[index]
+            view._model = self._model
+            view._items = self._items[index]
+            return view
+
+        item = self._items[index]
+        if item is _MISSING:
+            item = self._items[index] = self._model.view(self._raw[index])
+        return item
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            self._raw[index] = [None] * len(value)
+        self._items[index] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self._raw[index]
+        del self._items[index]
+
+    def insert(self, index: int, value: T) -> None:
+        self._raw.insert(index, None)  # type: ignore
+        self._items.insert(index, value)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self._items)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def extend(self, values: Iterable[T]) -> None:
+        values = list(values)
+        self._raw.extend([None] * len(values))  # type: ignore
+        self._items.extend(values)
@@ -1,7 +1,10 @@
+import datetime
 from dataclasses import dataclass
-from collections.abc import Sequence
+from collections.abc import Sequence, Callable
+from typing import ClassVar, Any
 
 from ._base import ClientObject
+from ._dates import parse_date
 
 @dataclass(slots=True)
 class Mark(ClientObject):
@@ -17,14 +20,20 @@ class Mark(ClientObject):
     description: str
     mark: int
 
+    _coercions: ClassVar[dict[str, Callable[[Any], Any]]] = {'mark': int}
+
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'Mark':
 
-        data['mark'] = int(data['mark'])
-
         data = super(Mark, cls).de_json(data)
 
         return cls(**data)
@@ -43,17 +52,14 @@ class SummaryMarksDiscipline(ClientObject):
     discipline: str
     marks: Sequence[Mark]
 
+    _coercions: ClassVar[dict[str, Callable[[Any], Any]]] = {'average_mark': float}
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'SummaryMarksDiscipline':
 
-        data['average_mark'] = float(data['average_mark'])
-
-        for i, mark in enumerate(data['marks']):
-            data['marks'][i] = Mark.de_json(mark)
-
         data = super(SummaryMarksDiscipline, cls).de_json(data)
 
         return cls(**data)
@@ -94,20 +100,20 @@ class SummaryMarks(ClientObject):
     disciplines: Sequence[SummaryMarksDiscipline]
     subperiod: Subperiod
 
+    _renames: ClassVar[dict[str, str]] = {'discipline_marks': 'disciplines'}
+
+    @property
+    def parsed_dates(self) -> list[datetime.date]:
+        """Даты как `datetime.date`. Разбор строк кэшируется."""
+
+        return [parse_date(value) for value in self.dates]
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'SummaryMarks':
 
-        data['disciplines'] = data['discipline_marks']
-        del data['discipline_marks']
-
-        for i, item in enumerate(data['disciplines']):
-            data['disciplines'][i] = SummaryMarksDiscipline.de_json(item)
-
-        data['subperiod'] = Subperiod.de_json(data['subperiod'])
-
         data = super(SummaryMarks, cls).de_json(data)
 
         return cls(**data)
@@ -146,21 +152,14 @@ class TotalMarks(ClientObject):
     disciplines: Sequence[TotalMarksDiscipline]
     subperiods: Sequence[Subperiod]
 
+    _renames: ClassVar[dict[str, str]] = {'discipline_marks': 'disciplines'}
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'TotalMarks':
 
-        data['disciplines'] = data['discipline_marks']
-        del data['discipline_marks']
-
-        for i, mark in enumerate(data['disciplines']):
-            data['disciplines'][i] = TotalMarksDiscipline.de_json(mark)
-
-        for i, subperiod in enumerate(data['subperiods']):
-            data['subperiods'][i] = Subperiod.de_json(subperiod)
-
         data = super(TotalMarks, cls).de_json(data)
 
         return cls(**data)
@@ -211,15 +210,14 @@ class SeriesItem(ClientObject):
     name: str
     point_width: str
 
+    _renames: ClassVar[dict[str, str]] = {'pointWidth': 'point_width'}
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'SeriesItem':
 
-        data['point_width'] = data['pointWidth']
-        del data['pointWidth']
-
         data = super(SeriesItem, cls).de_json(data)
 
         return cls(**data)
@@ -246,9 +244,6 @@ class ProgressData(ClientObject):
             data: dict,
     ) -> 'ProgressData':
 
-        for i, item in enumerate(data['series']):
-            data['series'][i] = SeriesItem.de_json(item)
-
         data = super(ProgressData, cls).de_json(data)
 
         return cls(**data)
@@ -0,0 +1,204 @@
+import datetime
+import functools
+import itertools
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, Optional, Self
+
+from ._dates import parse_date
+from ._marks import SummaryMarks, ProgressData
+
+
+@functools.lru_cache(maxsize=1024)
+def _ordinal(date: str) -> int:
+    return parse_date(date).toordinal()
+
+
+class MarksTable:
+    """Класс, представляющий оценки в колоночном виде: по массиву на каждое поле вместо объекта на каждую оценку.
+
+    Строка таблицы - одна оценка. Названия уроков и описания хранятся один раз, в колонках - их индексы.
+    Занимает во много раз меньше памяти, чем ``BARS.SummaryMarks``, и строится из ответа сайта без создания объектов.
+    Таблицы нескольких учеников или четвертей объединяются через ``extend``.
+
+    Attributes:
+        disciplines (list[`str`]): Названия уроков. Колонка ``discipline`` содержит индексы в этом списке.
+        descriptions (list[`str`]): Описания оценок. Колонка ``description`` содержит индексы в этом списке.
+        discipline (`array`): Индекс урока.
+        date (`array`): Дата оценки, ``datetime.date.toordinal()``.
+        mark (`array`): Оценка.
+        description (`array`): Индекс описания.
+    """
+
+    __slots__ = ('disciplines', 'descriptions', 'discipline', 'date', 'mark', 'description', '_discipline_ids', '_description_ids')
+
+    def __init__(self) -> None:
+        self.disciplines: list[str] = []
+        self.descriptions: list[str] = []
+        self.discipline = array('H')
+        self.date = array('I')
+        self.mark = array('f')
+        self.description = array('H')
+
+        self._discipline_ids: dict[str, int] = {}
+        self._description_ids: dict[str, int] = {}
+
+    @classmethod
+    def from_summary_marks(cls, marks: SummaryMarks | dict) -> Self:
+        """Создать таблицу из сводных оценок.
+
+        Args:
+            marks (`BARS.SummaryMarks` | `dict`): Сводные оценки или ответ сайта (``get_summary_marks``) без преобразования.
+                Второй вариант не создаёт объекты оценок вовсе. Оценки, не являющиеся числом, пропускаются.
+        """
+
+        table = cls()
+        if isinstance(marks, dict):
+            for item in marks.get('discipline_marks') or marks.get('disciplines') or ():
+                table._add(
+                    item['discipline'],
+                    ((mark['date'], mark['mark'], mark.get('description') or '') for mark in item.get('marks') or ())
+                )
+        else:
+            for discipline in marks.disciplines:
+                table._add(discipline.discipline, ((mark.date, mark.mark, mark.description) for mark in discipline.marks))
+        return table
+
+    @classmethod
+    def from_progress_data(cls, progress: ProgressData | dict, series: int | str = 0) -> Self:
+        """Создать таблицу из данных об успеваемости. Описание каждой оценки - название ряда графика.
+
+        Args:
+            progress (`BARS.ProgressData` | `dict`): Данные об успеваемости или ответ сайта без преобразования.
+            series (`int` | `str`, optional): Индекс или название ряда графика (например, 'Ученик' или 'Класс').
+        """
+
+        if isinstance(progress, dict):
+            subject, dates = progress['subject'], progress['dates']
+            items = [(item['name'], item['data']) for item in progress['series']]
+        else:
+            subject, dates = progress.subject, progress.dates
+            items = [(item.name, item.data) for item in progress.series]
+
+        if isinstance(series, str):
+            items = [item for item in items if item[0] == series]
+        else:
+            items = items[series:series + 1]
+
+        table = cls()
+        for name, data in items:
+            table._add(subject, ((date, mark, name) for date, mark in zip(dates, data)))
+        return table
+
+    def _add(self, discipline: str, rows: Iterable[tuple[str, Any, str]]) -> None:
+        discipline_id = self._id(discipline, self._discipline_ids, self.disciplines)
+        description_ids, descriptions = self._description_ids, self.descriptions
+        dates, marks, description_column = self.date, self.mark, self.description
+        count = 0
+        for date, mark, description in rows:
+            try:
+                value = float(mark)
+            except (TypeError, ValueError):
+                continue
+            description_id = description_ids.get(description)
+            if description_id is None:
+                description_id = self._id(description, description_ids, descriptions)
+            dates.append(_ordinal(date))
+            marks.append(value)
+            description_column.append(description_id)
+            count += 1
+        self.discipline.extend(array('H', (discipline_id,)) * count)
+
+    @staticmethod
+    def _id(name: str, ids: dict[str, int], names: list[str]) -> int:
+        index = ids.get(name)
+        if index is None:
+            index = ids[name] = len(names)
+            names.append(name)
+        return index
+
+    def extend(self, other: 'MarksTable') -> None:
+        """Добавить строки другой таблицы, сопоставив индексы уроков и описаний."""
+
+        disciplines = array('H', (self._id(name, self._discipline_ids, self.disciplines) for name in other.disciplines))
+        descriptions = array('H', (self._id(name, self._description_ids, self.descriptions) for name in other.descriptions))
+        self.discipline.extend(disciplines[i] for i in other.discipline)
+        self.date.extend(other.date)
+        self.mark.extend(other.mark)
+        self.description.extend(descriptions[i] for i in other.description)
+
+    def __len__(self) -> int:
+        return len(self.mark)
+
+    def __iter__(self) -> Iterator[tuple[str, datetime.date, float, str]]:
+        """Строки таблицы: название урока, дата, оценка, описание."""
+
+        for discipline, date, mark, description in zip(self.discipline, self.date, self.mark, self.description):
+            yield self.disciplines[discipline], datetime.date.fromordinal(date), mark, self.descriptions[description]
+
+    @property
+    def nbytes(self) -> int:
+        """Размер колонок в байтах."""
+
+        return sum(column.itemsize * len(column) for column in (self.discipline, self.date, self.mark, self.description))
+
+    def mean(self) -> dict[str, float]:
+        """Средняя оценка по каждому уроку."""
+
+        return self.weighted_mean({})
+
+    def weighted_mean(self, weights: Mapping[str, float], default: float = 1.0) -> dict[str, float]:
+        """Средневзвешенная оценка по каждому уроку.
+
+        Args:
+            weights (Mapping[`str`, `float`]): Вес оценки по её описанию, например ``{'Контрольная работа': 2}``.
+            default (`float`, optional): Вес оценок, описания которых нет в ``weights``.
+        """
+
+        by_description = [weights.get(name, default) for name in self.descriptions]
+        sums = [0.0] * len(self.disciplines)
+        totals = [0.0] * len(self.disciplines)
+        for discipline, mark, description in zip(self.discipline, self.mark, self.description):
+            weight = by_description[description]
+            sums[discipline] += mark * weight
+            totals[discipline] += weight
+        return {name: sums[i] / totals[i] for i, name in enumerate(self.disciplines) if totals[i]}
+
+    def counts(self, discipline: Optional[str] = None) -> Counter[float]:
+        """Кол-во каждой оценки, по всем урокам или по одному."""
+
+        if discipline is None:
+            return Counter(self.mark)
+        index = self._discipline_ids.get(discipline)
+        return Counter(itertools.compress(self.mark, (value == index for value in self.discipline)))
+
+    def counts_by_discipline(self) -> dict[str, Counter[float]]:
+        """Кол-во каждой оценки по каждому уроку."""
+
+        counters: list[Counter[float]] = [Counter() for _ in self.disciplines]
+        for discipline, mark in zip(self.discipline, self.mark):
+            counters[discipline][mark] += 1
+        return {name: counters[i] for i, name in enumerate(self.disciplines) if counters[i]}
+
+    def rolling_mean(self, window: int, discipline: Optional[str] = None) -> list[tuple[datetime.date, float]]:
+        """Скользящее среднее последних ``window`` оценок в порядке дат, по всем урокам или по одному.
+
+        Returns:
+            list[tuple[`datetime.date`, `float`]]: Дата каждой оценки и среднее на момент этой оценки.
+        """
+
+        if window < 1:
+            raise ValueError('Размер окна должен быть положительным.')
+
+        if discipline is None:
+            rows = sorted(zip(self.date, self.mark))
+        else:
+            index = self._discipline_ids.get(discipline)
+            rows = sorted((date, mark) for date, mark, value in zip(self.date, self.mark, self.discipline) if value == index)
+
+        prefix = list(itertools.accumulate((mark for _, mark in rows), initial=0.0))
+        return [
+            (datetime.date.fromordinal(date), (prefix[i + 1] - prefix[max(0, i + 1 - window)]) / min(i + 1, window))
+            for i, (date, _) in enumerate(rows)
+        ]
@@ -1,6 +1,8 @@
+import datetime
 from dataclasses import dataclass
 
 from ._base import ClientObject
+from ._dates import parse_date
 
 @dataclass(slots=True)
 class Event(ClientObject):
@@ -16,6 +18,12 @@ class Event(ClientObject):
     date_str: str
     theme: str
 
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
@@ -42,6 +50,12 @@ class Birthday(ClientObject):
     photo: str
     short_name: str
 
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
@@ -0,0 +1,155 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+
+class TokenBucket:
+    """Класс, представляющий ведро токенов. Пополняется со скоростью ``rate`` токенов в секунду до ``capacity``.
+
+    Каждый запрос резервирует токен. Если токенов нет, возвращается время ожидания до его появления,
+    поэтому ведро одинаково работает с потоками и с асинхронным кодом.
+
+    Args:
+        rate (`float`): Скорость пополнения в токенах в секунду.
+        capacity (`float`, optional): Вместимость ведра (допустимый всплеск запросов). По умолчанию равна ``rate``, но не меньше 1.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("Скорость пополнения должна быть положительной.")
+
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Зарезервировать токены.
+
+        Returns:
+            `float`: Время в секундах, которое необходимо подождать перед запросом.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+@dataclass(slots=True)
+class RateLimitStats:
+    """Класс, представляющий статистику ограничителя запросов.
+
+    Attributes:
+        requests (`int`): Всего запросов.
+        delayed (`int`): Кол-во запросов, которым пришлось ждать токен.
+        total_wait (`float`): Суммарное время ожидания в секундах.
+        max_wait (`float`): Максимальное время ожидания в секундах.
+    """
+
+    requests: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Среднее время ожидания на запрос в секундах."""
+
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RateLimiter:
+    """Класс, представляющий ограничитель запросов к сайту с общим ведром и отдельными вёдрами для каждой сессии.
+
+    Передаётся в ``BARS.BTransport`` и действует на все клиенты, использующие этот транспорт.
+
+    Args:
+        rate (`float`, optional): Общее ограничение в запросах в секунду. По умолчанию без ограничения.
+        burst (`float`, optional): Допустимый всплеск общих запросов.
+        session_rate (`float`, optional): Ограничение для одной сессии в запросах в секунду. По умолчанию без ограничения.
+        session_burst (`float`, optional): Допустимый всплеск запросов одной сессии.
+        max_sessions (`int`, optional): Максимальное кол-во хранимых вёдер сессий. Давно не используемые удаляются.
+
+    Attributes:
+        stats (`BARS.RateLimitStats`): Статистика ожидания токенов.
+    """
+
+    def __init__(
+            self,
+            *,
+            rate: Optional[float] = None,
+            burst: Optional[float] = None,
+            session_rate: Optional[float] = None,
+            session_burst: Optional[float] = None,
+            max_sessions: int = 10000) -> None:
+
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.max_sessions = max_sessions
+        self.stats = RateLimitStats()
+
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._session_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_session_bucket(self, sessionid: str) -> Optional[TokenBucket]:
+        if not self.session_rate:
+            return None
+
+        with self._lock:
+            bucket = self._session_buckets.get(sessionid)
+            if bucket is None:
+                bucket = self._session_buckets[sessionid] = TokenBucket(self.session_rate, self.session_burst)
+                if len(self._session_buckets) > self.max_sessions:
+                    self._session_buckets.popitem(last=False)
+            else:
+                self._session_buckets.move_to_end(sessionid)
+            return bucket
+
+    def _reserve(self, sessionid: str) -> float:
+        wait = 0.0
+        if self._bucket is not None:
+            wait = self._bucket.reserve()
+        session_bucket = self._get_session_bucket(sessionid)
+        if session_bucket is not None:
+            wait = max(wait, session_bucket.reserve())
+
+        with self._lock:
+            self.stats.requests += 1
+            if wait > 0:
+                self.stats.delayed += 1
+                self.stats.total_wait += wait
+                self.stats.max_wait = max(self.stats.max_wait, wait)
+        return wait
+
+    def acquire(self, sessionid: str) -> float:
+        """Дождаться возможности выполнить запрос от имени сессии.
+
+        Returns:
+            `float`: Время ожидания в секундах.
+        """
+
+        wait = self._reserve(sessionid)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, sessionid: str) -> float:
+        """Асинхронно дождаться возможности выполнить запрос от имени сессии.
+
+        Returns:
+            `float`: Время ожидания в секундах.
+        """
+
+        wait = self._reserve(sessionid)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
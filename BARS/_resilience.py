@@ -0,0 +1,161 @@
+import time
+import random
+import threading
+import logging
+from collections import deque
+from typing import Optional, Literal
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Таймауты по умолчанию в секундах. Месячное расписание и информация о школе заметно объёмнее остальных ответов.
+DEFAULT_TIMEOUTS: dict[str, float] = {
+    'api/ScheduleService/GetMonthSchedule': 20.0,
+    'api/SchoolService/getSchoolInfo': 20.0,
+}
+
+
+class CircuitBreaker:
+    """Класс, представляющий автоматический выключатель запросов к сайту.
+
+    Если доля неудачных запросов среди последних ``window`` превышает ``failure_threshold``,
+    выключатель размыкается, и запросы сразу завершаются ошибкой в течение ``reset_timeout`` секунд.
+    После этого пропускается один пробный запрос: при успехе выключатель замыкается, иначе снова размыкается.
+    Если результат пробного запроса не записан за ``reset_timeout`` секунд (например, запрос был отменён),
+    пропускается новый пробный запрос.
+
+    Один выключатель можно использовать в нескольких клиентах, в том числе из разных потоков.
+
+    Args:
+        failure_threshold (`float`, optional): Доля неудачных запросов, при которой выключатель размыкается.
+        window (`int`, optional): Кол-во последних запросов, по которым считается доля неудачных.
+        min_requests (`int`, optional): Минимальное кол-во запросов в окне для размыкания.
+        reset_timeout (`float`, optional): Время в секундах, на которое размыкается выключатель.
+
+    Attributes:
+        state (`LiteralString`): Текущее состояние. 'closed' - запросы выполняются, 'open' - запросы отклоняются,
+            'half-open' - выполняется пробный запрос.
+    """
+
+    def __init__(
+            self,
+            *,
+            failure_threshold: float = 0.5,
+            window: int = 20,
+            min_requests: int = 10,
+            reset_timeout: float = 30.0) -> None:
+
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state: Literal['closed', 'open', 'half-open'] = 'closed'
+
+        self._results: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Можно ли выполнить запрос."""
+
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # Пробный запрос. В состоянии 'half-open' - замена пробного запроса, результат которого не был записан
+                self.state = 'half-open'
+                self._opened_at = now
+                return True
+            return False
+
+    def record(self, success: bool) -> None:
+        """Записать результат запроса."""
+
+        with self._lock:
+            if self.state == 'half-open':
+                if success:
+                    self.state = 'closed'
+                    self._results.clear()
+                else:
+                    self._open()
+                return
+
+            self._results.append(success)
+            failures = self._results.count(False)
+            if len(self._results) >= self.min_requests and failures / len(self._results) >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        logging.getLogger(__name__).warning('Выключатель разомкнут: слишком много неудачных запросов к сайту.')
+        self.state = 'open'
+        self._opened_at = time.monotonic()
+        self._results.clear()
+
+
+class ResiliencePolicy:
+    """Класс, представляющий политику устойчивости запросов к сайту. Общая для ``BClient`` и ``BClientAsync``.
+
+    Неудачными считаются сетевые ошибки, таймауты, ответы с кодом 5xx и ответы, не являющиеся JSON.
+    Повторяются только GET запросы, с экспоненциальной задержкой и случайным разбросом.
+
+    Args:
+        timeout (`float`, optional): Таймаут запросов в секундах. По умолчанию используется таймаут пула соединений,
+            например ``BARS.BTransport.timeout``.
+        timeouts (`dict[str, float]`, optional): Таймауты по адресу запроса. По умолчанию ``BARS.DEFAULT_TIMEOUTS``.
+        retries (`int`, optional): Кол-во повторов неудачного GET запроса. По умолчанию запросы не повторяются.
+        backoff (`float`, optional): Базовая задержка перед повтором в секундах. Удваивается с каждой попыткой.
+        max_backoff (`float`, optional): Максимальная задержка перед повтором в секундах.
+        breaker (`BARS.CircuitBreaker`, optional): Автоматический выключатель. По умолчанию не используется.
+        serve_stale (`bool`, optional): Возвращать ли устаревший ответ из кэша клиента, если сайт недоступен.
+
+    Attributes:
+        timeout (`float`, optional): Таймаут запросов в секундах.
+        timeouts (`dict[str, float]`): Таймауты по адресу запроса.
+        retries (`int`): Кол-во повторов неудачного GET запроса.
+        breaker (`BARS.CircuitBreaker`, optional): Автоматический выключатель.
+        serve_stale (`bool`): Возвращается ли устаревший ответ из кэша, если сайт недоступен.
+    """
+
+    def __init__(
+            self,
+            *,
+            timeout: Optional[float] = None,
+            timeouts: Optional[dict[str, float]] = None,
+            retries: int = 0,
+            backoff: float = 0.5,
+            max_backoff: float = 8.0,
+            breaker: Optional[CircuitBreaker] = None,
+            serve_stale: bool = True) -> None:
+
+        self.timeout = timeout
+        self.timeouts = DEFAULT_TIMEOUTS.copy() if timeouts is None else timeouts
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker
+        self.serve_stale = serve_stale
+
+    def get_timeout(self, endpoint: str) -> Optional[float]:
+        """Получить таймаут для адреса запроса. ``None``, если используется таймаут пула соединений."""
+
+        return self.timeouts.get(endpoint, self.timeout)
+
+    def get_attempts(self, method: Literal['GET', 'POST']) -> int:
+        """Получить кол-во попыток для HTTP метода."""
+
+        return self.retries + 1 if method == 'GET' else 1
+
+    def get_delay(self, attempt: int) -> float:
+        """Получить задержку перед попыткой ``attempt`` (начиная с 1)."""
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def allow(self) -> bool:
+        """Можно ли выполнить запрос с учётом выключателя."""
+
+        return self.breaker is None or self.breaker.allow()
+
+    def record(self, success: bool) -> None:
+        """Записать результат запроса в выключатель."""
+
+        if self.breaker is not None:
+            self.breaker.record(success)
@@ -1,8 +1,10 @@
+import datetime
 from dataclasses import dataclass
-from collections.abc import Sequence
-from typing import Optional
+from collections.abc import Sequence, Callable
+from typing import Optional, ClassVar, Any
 
 from ._base import ClientObject
+from ._dates import parse_date, parse_time
 
 @dataclass(slots=True)
 class ScheduleLesson(ClientObject):
@@ -36,6 +38,24 @@ class ScheduleLesson(ClientObject):
     time_begin: Optional[str] = None
     time_end: Optional[str] = None
 
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
+    @property
+    def parsed_time_begin(self) -> Optional[datetime.time]:
+        """Начало урока как `datetime.time`. None, если время не указано. Разбор строки кэшируется."""
+
+        return parse_time(self.time_begin) if self.time_begin else None
+
+    @property
+    def parsed_time_end(self) -> Optional[datetime.time]:
+        """Конец урока как `datetime.time`. None, если время не указано. Разбор строки кэшируется."""
+
+        return parse_time(self.time_end) if self.time_end else None
+
     @classmethod
     def de_json(
             cls,
@@ -43,7 +63,6 @@ class ScheduleLesson(ClientObject):
     ) -> 'ScheduleLesson':
 
         data = super(ScheduleLesson, cls).de_json(data)
-        data['id'] = data['id']  # Почему-то это исключает ошибку.
 
         return cls(**data)
 
@@ -63,16 +82,20 @@ class ScheduleDay(ClientObject):
     is_weekend: bool = False
     is_vacation: bool = False
 
+    _defaults: ClassVar[dict[str, Callable[[], Any]]] = {'lessons': list}
+
+    @property
+    def parsed_date(self) -> datetime.date:
+        """Дата как `datetime.date`. Разбор строки кэшируется."""
+
+        return parse_date(self.date)
+
     @classmethod
     def de_json(
             cls,
             data: dict,
     ) -> 'ScheduleDay':
-        try:
-            for i, lesson in enumerate(data['lessons']):
-                data['lessons'][i] = ScheduleLesson.de_json(lesson)
-        except KeyError:
-            data['lessons'] = []
+
         data = super(ScheduleDay, cls).de_json(data)
 
         return cls(**data)
@@ -95,9 +118,6 @@ class ScheduleMonth(ClientObject):
             data: dict,
     ) -> 'ScheduleMonth':
 
-        for i, day in enumerate(data['days']):
-            data['days'][i] = ScheduleDay.de_json(day)
-
         data = super(ScheduleMonth, cls).de_json(data)
 
         return cls(**data)
@@ -67,9 +67,6 @@ class SchoolInfo(ClientObject):
             data: dict,
     ) -> 'SchoolInfo':
 
-        for i, employee in enumerate(data['employees']):
-            data['employees'][i] = Employee.de_json(employee)
-
         data = super(SchoolInfo, cls).de_json(data)
 
         return cls(**data)
@@ -128,9 +125,6 @@ class ClassInfo(ClientObject):
             data: dict,
     ) -> 'ClassInfo':
 
-        for i, pupil in enumerate(data['pupils']):
-            data['pupils'][i] = Pupil.de_json(pupil)
-
         data = super(ClassInfo, cls).de_json(data)
 
         return cls(**data)
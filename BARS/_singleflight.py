@@ -0,0 +1,42 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Объединяет одновременные одинаковые запросы в один.
+
+    Пока запрос с данным ключом выполняется, повторные вызовы не создают новых запросов,
+    а ожидают и получают результат (или ошибку) уже выполняющегося.
+    Отмена одного из ожидающих не отменяет запрос для остальных.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Выполнить ``factory`` или присоединиться к уже выполняющемуся вызову с тем же ключом.
+
+        Args:
+            key (`Hashable`): Ключ запроса.
+            factory (`Callable`): Функция, создающая корутину запроса.
+
+        Returns:
+            `Any`: Результат, общий для всех ожидающих.
+        """
+
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()  # Ошибка уже передана ожидающим
@@ -0,0 +1,212 @@
+import re
+import json
+import codecs
+from typing import Any
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+_decoder = json.JSONDecoder()
+_DELIMITERS = frozenset(' \t\n\r,:]}')
+_NOTHING: Any = object()
+
+
+class StreamParser:
+    """Класс, представляющий потоковый разбор JSON ответа по частям.
+
+    Возвращает элементы, находящиеся по пути ``path``, как только они полностью получены.
+    Шаг пути - ключ объекта или ``'*'`` для всех элементов массива. Например, ``('*', 'days', '*')`` - все дни
+    всех недель месячного расписания, ``('employees', '*')`` - все работники из информации о школе.
+
+    Каждый элемент декодируется целиком средствами стандартной библиотеки, поэтому разбор по частям
+    дороже обычного только на уровнях до элементов. Конец объекта, массива или строки ищется с места остановки
+    в предыдущей части, и значение декодируется один раз, когда получено полностью.
+
+    Args:
+        path (tuple[`str`, ...]): Путь до элементов.
+
+    Attributes:
+        rest (`Any`): Остальные поля объекта верхнего уровня. Если верхний уровень не соответствует пути
+            (например, сайт вернул ошибку), весь ответ.
+    """
+
+    def __init__(self, path: tuple[str, ...]) -> None:
+        self.path = path
+        self.rest: Any = None
+
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._stack: list[list] = []  # [скобка, на пути ли контейнер, текущий ключ]
+        self._scan = (0, 0, False)  # Просмотр текущего значения: (смещение, глубина, внутри ли строки)
+        self._state = 'value'
+        self._on_path = True
+        self._done = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Добавить часть ответа.
+
+        Returns:
+            list[`Any`]: Элементы, полностью полученные в этой части.
+        """
+
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> list[Any]:
+        """Завершить разбор. Вызывает ``ValueError``, если ответ оборван или не является JSON.
+
+        Returns:
+            list[`Any`]: Оставшиеся элементы.
+        """
+
+        self._buffer = self._buffer[self._pos:] + self._text.decode(b'', final=True)
+        self._pos = 0
+        items = self._parse(final=True)
+        if not self._done or self._buffer[self._pos:].strip():
+            raise ValueError('Ответ сайта оборван или не является JSON.')
+        return items
+
+    def _parse(self, final: bool) -> list[Any]:
+        items: list[Any] = []
+        while not self._done:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+            if self._pos >= len(self._buffer):
+                break
+            if not self._step(items, final):
+                break
+        return items
+
+    def _decode_value(self, final: bool) -> Any:
+        """Декодировать значение целиком. Возвращает ``_NOTHING``, если оно ещё не получено."""
+
+        if not final and self._buffer[self._pos] in '"[{' and self._value_end() < 0:
+            return _NOTHING
+        try:
+            value, end = _decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _NOTHING
+        if not final and self._buffer[self._pos] not in '"[{' and (
+                end == len(self._buffer) or self._buffer[end] not in _DELIMITERS):
+            return _NOTHING  # Число или литерал может продолжиться в следующей части
+        self._pos = end
+        self._scan = (0, 0, False)
+        return value
+
+    def _value_end(self) -> int:
+        """Найти конец объекта, массива или строки, начинающихся в ``_pos``. Возвращает -1, если значение ещё не получено.
+
+        Состояние просмотра сохраняется между частями, поэтому каждый символ значения просматривается один раз.
+        Корректность значения не проверяется, это делает декодирование.
+        """
+
+        buffer = self._buffer
+        offset, depth, in_string = self._scan
+        i = self._pos + offset
+        while True:
+            if in_string:
+                match = _STRING_END.search(buffer, i)
+                if match is None:
+                    i = len(buffer)
+                    break
+                i = match.end()
+                if match.group() == '\\':
+                    if i >= len(buffer):
+                        i -= 1  # Экранированный символ в следующей части
+                        break
+                    i += 1
+                    continue
+                in_string = False
+                if depth == 0:
+                    return i
+            else:
+                match = _STRUCTURE.search(buffer, i)
+                if match is None:
+                    i = len(buffer)
+                    break
+                i = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in '[{':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth <= 0:
+                        return i
+        self._scan = (i - self._pos, depth, in_string)
+        return -1
+
+    def _step(self, items: list[Any], final: bool) -> bool:
+        char = self._buffer[self._pos]
+        depth = len(self._stack)
+
+        match self._state:
+            case 'value':
+                expected = None
+                if self._on_path and depth < len(self.path):
+                    expected = '[' if self.path[depth] == '*' else '{'
+                if char == expected:
+                    self._stack.append([char, True, None])
+                    self._pos += 1
+                    self._state = 'first'
+                    return True
+
+                value = self._decode_value(final)
+                if value is _NOTHING:
+                    return False
+                if self._on_path and depth == len(self.path):
+                    items.append(value)
+                elif depth == 0:
+                    self.rest = value
+                    self._done = True
+                elif depth == 1 and self._stack[0][0] == '{':
+                    if self.rest is None:
+                        self.rest = {}
+                    self.rest[self._stack[0][2]] = value
+                self._state = 'after'
+            case 'first' if char in ']}':
+                self._close(char)
+            case 'first' | 'key':
+                if self._stack[-1][0] == '[':
+                    self._on_path = self._stack[-1][1]
+                    self._state = 'value'
+                    return True
+                if char != '"':
+                    raise ValueError(f'Ожидался ключ объекта, получено {char!r}.')
+                key = self._decode_value(final)
+                if key is _NOTHING:
+                    return False
+                self._stack[-1][2] = key
+                self._state = 'colon'
+            case 'colon':
+                if char != ':':
+                    raise ValueError(f'Ожидалось двоеточие, получено {char!r}.')
+                self._pos += 1
+                frame = self._stack[-1]
+                self._on_path = frame[1] and self.path[depth - 1] == frame[2]
+                self._state = 'value'
+            case 'after':
+                if not self._stack:
+                    self._done = True
+                elif char == ',':
+                    self._pos += 1
+                    self._state = 'key'
+                elif char in ']}':
+                    self._close(char)
+                else:
+                    raise ValueError(f'Ожидалась запятая, получено {char!r}.')
+        return True
+
+    def _close(self, char: str) -> None:
+        bracket = self._stack.pop()[0]
+        if (bracket, char) not in (('[', ']'), ('{', '}')):
+            raise ValueError(f'Непарная скобка {char!r}.')
+        self._pos += 1
+        self._state = 'after'
+        if not self._stack:
+            self._done = True
+
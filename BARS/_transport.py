@@ -0,0 +1,150 @@
+import threading
+import httpx
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional, Self, Type
+from types import TracebackType
+
+from ._ratelimit import RateLimiter
+
+
+def _no_cookies() -> CookieJar:
+    """Хранилище cookie, которое ничего не сохраняет. Пул общий для всех сессий, поэтому cookie из ответа
+    одному пользователю не должны отправляться с запросами другого."""
+
+    return CookieJar(DefaultCookiePolicy(allowed_domains=[]))
+
+
+class BTransport:
+    """Класс, представляющий общий транспорт для ``BClient`` и ``BClientAsync``.
+
+    Хранит долгоживущие пулы соединений (синхронный и асинхронный), благодаря чему keep-alive соединения
+    с сайтом переиспользуются между клиентами, пользователями и командами. Пулы создаются при первом обращении.
+
+    Асинхронный пул привязан к циклу событий, в котором был создан. Не используйте один транспорт в разных циклах.
+
+    Args:
+        proxy (`str`, optional): Прокси для запросов.
+        max_connections (`int`, optional): Максимальное кол-во одновременных соединений.
+        max_keepalive_connections (`int`, optional): Максимальное кол-во простаивающих keep-alive соединений.
+        keepalive_expiry (`float`, optional): Время в секундах, после которого простаивающее соединение закрывается.
+        timeout (`float`, optional): Таймаут запросов в секундах.
+        http2 (`bool`, optional): Использовать ли HTTP/2. Требует установленный пакет ``h2``.
+        rate_limiter (`BARS.RateLimiter`, optional): Ограничитель запросов для всех клиентов этого транспорта.
+
+    Attributes:
+        proxy (`str`, optional): Прокси для запросов.
+        limits (`httpx.Limits`): Ограничения пула соединений.
+        timeout (`httpx.Timeout`): Таймаут запросов.
+        http2 (`bool`): Используется ли HTTP/2.
+        rate_limiter (`BARS.RateLimiter`, optional): Ограничитель запросов.
+    """
+
+    def __init__(
+            self,
+            *,
+            proxy: Optional[str] = None,
+            max_connections: Optional[int] = 100,
+            max_keepalive_connections: Optional[int] = 20,
+            keepalive_expiry: Optional[float] = 30.0,
+            timeout: Optional[float] = 5.0,
+            http2: bool = False,
+            rate_limiter: Optional[RateLimiter] = None) -> None:
+
+        self.proxy = proxy
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.http2 = http2
+        self.rate_limiter = rate_limiter
+
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        """Синхронный пул соединений. Создаётся при первом обращении."""
+
+        if self._client is None or self._client.is_closed:
+            with self._lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = httpx.Client(
+                        proxy=self.proxy,
+                        limits=self.limits,
+                        timeout=self.timeout,
+                        cookies=_no_cookies(),
+                        http2=self.http2
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Асинхронный пул соединений. Создаётся при первом обращении."""
+
+        if self._async_client is None or self._async_client.is_closed:
+            with self._lock:
+                if self._async_client is None or self._async_client.is_closed:
+                    self._async_client = httpx.AsyncClient(
+                        proxy=self.proxy,
+                        limits=self.limits,
+                        timeout=self.timeout,
+                        cookies=_no_cookies(),
+                        http2=self.http2
+                    )
+        return self._async_client
+
+    def close(self) -> None:
+        """Закрыть синхронный пул соединений. Асинхронный пул закрывается через ``aclose``."""
+
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Закрыть оба пула соединений."""
+
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        t: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        t: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
+
+
+_default_transport: Optional[BTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> BTransport:
+    """Получить общий для процесса транспорт. Используется клиентами, для которых транспорт не был указан."""
+
+    global _default_transport
+
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = BTransport()
+    return _default_transport
@@ -6,3 +6,6 @@ class InternalError(BClientException):
 
 class Unauthorized(BClientException):
     """Класс исключений, вызываемых если был указан недействительный sessionid."""
+
+class CircuitOpenError(InternalError):
+    """Класс исключений, вызываемых если запросы к сайту временно отключены из-за большого кол-ва ошибок."""
@@ -11,6 +11,8 @@ from telegram.ext.filters import ALL
 
 from src.commands import *
 from src.handlers import handle_message, handle_callback, handle_exception
+from src.general import open_storage, shutdown
+from src.processing import ChatOrderedUpdateProcessor
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.WARNING)
@@ -22,7 +24,16 @@ if __name__ == '__main__':
     token = os.getenv('TELEGRAM_TOKEN')
     if token is None:
         raise ValueError('Токен должен быть указан в переменных среды.')
-    application = ApplicationBuilder().token(token).build()
+    # Обновления разных чатов обрабатываются одновременно, одного чата - по порядку.
+    workers = int(os.getenv('BOT_WORKERS', '32'))
+    application = (
+        ApplicationBuilder()
+        .token(token)
+        .concurrent_updates(ChatOrderedUpdateProcessor(workers))
+        .post_init(open_storage)
+        .post_shutdown(shutdown)
+        .build()
+    )
 
     start_handler = CommandHandler(('start', 'help'), start)
     set_sessionid_handler = CommandHandler('set_sessionid', set_sessionid)
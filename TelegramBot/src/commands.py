@@ -1,7 +1,6 @@
-import json
 from collections.abc import Sequence
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import datetime, timedelta, date as date_
+from typing import Optional
 
 from telegram import Update, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
@@ -10,14 +9,15 @@ import BARS
 from BARS import BClientAsync
 
 from .exceptions import TelegramBotError
-from .general import get_user_from_db, update_db, escape_illegal_chars
-from .utils.commands_utils import proccess_diary, proccess_homework, proccess_schedule
+from .general import get_users, get_user_from_db, user_state, escape_illegal_chars, TRANSPORT, CACHE, POLICY
+from .utils.commands_utils import (
+    proccess_diary, proccess_homework, proccess_schedule, proccess_total_marks,
+    render_diary_day, render_homework_day, render_schedule_day
+)
 from . import templates
 
 # TODO: Добавить опцию для учёта субботы
 
-DB_PATH: Path = Path.cwd() / 'TelegramBot' / 'db.json'
-
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Инициализация пользователя в датабазе. Вывод доступных команд."""
 
@@ -27,18 +27,11 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         raise TelegramBotError("Не удалось получить запись из датабазы. Неизвестный пользователь.")
 
     await update.effective_message.reply_text(templates.WELCOME_TEXT, parse_mode='Markdown')
-    try:
-        with open(DB_PATH, 'r') as f:
-            contents: dict = dict(json.load(f))
-    except FileNotFoundError:
-        with open(DB_PATH, 'w') as f:
-            json.dump({}, f)
-        contents = {}
-
-    user = str(update.message.from_user.id)
-    if user not in contents:
-        contents[str(update.message.from_user.id)] = templates.USER_DICT
-    update_db(contents)
+    user_id = update.message.from_user.id
+    users = get_users()
+    async with users.lock(user_id):
+        if await users.get(user_id) is None:
+            users.set(user_id, dict(templates.USER_DICT))
 
 
 async def set_sessionid(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -49,110 +42,98 @@ async def set_sessionid(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     reply_markup = InlineKeyboardMarkup(templates.SID_BUTTON)
     await update.message.reply_text('Введите sessionid', reply_markup=reply_markup)
-    user: dict = get_user_from_db(update)
-    user['current_operation'] = 'sessionid'
-    update_db(user, update)
-
+    async with user_state(update) as user:
+        user['current_operation'] = 'sessionid'
 
-async def get_diary(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        *,
-        date=None,
-        delta=timedelta(0)
-) -> None:
-    """Комманда /get_diary. Выводит неделю из дневника.
 
-    * ``date`` указывется для указания точки смещения. Если значение пустое, используется сегодняшний день.
-    * ``delta`` указывается для смещения времени при достижении края недели.
-
-    Использует Inline клавиатуру."""
+def week_date(date: Optional[date_], delta: timedelta) -> date_:
+    """Дата, от которой загружается неделя. Выходные переносятся на понедельник следующей недели."""
 
     if date is None:
         date = datetime.now().date()
-
-    user: dict = get_user_from_db(update)
     date += delta
     if date.weekday() in [5, 6]:  # Перейти на следующую неделю, если выходной
         date += timedelta(7 - date.weekday())
-    result_dict: dict = {'current_weekday': date.weekday()}
+    return date
 
-    async with BClientAsync(user['sessionid']) as client:
-        diary_days: Sequence[BARS.DiaryDay] = await client.get_diary(date)
 
-    send_text: str = proccess_diary(result_dict, diary_days, date)
-    user['diary_week'] = result_dict
-    update_db(user, update)
+async def fetch_diary_week(user: dict, *, date: Optional[date_] = None, delta: timedelta = timedelta(0)) -> str:
+    """Загрузить неделю дневника в ``user['diary_week']``. Возвращает текст дня ``date`` для отправки в Телеграм.
 
-    reply_markup = InlineKeyboardMarkup([*templates.DIARY_BUTTONS])
+    Поля пользователя должны быть получены через ``user_state``."""
 
-    if update.message is not None:
-        await update.message.reply_text(send_text, parse_mode='Markdown', reply_markup=reply_markup)
+    date = week_date(date, delta)
 
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
+        diary_days: Sequence[BARS.DiaryDay] = await client.get_diary(date)
 
-async def get_homework(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        *,
-        date=None,
-        delta=timedelta(0)
-) -> None:
-    """Комманда /get_homework. Выводит домашнее задание.
+    user['diary_week'] = proccess_diary(diary_days, date)
+    return render_diary_day(user['diary_week'], date.weekday())
 
-    * ``date`` указывется для указания точки смещения. Если значение пустое, используется сегодняшний день.
-    * ``delta`` указывается для смещения времени при достижении края недели.
 
-     Использует Inline клавиатуру."""
+async def fetch_homework_week(user: dict, *, date: Optional[date_] = None, delta: timedelta = timedelta(0)) -> str:
+    """Загрузить неделю домашнего задания в ``user['homework_week']``. Возвращает текст дня ``date``
+    для отправки в Телеграм.
 
-    if date is None:
-        date = datetime.now().date()
+    Поля пользователя должны быть получены через ``user_state``."""
 
-    user: dict = get_user_from_db(update)
-    date += delta
-    if date.weekday() in [5, 6]:  # Перейти на следующую неделю, если выходной
-        date += timedelta(7 - date.weekday())
-    result_dict: dict = {'current_weekday': date.weekday()}
+    date = week_date(date, delta)
 
-    async with BClientAsync(user['sessionid']) as client:
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         homework: Sequence[BARS.HomeworkDay] = await client.get_homework(date)
 
-    send_text: str = proccess_homework(result_dict, homework, client.base_url, date)
-    user['homework_week'] = result_dict
-    update_db(user, update)
+    user['homework_week'] = proccess_homework(homework, client.base_url, date)
+    return render_homework_day(user['homework_week'], date.weekday())
+
+
+async def fetch_schedule_week(user: dict, *, date: Optional[date_] = None, delta: timedelta = timedelta(0)) -> str:
+    """Загрузить расписание на неделю в ``user['schedule_week']``. Возвращает текст дня ``date``
+    для отправки в Телеграм.
+
+    Поля пользователя должны быть получены через ``user_state``."""
+
+    date = week_date(date, delta)
+
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
+        schedule_week: Sequence[BARS.ScheduleDay] = await client.get_week_schedule(date)
+
+    user['schedule_week'] = proccess_schedule(schedule_week, date)
+    return render_schedule_day(user['schedule_week'], date.weekday())
 
-    reply_markup = InlineKeyboardMarkup([*templates.HOMEWORK_BUTTONS])
+
+async def get_diary(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Комманда /get_diary. Выводит неделю из дневника, начиная с сегодняшнего дня.
+
+    Использует Inline клавиатуру."""
+
+    async with user_state(update) as user:
+        send_text: str = await fetch_diary_week(user)
+
+    reply_markup = InlineKeyboardMarkup([*templates.DIARY_BUTTONS])
 
     if update.message is not None:
         await update.message.reply_text(send_text, parse_mode='Markdown', reply_markup=reply_markup)
 
 
-async def get_schedule_day(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        date=None,
-        delta=timedelta(0)
-) -> None:
-    """Команда /get_schedule_day. Расписание на день/неделю. Записывает в датабазу. Использует Inline клавиатуру.
+async def get_homework(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Комманда /get_homework. Выводит домашнее задание, начиная с сегодняшнего дня.
 
-    ``date`` указывется для указания точки смещения. Если значение пустое, используется сегодняшний день.
-    ``delta`` указывается для смещения времени при достижении края недели.
-    """
+    Использует Inline клавиатуру."""
 
-    if date is None:
-        date = datetime.now().date()
+    async with user_state(update) as user:
+        send_text: str = await fetch_homework_week(user)
 
-    user: dict = get_user_from_db(update)
-    date += delta
-    if date.weekday() in [5, 6]:
-        date += timedelta(7 - date.weekday())
-    result_dict: dict = {'current_weekday': date.weekday()}
+    reply_markup = InlineKeyboardMarkup([*templates.HOMEWORK_BUTTONS])
 
-    async with BClientAsync(user['sessionid']) as client:
-        schedule_week: Sequence[BARS.ScheduleDay] = await client.get_week_schedule(date)
+    if update.message is not None:
+        await update.message.reply_text(send_text, parse_mode='Markdown', reply_markup=reply_markup)
 
-    send_text: str = proccess_schedule(result_dict, schedule_week, date)
-    user['schedule_week'] = result_dict
-    update_db(user, update)
+
+async def get_schedule_day(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Команда /get_schedule_day. Расписание на день/неделю. Записывает в датабазу. Использует Inline клавиатуру."""
+
+    async with user_state(update) as user:
+        send_text: str = await fetch_schedule_week(user)
 
     reply_markup = InlineKeyboardMarkup([*templates.SCHEDULE_DAY_BUTTONS])
 
@@ -166,8 +147,8 @@ async def get_summary_marks(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if update.message is None:
         raise TelegramBotError()
 
-    user: dict = get_user_from_db(update)
-    async with BClientAsync(user['sessionid']) as client:
+    user: dict = await get_user_from_db(update)
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         summary_marks: BARS.SummaryMarks = await client.get_summary_marks(datetime.now().date())
 
     send_text: str = ''
@@ -178,36 +159,21 @@ async def get_summary_marks(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await update.message.reply_text(send_text, parse_mode='Markdown')
 
 
+async def fetch_total_marks(user: dict) -> dict:
+    """Загрузить итоговые оценки по четвертям. Возвращает запись для ``user['total_marks']``."""
+
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
+        total_marks: BARS.TotalMarks = await client.get_total_marks()
+    return proccess_total_marks(total_marks)
+
+
 async def get_total_marks(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Команда /get_total_marks. Итоговые оценки. Записывает в датабазу. Использует Inline клавиатуру.
     Использует обработчик сообщений."""
 
-    user: dict = get_user_from_db(update)
-    total_marks_dict: dict = {}
-
-    async with BClientAsync(user['sessionid']) as client:
-        total_marks: BARS.TotalMarks = await client.get_total_marks()
-
-    subperiod: BARS.Subperiod  # Четверть
-    discipline_mark: BARS.TotalMarksDiscipline  # Сборник оценок по предмету
-    i: int  # Индекс четверти
-    code: str # Код четверти
-    # Конвертация запутанная, т.к. API был создан только для работы с таблицей на самом сайте.
-    for i, code, subperiod in zip(range(4), ('1_1', '1_2', '1_3', '1_4'), total_marks.subperiods):
-        text: str = ""
-        text = '\n*' + subperiod.name + '*\n'
-        for discipline_mark in total_marks.disciplines:
-            for mark in discipline_mark.period_marks:
-                if mark['subperiod_code'] == code:
-                    text += f"{discipline_mark.discipline}: {mark['mark']}\n"
-                    break
-            else:
-                text += 'Оценок нет\n'
-                break
-        total_marks_dict[i] = text
-
-    user['total_marks'] = total_marks_dict
-    update_db(user, update)
+    total_marks: dict = await fetch_total_marks(await get_user_from_db(update))
+    async with user_state(update) as user:
+        user['total_marks'] = total_marks
 
     reply_markup = InlineKeyboardMarkup([
         [templates.TOTAL_MARKS_BUTTONS[0], templates.TOTAL_MARKS_BUTTONS[1]],
@@ -223,9 +189,8 @@ async def get_attendance_data(update: Update, context: ContextTypes.DEFAULT_TYPE
     if update.message is None:
         raise TelegramBotError()
 
-    user: dict = get_user_from_db(update)
-    user['current_operation'] = 'attendancedata'
-    update_db(user, update)
+    async with user_state(update) as user:
+        user['current_operation'] = 'attendancedata'
     await update.message.reply_text('Введите название предмета или `Все` для общей статистики.')
 
 
@@ -236,9 +201,8 @@ async def get_progress_data(update: Update, context: ContextTypes.DEFAULT_TYPE)
         raise TelegramBotError()
 
     await update.message.reply_text('Введите название предмета или `Все` для общей статистики.')
-    user: dict = get_user_from_db(update)
-    user['current_operation'] = 'progressdata'
-    update_db(user, update)
+    async with user_state(update) as user:
+        user['current_operation'] = 'progressdata'
 
 
 async def get_school_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -247,8 +211,8 @@ async def get_school_info(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if update.message is None:
         raise TelegramBotError()
 
-    user: dict = get_user_from_db(update)
-    async with BClientAsync(user['sessionid']) as client:
+    user: dict = await get_user_from_db(update)
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         school_info: BARS.SchoolInfo = await client.get_school_info()
 
     send_text: str = templates.SCHOOL_INFO_TEMPLATE.format(
@@ -269,9 +233,9 @@ async def get_class_info(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if update.message is None:
         raise TelegramBotError()
 
-    user: dict = get_user_from_db(update)
+    user: dict = await get_user_from_db(update)
 
-    async with BClientAsync(user['sessionid']) as client:
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         class_info: BARS.ClassInfo = await client.get_class_info()
 
     pupils: Sequence[str] = [pupil.fullname for pupil in class_info.pupils]
@@ -292,9 +256,9 @@ async def get_birthdays(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     if update.message is None:
         raise TelegramBotError()
 
-    user: dict = get_user_from_db(update)
+    user: dict = await get_user_from_db(update)
 
-    async with BClientAsync(user['sessionid']) as client:
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         birthdays: Sequence[BARS.Birthday] = await client.get_birthdays()
 
     send_text: str = "Дни Рождения:\n" if birthdays else "Дни Рождения отсутствуют."
@@ -311,9 +275,9 @@ async def get_events(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     if update.message is None:
         raise TelegramBotError()
 
-    user: dict = get_user_from_db(update)
+    user: dict = await get_user_from_db(update)
 
-    async with BClientAsync(user['sessionid']) as client:
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         events: Sequence[BARS.Event] = await client.get_events()
 
     send_text: str = "Текущие мероприятия:\n" if events else "Мероприятия отсутствуют."
@@ -1,38 +1,103 @@
-import json
+import copy
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from telegram import Update
+from telegram.ext import Application
+
+from BARS import BTransport, MemoryCache, ResiliencePolicy, CircuitBreaker, RateLimiter
 
 from .exceptions import TelegramBotError
+from .storage import SQLiteStorage, UserCache, migrate_json
+
+DB_PATH: Path = Path.cwd() / 'TelegramBot' / 'db.sqlite3'
+JSON_DB_PATH: Path = Path.cwd() / 'TelegramBot' / 'db.json'  # Датабаза ранних версий, переносится при первом запуске
+
+# Кэш пользователей с отложенной записью в хранилище. Открывается при запуске бота, см. ``get_users``.
+USERS: Optional[UserCache] = None
+
+# Общий пул соединений с сайтом. Избавляет от TLS рукопожатия при каждой команде.
+# Ограничитель сглаживает всплески запросов, чтобы не попадать под ограничения сайта.
+TRANSPORT: BTransport = BTransport(
+    max_connections=100,
+    max_keepalive_connections=50,
+    rate_limiter=RateLimiter(rate=20, burst=40, session_rate=2, session_burst=5)
+)
+
+# Кэш редко меняющихся данных (информация об аккаунте, школе, итоговые оценки).
+CACHE: MemoryCache = MemoryCache(maxsize=10000)
 
-DB_PATH: Path = Path.cwd() / 'TelegramBot' / 'db.json'
+# При массовых ошибках сайта команды сразу завершаются ошибкой (или используют устаревший кэш), а не ждут таймаута.
+POLICY: ResiliencePolicy = ResiliencePolicy(timeout=10.0, retries=2, breaker=CircuitBreaker(reset_timeout=30.0))
+
+def get_users() -> UserCache:
+    """Получить кэш пользователей, открыв хранилище и перенеся ``db.json`` при первом обращении."""
+
+    global USERS
+    if USERS is None:
+        storage = SQLiteStorage(DB_PATH)
+        migrate_json(JSON_DB_PATH, storage)
+        USERS = UserCache(storage)
+    return USERS
+
+
+def get_user_id(update: Update) -> int:
+    """Получить ID пользователя Телеграм."""
 
-def get_user_from_db(update: Update) -> dict:
-    """Получить поля пользователя из датабазы."""
     if update.effective_user is None:
         raise TelegramBotError("Не удалось получить запись из датабазы. Неизвестный пользователь.")
-    with open(DB_PATH, 'r') as f:
-        contents: dict[str, dict] = dict(json.load(f))
-        return contents[str(update.effective_user.id)]
+    return update.effective_user.id
 
 
-def update_db(dictionary: dict, update: Optional[Update] = None) -> None:
-    """Обновить датабазу. Если update не указан, датабаза становиться данным словарём."""
+async def get_user_from_db(update: Update) -> dict:
+    """Получить поля пользователя из датабазы для чтения. Вызывает ``KeyError``, если пользователя нет.
 
-    with open(DB_PATH, 'r') as f:
-        contents: dict[str, dict] = dict(json.load(f))
+    Для изменения полей используйте ``user_state``."""
 
-    if update:
-        if update.effective_user is None:
-            raise TelegramBotError()
+    user_id = get_user_id(update)
+    user = await get_users().get(user_id)
+    if user is None:
+        raise KeyError(user_id)
+    return user
 
-        contents[str(update.effective_user.id)] = dictionary
-        with open(DB_PATH, 'w') as f:
-            json.dump(contents, f)
-    else:
-        with open(DB_PATH, 'w') as f:
-            json.dump(dictionary, f)
+
+@asynccontextmanager
+async def user_state(update: Update) -> AsyncIterator[dict]:
+    """Получить поля пользователя для изменения. Вызывает ``KeyError``, если пользователя нет.
+
+    Пока блок выполняется, другие обработчики этого пользователя ждут, поэтому изменения не теряются при
+    одновременной обработке обновлений. Изменяется копия пользователя: при выходе из блока без ошибки она
+    записывается в датабазу, при ошибке изменения отбрасываются.
+    """
+
+    user_id = get_user_id(update)
+    users = get_users()
+    async with users.lock(user_id):
+        user = await users.get(user_id)
+        if user is None:
+            raise KeyError(user_id)
+        user = copy.deepcopy(user)  # Запись в кэше не должна видеть изменения до успешного завершения
+        yield user
+        users.set(user_id, user)
+
+
+async def open_storage(application: Application) -> None:
+    """Открыть хранилище пользователей при запуске бота."""
+
+    await asyncio.to_thread(get_users)
+
+
+async def shutdown(application: Application) -> None:
+    """Закрыть общий пул соединений и записать изменения пользователей при остановке бота."""
+
+    global USERS
+    await TRANSPORT.aclose()
+    if USERS is not None:
+        await USERS.close()
+        USERS = None
 
 
 def escape_illegal_chars(_object: str) -> str:
@@ -0,0 +1,61 @@
+import asyncio
+import weakref
+from collections.abc import Awaitable
+from typing import Any, Optional
+
+from telegram.ext import BaseUpdateProcessor
+
+
+def chat_key(update: object) -> Optional[int]:
+    """ID чата обновления, или пользователя, если чата нет. ``None`` для обновлений без них."""
+
+    chat = getattr(update, 'effective_chat', None)
+    if chat is not None:
+        return chat.id
+    user = getattr(update, 'effective_user', None)
+    if user is not None:
+        return user.id
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Класс, представляющий одновременную обработку обновлений с сохранением порядка внутри чата.
+
+    Обновления разных чатов обрабатываются одновременно, не более ``workers`` сразу, поэтому медленный
+    запрос к сайту одного пользователя не задерживает остальных. Обновления одного чата обрабатываются
+    по одному в порядке получения: например, sessionid после /set_sessionid.
+
+    Обновления, ожидающие своей очереди в чате, не занимают обработчиков, но учитываются в ``max_pending``.
+
+    Args:
+        workers (`int`): Кол-во одновременно обрабатываемых обновлений.
+        max_pending (`int`, optional): Кол-во обновлений, принятых в обработку, включая ожидающие
+            очереди в чате. По умолчанию в 4 раза больше ``workers``.
+    """
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None) -> None:
+        if workers < 1:
+            raise ValueError('Кол-во обработчиков должно быть положительным.')
+        super().__init__(max(max_pending or workers * 4, workers))
+        self.workers = workers
+        self._workers = asyncio.Semaphore(workers)
+        self._chats: weakref.WeakValueDictionary[int, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = chat_key(update)
+        if key is None:
+            async with self._workers:
+                await coroutine
+            return
+
+        lock = self._chats.get(key)
+        if lock is None:
+            lock = self._chats[key] = asyncio.Lock()
+        async with lock, self._workers:
+            await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -0,0 +1,268 @@
+import os
+import copy
+import json
+import asyncio
+import sqlite3
+import logging
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Optional
+
+
+class Storage(ABC):
+    """Базовый класс хранилища пользователей бота. Записи - словари, ключ - ID пользователя Телеграм."""
+
+    @abstractmethod
+    def get(self, user_id: int) -> Optional[dict]:
+        """Получить запись пользователя. Возвращает ``None``, если пользователя нет."""
+
+    @abstractmethod
+    def set_many(self, users: Iterable[tuple[int, dict]]) -> None:
+        """Записать несколько пользователей за одну операцию."""
+
+    @abstractmethod
+    def ids(self) -> Iterator[int]:
+        """ID всех пользователей."""
+
+    def set(self, user_id: int, user: dict) -> None:
+        """Записать пользователя."""
+
+        self.set_many(((user_id, user),))
+
+    def __contains__(self, user_id: int) -> bool:
+        return self.get(user_id) is not None
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.ids())
+
+    def close(self) -> None:
+        """Закрыть хранилище."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class JsonStorage(Storage):
+    """Хранилище в одном JSON файле, как ``db.json`` в ранних версиях бота.
+
+    Каждая операция читает весь файл, а запись - перезаписывает его целиком, поэтому стоимость растёт
+    с числом пользователей. Используется для миграции и сравнения в бенчмарках.
+
+    Args:
+        path (`Path`): Путь до файла.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return dict(json.load(f))
+        except FileNotFoundError:
+            return {}
+
+    def get(self, user_id: int) -> Optional[dict]:
+        return self._load().get(str(user_id))
+
+    def set_many(self, users: Iterable[tuple[int, dict]]) -> None:
+        contents = self._load()
+        for user_id, user in users:
+            contents[str(user_id)] = user
+
+        # Запись во временный файл и замена: при сбое остаётся старый или новый файл, но не обрезанный.
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(contents, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+    def ids(self) -> Iterator[int]:
+        return (int(user_id) for user_id in self._load())
+
+
+class SQLiteStorage(Storage):
+    """Хранилище в SQLite с журналом WAL. Чтение и запись затрагивают только одну строку по ключу,
+    поэтому их стоимость не зависит от числа пользователей. ``set_many`` выполняется одной транзакцией.
+
+    Соединение можно использовать из нескольких потоков, операции упорядочиваются блокировкой.
+
+    Args:
+        path (`Path` | `str`): Путь до файла датабазы.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, data TEXT NOT NULL)')
+
+    def get(self, user_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute('SELECT data FROM users WHERE id = ?', (user_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set_many(self, users: Iterable[tuple[int, dict]]) -> None:
+        rows = [(user_id, json.dumps(user, ensure_ascii=False, separators=(',', ':'))) for user_id, user in users]
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                self._connection.executemany(
+                    'INSERT INTO users (id, data) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET data = excluded.data',
+                    rows
+                )
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def ids(self) -> Iterator[int]:
+        with self._lock:
+            rows = self._connection.execute('SELECT id FROM users').fetchall()
+        return (row[0] for row in rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class UserCache:
+    """Класс, представляющий кэш пользователей в памяти с отложенной записью в хранилище.
+
+    Чтение кэшированного пользователя и запись не обращаются к диску. Изменённые пользователи записываются
+    в хранилище пакетом не позже, чем через ``flush_interval`` секунд после первого изменения. Чтение
+    отсутствующих в кэше пользователей и запись выполняются в отдельном потоке, не блокируя цикл событий.
+
+    Вытесняются только записанные пользователи, поэтому изменения не теряются при переполнении кэша.
+    Перед остановкой необходимо вызвать ``close``, который записывает оставшиеся изменения.
+
+    Обработчики, изменяющие пользователя, должны удерживать его блокировку ``lock``, иначе при
+    одновременной обработке обновлений одно изменение может перезаписать другое.
+
+    Args:
+        storage (`Storage`): Хранилище пользователей.
+        maxsize (`int`, optional): Кол-во пользователей в кэше.
+        flush_interval (`float`, optional): Задержка записи изменений в секундах.
+    """
+
+    def __init__(self, storage: Storage, maxsize: int = 10000, flush_interval: float = 1.0) -> None:
+        self.storage = storage
+        self.maxsize = maxsize
+        self.flush_interval = flush_interval
+
+        self._users: OrderedDict[int, dict] = OrderedDict()
+        self._dirty: set[int] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._locks: weakref.WeakValueDictionary[int, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def lock(self, user_id: int) -> asyncio.Lock:
+        """Получить блокировку пользователя. Существует, пока её удерживают или ожидают."""
+
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+        return lock
+
+    async def get(self, user_id: int) -> Optional[dict]:
+        """Получить запись пользователя. Возвращает ``None``, если пользователя нет."""
+
+        user = self._users.get(user_id)
+        if user is not None:
+            self._users.move_to_end(user_id)
+            return user
+
+        user = await asyncio.to_thread(self.storage.get, user_id)
+        if user is not None:
+            user = self._users.setdefault(user_id, user)  # Пока шло чтение, пользователя могли записать
+            self._evict()
+        return user
+
+    def set(self, user_id: int, user: dict) -> None:
+        """Записать пользователя в кэш. В хранилище он будет записан при следующем сбросе."""
+
+        self._users[user_id] = user
+        self._users.move_to_end(user_id)
+        self._dirty.add(user_id)
+        self._evict()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def _evict(self) -> None:
+        if len(self._users) <= self.maxsize:
+            return
+        for user_id in list(self._users):
+            if len(self._users) <= self.maxsize:
+                break
+            if user_id not in self._dirty:
+                del self._users[user_id]
+
+    async def _flush_later(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # Изменения остаются в кэше и будут записаны при следующей попытке
+                logging.exception('Не удалось записать пользователей в хранилище.')
+            if not self._dirty:  # Пользователи, изменённые во время записи, записываются следующим пакетом
+                break
+
+    async def flush(self) -> None:
+        """Записать все изменения в хранилище одной операцией."""
+
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            # Снимок делается в цикле событий, чтобы обработчики не изменили записи во время записи в потоке
+            batch = [(user_id, copy.deepcopy(self._users[user_id])) for user_id in self._dirty]
+            self._dirty.clear()
+            try:
+                await asyncio.to_thread(self.storage.set_many, batch)
+            except BaseException:
+                self._dirty.update(user_id for user_id, _ in batch)
+                raise
+            self._evict()
+
+    async def close(self) -> None:
+        """Записать оставшиеся изменения и закрыть хранилище."""
+
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        await asyncio.to_thread(self.storage.close)
+
+
+def migrate_json(json_path: Path, storage: Storage) -> int:
+    """Перенести пользователей из ``db.json`` в ``storage`` одной транзакцией.
+
+    После переноса файл переименовывается в ``db.json.bak``, поэтому повторный вызов ничего не делает.
+
+    Returns:
+        `int`: Кол-во перенесённых пользователей.
+    """
+
+    if not json_path.exists():
+        return 0
+    contents = JsonStorage(json_path)._load()
+    storage.set_many((int(user_id), user) for user_id, user in contents.items())
+    os.replace(json_path, json_path.with_name(json_path.name + '.bak'))
+    logging.info('Перенесено %d пользователей из %s.', len(contents), json_path)
+    return len(contents)
@@ -1,144 +1,209 @@
+import functools
 from collections.abc import Sequence
 from datetime import date
-from datetime import datetime
+from typing import Any, Optional
 
-from BARS import DiaryDay, HomeworkDay, ScheduleDay
+from BARS import DiaryDay, HomeworkDay, ScheduleDay, TotalMarks
 from .. import templates
 
+# Версия формата недель и итоговых оценок в датабазе. Записи другой версии загружаются заново.
+WEEK_VERSION: int = 1
 
-def form_diary_send_text(diary_day: DiaryDay, f_time: str) -> str:
-    """Сформировать текст для отправки в Телеграм."""
-
-    send_text = f"*{f_time}*"
-    for diary_lesson in diary_day.lessons:
-        send_text += templates.DIARY_LESSON_TEMPLATE.format(
-            discipline=diary_lesson.discipline,
-            theme=f'\n{diary_lesson.theme}' if diary_lesson.theme else '',
-            mark_info=f'\n{diary_lesson.mark} - {diary_lesson.mark_type}' if diary_lesson.mark else '',
-            comment=f'\nКомментарий: {diary_lesson.comment}' if diary_lesson.comment else '',
-            remarks=f'\nЗамечание: {diary_lesson.remarks}' if diary_lesson.remarks else '',
-            attendance=f'\n{diary_lesson.attendance}' if diary_lesson.attendance else ''
-        )
-    return send_text
 
+class StringTable:
+    """Таблица строк недели. Повторяющиеся строки (названия уроков, учителя, кабинеты) хранятся один раз,
+    уроки хранят их индексы."""
 
-def proccess_diary(result_dict: dict, diary_days: Sequence[DiaryDay], _date: date) -> str:
-    """Обновляет ``result_dict`` данными о неделе дневника и возвращает текст для отправки в Телеграм."""
-
-    send_text: str = ''
-    for i, diary_day in enumerate(diary_days[:-2]):
-        diary_day.remove_html_tags()
-
-        # Перевод Г-М-Д на Д.М.Г
-        f_time: str = datetime.strptime(diary_day.date, '%Y-%m-%d').strftime('%d.%m.%Y')
-        if diary_day.date == str(_date):
-            send_text = form_diary_send_text(diary_day, f_time)
-
-        result_dict[i] = []
-        for diary_lesson in diary_day.lessons:
-            result_dict[i].append({
-                'date': f_time,
-                'discipline': diary_lesson.discipline,
-                'theme': f'\n{diary_lesson.theme}' if diary_lesson.theme else '',
-                'mark_info': f'\n{diary_lesson.mark} - {diary_lesson.mark_type}' if diary_lesson.mark else '',
-                'comment': f'\nКомментарий: {diary_lesson.comment}' if diary_lesson.comment else '',
-                'remarks': f'\nЗамечание: {diary_lesson.remarks}' if diary_lesson.remarks else '',
-                'attendance': f'\n{diary_lesson.attendance}' if diary_lesson.attendance else ''
-            })
-    return send_text
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
 
+    def __call__(self, value: Any) -> int:
+        value = str(value) if value else ''
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
 
-def form_homework_send_text(homework_day: HomeworkDay, f_time: str, base_url: str) -> str:
-    """Сформировать текст для отправки в Телеграм."""
 
-    send_text = f"*{f_time}*"
-    for homework_lesson in homework_day.homeworks:
-        ttc: str = f'({homework_lesson.homework_time_to_complete} мин)'
-        materials: list = [
-            f'\n[{material['name']}]({base_url[:-1] + material['url']})' for material in homework_lesson.materials
-        ]  # Здесь используется гиперссылка.
+def is_current(week: Optional[dict]) -> bool:
+    """Записана ли неделя или итоговые оценки в текущем формате."""
 
-        send_text += templates.HOMEWORK_LESSON_TEMPLATE.format(
-            discipline=homework_lesson.discipline,
-            homework=homework_lesson.homework if homework_lesson.homework else 'Нет',
-            time_to_complete=ttc if homework_lesson.homework_time_to_complete else '',
-            materials='\nПрикреплённые сслыки: ' + '\n'.join(materials) if materials else ''
-        )
-    return send_text
+    return isinstance(week, dict) and week.get('v') == WEEK_VERSION
 
 
-def proccess_homework(result_dict: dict, homework_days: Sequence[HomeworkDay], base_url: str, _date: date) -> str:
-    """Обновляет ``result_dict`` данными о неделе домашнего задания и возвращает текст для отправки в Телеграм."""
+def make_week(days: Sequence[Any], lessons: list[list[list]], strings: StringTable, _date: date) -> dict:
+    """Сформировать запись недели для датабазы.
 
-    send_text: str = ''
-    for i, homework_day in enumerate(homework_days[:-2]):
-        homework_day.remove_html_tags()
+    Неделя хранит даты дней, таблицу строк и уроки каждого дня в виде списков индексов строк.
+    Текст для отправки в Телеграм формируется из неё при показе дня.
+    """
 
-        # Перевод Г-М-Д на Д.М.Г
-        f_time: str = datetime.strptime(homework_day.homeworks[0].date, '%Y-%m-%d').strftime('%d.%m.%Y')
+    dates = [day.parsed_date.toordinal() for day in days]
+    return {
+        'v': WEEK_VERSION,
+        'current_weekday': _date.weekday(),
+        'dates': dates,
+        'strings': strings.strings,
+        'days': lessons,
+    }
 
-        if homework_day.date == str(_date):
-            send_text = form_homework_send_text(homework_day, f_time, base_url)
-        result_dict[i] = []
-        for homework_lesson in homework_day.homeworks:
-            ttc: str = f'({homework_lesson.homework_time_to_complete} мин)'
 
-            materials: list = [
-                f'\n[{material['name']}]({base_url[:-1] + material['url']})' for material in homework_lesson.materials
-            ]  # Здесь используется гиперссылка.
-
-            result_dict[i].append({
-                'date': f_time,
-                'discipline': homework_lesson.discipline,
-                'homework': homework_lesson.homework if homework_lesson.homework else 'Нет',
-                'time_to_complete': ttc if homework_lesson.homework_time_to_complete else '',
-                'materials': '\nПрикреплённые сслыки: ' + '\n'.join(materials) if materials else ''
-            })
+def render_day(week: dict, index: int, render_lesson: Any) -> str:
+    """Сформировать текст дня ``index`` недели для отправки в Телеграм."""
 
+    if not 0 <= index < len(week['days']):
+        return ''
+    strings: list[str] = week['strings']
+    send_text = f"*{date.fromordinal(week['dates'][index]):%d.%m.%Y}*"
+    for lesson in week['days'][index]:
+        send_text += render_lesson(*(strings[i] for i in lesson))
     return send_text
 
 
-def form_schedule_send_text(schedule_day: ScheduleDay, f_time: str) -> str:
-    """Сформировать текст для отправки в Телеграм."""
-
-    send_text: str = f"*{f_time}*"
-    for lesson in schedule_day.lessons:
-        begin = lesson.time_begin
-        end = lesson.time_end
-        send_text += templates.SCHEDULE_DAY_TEMPLATE.format(
-            discipline=lesson.discipline,
-            teacher=lesson.teacher,
-            office=lesson.office,
-            start=begin[:-3] if begin is not None else "",
-            end=end[:-3] if end is not None else "",
-        )
-    return send_text
-
-
-def proccess_schedule(result_dict: dict, schedule_days: Sequence[ScheduleDay], _date: date) -> str:
-    """Обновляет ``result_dict`` данными о расписании на неделю и возвращает текст для отправки в Телеграм."""
-
-    send_text: str = ""
-    for i, schedule_day in enumerate(schedule_days[:-2]):
-        schedule_day.remove_html_tags()
-
-        # Перевод Г-М-Д на Д.М.Г
-        f_time: str = datetime.strptime(schedule_day.lessons[0].date, '%Y-%m-%d').strftime('%d.%m.%Y')
-
-        if schedule_day.date == str(_date):
-            send_text = form_schedule_send_text(schedule_day, f_time)
-
-        result_dict[i] = []
-        for lesson in schedule_day.lessons:
-            begin = lesson.time_begin
-            end = lesson.time_end
-            result_dict[i].append({
-                'date': f_time,
-                'discipline': lesson.discipline,
-                'teacher': lesson.teacher,
-                'start': begin[:-3] if begin is not None else "",
-                'end': end[:-3] if end is not None else "",
-                'office': lesson.office
-            })
-
+@functools.lru_cache(maxsize=4096)
+def render_diary_lesson(
+        discipline: str, theme: str, mark: str, mark_type: str, comment: str, remarks: str, attendance: str) -> str:
+    return templates.DIARY_LESSON_TEMPLATE.format(
+        discipline=discipline,
+        theme=f'\n{theme}' if theme else '',
+        mark_info=f'\n{mark} - {mark_type}' if mark else '',
+        comment=f'\nКомментарий: {comment}' if comment else '',
+        remarks=f'\nЗамечание: {remarks}' if remarks else '',
+        attendance=f'\n{attendance}' if attendance else ''
+    )
+
+
+def proccess_diary(diary_days: Sequence[DiaryDay], _date: date) -> dict:
+    """Сформировать запись недели дневника для датабазы. День ``_date`` - текущий."""
+
+    strings = StringTable()
+    days = DiaryDay.batch_without_html_tags(diary_days[:-2])
+    lessons = [
+        [
+            [
+                strings(lesson.discipline), strings(lesson.theme), strings(lesson.mark), strings(lesson.mark_type),
+                strings(lesson.comment), strings(lesson.remarks), strings(lesson.attendance)
+            ]
+            for lesson in day.lessons
+        ]
+        for day in days
+    ]
+    return make_week(days, lessons, strings, _date)
+
+
+def render_diary_day(week: dict, index: int) -> str:
+    """Сформировать текст дня дневника для отправки в Телеграм."""
+
+    return render_day(week, index, render_diary_lesson)
+
+
+@functools.lru_cache(maxsize=4096)
+def render_homework_lesson(discipline: str, homework: str, time_to_complete: str, *materials: str) -> str:
+    # materials - пары название, ссылка
+    links = [f'\n[{name}]({url})' for name, url in zip(materials[::2], materials[1::2])]  # Здесь используется гиперссылка.
+    return templates.HOMEWORK_LESSON_TEMPLATE.format(
+        discipline=discipline,
+        homework=homework if homework else 'Нет',
+        time_to_complete=f'({time_to_complete} мин)' if time_to_complete else '',
+        materials='\nПрикреплённые сслыки: ' + '\n'.join(links) if links else ''
+    )
+
+
+def proccess_homework(homework_days: Sequence[HomeworkDay], base_url: str, _date: date) -> dict:
+    """Сформировать запись недели домашнего задания для датабазы. День ``_date`` - текущий."""
+
+    strings = StringTable()
+    days = HomeworkDay.batch_without_html_tags(homework_days[:-2])
+    lessons = []
+    for day in days:
+        lessons.append([])
+        for lesson in day.homeworks:
+            row = [strings(lesson.discipline), strings(lesson.homework), strings(lesson.homework_time_to_complete)]
+            for material in lesson.materials:
+                row += [strings(material['name']), strings(base_url[:-1] + material['url'])]
+            lessons[-1].append(row)
+    return make_week(days, lessons, strings, _date)
+
+
+def render_homework_day(week: dict, index: int) -> str:
+    """Сформировать текст дня домашнего задания для отправки в Телеграм."""
+
+    return render_day(week, index, render_homework_lesson)
+
+
+@functools.lru_cache(maxsize=4096)
+def render_schedule_lesson(discipline: str, teacher: str, office: str, start: str, end: str) -> str:
+    return templates.SCHEDULE_DAY_TEMPLATE.format(
+        discipline=discipline,
+        teacher=teacher,
+        office=office,
+        start=start,
+        end=end,
+    )
+
+
+def proccess_schedule(schedule_days: Sequence[ScheduleDay], _date: date) -> dict:
+    """Сформировать запись расписания на неделю для датабазы. День ``_date`` - текущий."""
+
+    strings = StringTable()
+    days = ScheduleDay.batch_without_html_tags(schedule_days[:-2])
+    lessons = []
+    for day in days:
+        lessons.append([])
+        for lesson in day.lessons:
+            begin = lesson.parsed_time_begin
+            end = lesson.parsed_time_end
+            lessons[-1].append([
+                strings(lesson.discipline),
+                strings(lesson.teacher),
+                strings(lesson.office),
+                strings(f'{begin:%H:%M}' if begin is not None else ''),
+                strings(f'{end:%H:%M}' if end is not None else ''),
+            ])
+    return make_week(days, lessons, strings, _date)
+
+
+def render_schedule_day(week: dict, index: int) -> str:
+    """Сформировать текст дня расписания для отправки в Телеграм."""
+
+    return render_day(week, index, render_schedule_lesson)
+
+
+def proccess_total_marks(total_marks: TotalMarks) -> dict:
+    """Сформировать запись итоговых оценок по четвертям для датабазы.
+
+    Четверть хранит название, пары урок - оценка (индексы строк) и признак того, что оценки выставлены
+    не по всем урокам.
+    """
+
+    strings = StringTable()
+    subperiods = []
+    # Конвертация запутанная, т.к. API был создан только для работы с таблицей на самом сайте.
+    for code, subperiod in zip(('1_1', '1_2', '1_3', '1_4'), total_marks.subperiods):
+        marks: list[int] = []
+        complete = True
+        for discipline_mark in total_marks.disciplines:
+            for mark in discipline_mark.period_marks:
+                if mark['subperiod_code'] == code:
+                    marks += [strings(discipline_mark.discipline), strings(mark['mark'])]
+                    break
+            else:
+                complete = False
+                break
+        subperiods.append([strings(subperiod.name), marks, complete])
+    return {'v': WEEK_VERSION, 'strings': strings.strings, 'subperiods': subperiods}
+
+
+def render_total_marks(total_marks: dict, index: int) -> str:
+    """Сформировать текст итоговых оценок четверти ``index`` для отправки в Телеграм."""
+
+    strings: list[str] = total_marks['strings']
+    name, marks, complete = total_marks['subperiods'][index]
+    send_text = '\n*' + strings[name] + '*\n'
+    for discipline, mark in zip(marks[::2], marks[1::2]):
+        send_text += f"{strings[discipline]}: {strings[mark]}\n"
+    if not complete:
+        send_text += 'Оценок нет\n'
     return send_text
@@ -1,4 +1,5 @@
-from datetime import datetime, timedelta
+from datetime import date as date_, timedelta
+from typing import Optional
 
 from telegram import Update, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
@@ -7,14 +8,10 @@ import BARS
 from BARS import BClientAsync
 
 from ..exceptions import TelegramBotError
-from ..general import update_db, get_user_from_db, get_school_start_year
-from ..commands import get_diary, get_homework, get_schedule_day
-from ..templates import (
-    ATTENDANCE_TEMPLATE,
-    DIARY_BUTTONS, DIARY_LESSON_TEMPLATE,
-    HOMEWORK_BUTTONS, HOMEWORK_LESSON_TEMPLATE,
-    SCHEDULE_DAY_BUTTONS, SCHEDULE_DAY_TEMPLATE
-)
+from ..general import get_school_start_year, TRANSPORT, CACHE, POLICY
+from ..commands import fetch_diary_week, fetch_homework_week, fetch_schedule_week
+from ..templates import ATTENDANCE_TEMPLATE, DIARY_BUTTONS, HOMEWORK_BUTTONS, SCHEDULE_DAY_BUTTONS
+from .commands_utils import is_current, render_diary_day, render_homework_day, render_schedule_day
 
 
 async def process_sessionid(update: Update, user: dict) -> None:
@@ -28,9 +25,14 @@ async def process_sessionid(update: Update, user: dict) -> None:
     if sessionid is None:
         raise TelegramBotError()
 
-    async with BClientAsync(sessionid) as client:
-        pupil_info: BARS.PupilInfo = await client.get_pupil_info()
-        acount_info: BARS.AccountInfo = await client.get_account_info()
+    async with BClientAsync(sessionid, transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
+        pupil_info: BARS.PupilInfo
+        acount_info: BARS.AccountInfo
+        pupil_info, acount_info = await client.gather(
+            client.get_pupil_info(),
+            client.get_account_info(),
+            return_exceptions=False
+        )
 
     name: str = pupil_info.user_fullname.split()[1]
     await update.message.reply_text(f'Привет, {name}!')
@@ -47,7 +49,7 @@ async def process_attendancedata(update: Update, user: dict) -> None:
     elif update.message.text is None:
         raise TelegramBotError()
 
-    async with BClientAsync(user['sessionid']) as client:
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         account: BARS.AccountInfo = await client.get_account_info()
         if update.message.text.lower() == 'все':
             subjectid: int = 0
@@ -90,7 +92,7 @@ async def process_progressdata(update: Update, user: dict) -> None:
     elif update.message.text is None:
         raise TelegramBotError()
 
-    async with BClientAsync(user['sessionid']) as client:
+    async with BClientAsync(user['sessionid'], transport=TRANSPORT, cache=CACHE, policy=POLICY) as client:
         account: BARS.AccountInfo = await client.get_account_info()
         if update.message.text.lower() == 'все':
             subjectid: int = 0
@@ -125,34 +127,33 @@ async def process_diary(
         *,
         step: int
 ) -> None:
-    """Обработать кнопок смены дня дневника. ``step`` это сдвиг дня (1 следующий, -1 предыдущий)."""
+    """Обработать кнопок смены дня дневника. ``step`` это сдвиг дня (1 следующий, -1 предыдущий).
+
+    Поля пользователя должны быть получены через ``user_state``."""
 
     if update.effective_message is None:
         raise TelegramBotError()
 
-    data: dict = user['diary_week']
-    next_index: int = data['current_weekday'] + step
-
-    if next_index > 4:
-        p_date = datetime.strptime(data['4'][0]['date'], '%d.%m.%Y')
-        await get_diary(update, context, date=p_date.date(), delta=timedelta(3))
-        user = get_user_from_db(update)
-        data = user['diary_week']
-        next_index = 0
-    elif next_index < 0:
-        p_date = datetime.strptime(data['0'][0]['date'], '%d.%m.%Y')
-        await get_diary(update, context, date=p_date.date(), delta=timedelta(-3))
-        user = get_user_from_db(update)
+    data: Optional[dict] = user['diary_week']
+    if not is_current(data):  # Неделя не загружалась или записана в старом формате
+        await fetch_diary_week(user)
         data = user['diary_week']
-        next_index = 4
-
-    user['diary_week']['current_weekday'] = next_index
-    update_db(user, update)
+        next_index: int = data['current_weekday']
+    else:
+        next_index = data['current_weekday'] + step
+        if next_index >= len(data['days']):
+            await fetch_diary_week(user, date=date_.fromordinal(data['dates'][-1]), delta=timedelta(3))
+            data = user['diary_week']
+            next_index = 0
+        elif next_index < 0:
+            await fetch_diary_week(user, date=date_.fromordinal(data['dates'][0]), delta=timedelta(-3))
+            data = user['diary_week']
+            next_index = len(data['days']) - 1
+
+    data['current_weekday'] = next_index
 
     reply_markup = InlineKeyboardMarkup([*DIARY_BUTTONS])
-    send_text: str = f"*{data[str(next_index)][0]['date']}*"
-    for diary_lesson in data[str(next_index)]:
-        send_text += DIARY_LESSON_TEMPLATE.format(**diary_lesson)
+    send_text: str = render_diary_day(data, next_index)
     await update.effective_message.edit_text(send_text, parse_mode='Markdown', reply_markup=reply_markup)
 
 
@@ -163,34 +164,33 @@ async def process_homework(
         *,
         step: int
 ) -> None:
-    """Обработать кнопок смены дня домашнего задания. ``step`` это сдвиг дня (1 следующий, -1 предыдущий)."""
+    """Обработать кнопок смены дня домашнего задания. ``step`` это сдвиг дня (1 следующий, -1 предыдущий).
+
+    Поля пользователя должны быть получены через ``user_state``."""
 
     if update.effective_message is None:
         raise TelegramBotError()
 
-    data: dict = user['homework_week']
-    next_index: int = data['current_weekday'] + step
-
-    if next_index > 4:
-        p_date = datetime.strptime(data['4'][0]['date'], '%d.%m.%Y')
-        await get_homework(update, context, date=p_date.date(), delta=timedelta(3))
-        user = get_user_from_db(update)
+    data: Optional[dict] = user['homework_week']
+    if not is_current(data):  # Неделя не загружалась или записана в старом формате
+        await fetch_homework_week(user)
         data = user['homework_week']
-        next_index = 0
-    elif next_index < 0:
-        p_date = datetime.strptime(data['0'][0]['date'], '%d.%m.%Y')
-        await get_homework(update, context, date=p_date.date(), delta=timedelta(-3))
-        user = get_user_from_db(update)
-        data = user['homework_week']
-        next_index = 4
-
-    user['homework_week']['current_weekday'] = next_index
-    update_db(user, update)
+        next_index: int = data['current_weekday']
+    else:
+        next_index = data['current_weekday'] + step
+        if next_index >= len(data['days']):
+            await fetch_homework_week(user, date=date_.fromordinal(data['dates'][-1]), delta=timedelta(3))
+            data = user['homework_week']
+            next_index = 0
+        elif next_index < 0:
+            await fetch_homework_week(user, date=date_.fromordinal(data['dates'][0]), delta=timedelta(-3))
+            data = user['homework_week']
+            next_index = len(data['days']) - 1
+
+    data['current_weekday'] = next_index
 
     reply_markup = InlineKeyboardMarkup([*HOMEWORK_BUTTONS])
-    send_text: str = f"*{data[str(next_index)][0]['date']}*"
-    for homework_lesson in data[str(next_index)]:
-        send_text += HOMEWORK_LESSON_TEMPLATE.format(**homework_lesson)
+    send_text: str = render_homework_day(data, next_index)
     await update.effective_message.edit_text(send_text, parse_mode='Markdown', reply_markup=reply_markup)
 
 
@@ -201,32 +201,31 @@ async def process_schedule(
         *,
         step: int
 ) -> None:
-    """Обработать кнопок смены дня расписания. ``step`` это сдвиг дня (1 следующий, -1 предыдущий)."""
+    """Обработать кнопок смены дня расписания. ``step`` это сдвиг дня (1 следующий, -1 предыдущий).
+
+    Поля пользователя должны быть получены через ``user_state``."""
     
     if update.effective_message is None:
         raise TelegramBotError()
 
-    data: dict = user['schedule_week']
-    next_index = data['current_weekday'] + step
-
-    if next_index > 4:
-        p_date = datetime.strptime(data['4'][0]['date'], '%d.%m.%Y')
-        await get_schedule_day(update, context, date=p_date.date(), delta=timedelta(3))
-        user = get_user_from_db(update)
-        data = user['schedule_week']
-        next_index = 0
-    elif next_index < 0:
-        p_date = datetime.strptime(data['0'][0]['date'], '%d.%m.%Y')
-        await get_schedule_day(update, context, date=p_date.date(), delta=timedelta(-3))
-        user = get_user_from_db(update)
+    data: Optional[dict] = user['schedule_week']
+    if not is_current(data):  # Неделя не загружалась или записана в старом формате
+        await fetch_schedule_week(user)
         data = user['schedule_week']
-        next_index = 4
-
-    user['schedule_week']['current_weekday'] = next_index
-    update_db(user, update)
+        next_index: int = data['current_weekday']
+    else:
+        next_index = data['current_weekday'] + step
+        if next_index >= len(data['days']):
+            await fetch_schedule_week(user, date=date_.fromordinal(data['dates'][-1]), delta=timedelta(3))
+            data = user['schedule_week']
+            next_index = 0
+        elif next_index < 0:
+            await fetch_schedule_week(user, date=date_.fromordinal(data['dates'][0]), delta=timedelta(-3))
+            data = user['schedule_week']
+            next_index = len(data['days']) - 1
+
+    data['current_weekday'] = next_index
 
     reply_markup = InlineKeyboardMarkup([*SCHEDULE_DAY_BUTTONS])
-    send_text: str = f"*{data[str(next_index)][0]['date']}*"
-    for schedule in data[str(next_index)]:
-        send_text += SCHEDULE_DAY_TEMPLATE.format(**schedule)
+    send_text: str = render_schedule_day(data, next_index)
     await update.effective_message.edit_text(send_text, parse_mode='Markdown', reply_markup=reply_markup)
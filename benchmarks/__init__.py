@@ -0,0 +1 @@
+"""Бенчмарки BARS и Телеграм бота на локальном сервере, имитирующем сайт. См. ``python -m benchmarks --help``."""
@@ -0,0 +1,80 @@
+"""Запуск бенчмарков: ``python -m benchmarks [--only clients models bot storage stream import] [--json results.json] [--compare baseline.json]``."""
+
+import argparse
+
+from BARS import ENDPOINTS
+
+from .common import Result, report, dump, compare
+from .fake_server import FakeBARS
+from .bench_clients import bench_sync, bench_async
+from .bench_models import bench_de_json, bench_decoders, bench_html, bench_remove_html_tags, bench_marks_table
+from .bench_bot import bench_handlers, bench_storage, bench_update_processor
+from .bench_stream import bench_stream
+from .bench_import import bench_import
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Бенчмарки BARS на локальном сервере.')
+    parser.add_argument('--only', nargs='+', choices=('clients', 'models', 'bot', 'storage', 'stream', 'import'),
+                        default=('clients', 'models', 'bot', 'storage', 'stream', 'import'))
+    parser.add_argument('--requests', type=int, default=1500, help='Кол-во запросов для бенчмарков клиентов.')
+    parser.add_argument('--threads', type=int, default=8, help='Кол-во потоков для BClient.')
+    parser.add_argument('--concurrency', type=int, default=50, help='Кол-во одновременных запросов для BClientAsync и бота.')
+    parser.add_argument('--iterations', type=int, default=200, help='Кол-во итераций для de_json и обработчиков бота.')
+    parser.add_argument('--rounds', type=int, default=5, help='Кол-во повторов de_json, учитывается самый быстрый.')
+    parser.add_argument('--decoders', action='store_true', help='Также замерить декодеры JSON.')
+    parser.add_argument('--lazy', action='store_true', help='Также замерить ленивые объекты (view).')
+    parser.add_argument('--endpoint', nargs='+', choices=tuple(ENDPOINTS), default=tuple(ENDPOINTS))
+    parser.add_argument('--latency', type=float, default=0.0, help='Задержка ответа сервера в секундах.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Случайная добавка к задержке в секундах.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов сервера с ошибкой 502.')
+    parser.add_argument('--bandwidth', type=int, default=500_000, help='Скорость ответа сервера в байтах в секунду для stream.')
+    parser.add_argument('--retries', type=int, default=0, help='Кол-во повторов неудачных GET запросов.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Сохранить результаты в файл для сравнения между запусками.')
+    parser.add_argument('--compare', help='Сравнить результаты с файлом, сохранённым через --json.')
+    args = parser.parse_args()
+
+    results: list[Result] = []
+    with FakeBARS(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed) as server:
+        if 'clients' in args.only:
+            results.append(bench_sync(
+                server, requests=args.requests, threads=1, endpoints=args.endpoint, retries=args.retries
+            ))
+            results.append(bench_sync(
+                server, requests=args.requests, threads=args.threads, endpoints=args.endpoint, retries=args.retries
+            ))
+            results.append(bench_async(
+                server, requests=args.requests, concurrency=args.concurrency, endpoints=args.endpoint, retries=args.retries
+            ))
+        if 'models' in args.only:
+            results.extend(bench_de_json(iterations=args.iterations, rounds=args.rounds, endpoints=args.endpoint))
+            if args.decoders:
+                results.extend(bench_decoders(iterations=args.iterations, rounds=args.rounds, endpoints=args.endpoint))
+            results.extend(bench_html(iterations=args.iterations, rounds=args.rounds))
+            results.extend(bench_remove_html_tags(iterations=args.iterations, rounds=args.rounds))
+            results.extend(bench_marks_table(rounds=args.rounds))
+            if args.lazy:
+                results.extend(bench_de_json(
+                    iterations=args.iterations, rounds=args.rounds, endpoints=args.endpoint, lazy=True
+                ))
+        if 'bot' in args.only:
+            results.extend(bench_handlers(server, iterations=args.iterations, concurrency=args.concurrency))
+            results.extend(bench_update_processor(workers=args.concurrency))
+    if 'storage' in args.only:
+        results.extend(bench_storage(iterations=max(args.iterations // 10, 1), seed=args.seed))
+    if 'stream' in args.only:
+        results.extend(bench_stream(iterations=max(args.iterations // 10, 1), bandwidth=args.bandwidth, latency=args.latency))
+    if 'import' in args.only:
+        results.extend(bench_import(iterations=max(args.iterations // 10, 1)))
+
+    report(results)
+    if args.json:
+        dump(results, args.json)
+    if args.compare:
+        print()
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import sys
+import random
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from .common import PUPILID, Result, measure, measure_async, peak_memory_async
+from .fake_server import FakeBARS
+
+BOT_PATH: Path = Path(__file__).parent.parent / 'TelegramBot'
+
+USERS: tuple[int, ...] = (100, 1000, 10_000, 100_000)
+
+COMMANDS: tuple[str, ...] = (
+    'get_diary',
+    'get_homework',
+    'get_schedule_day',
+    'get_summary_marks',
+    'get_total_marks',
+    'get_school_info',
+    'get_class_info',
+    'get_birthdays',
+    'get_events',
+)
+
+
+class FakeMessage:
+    """Сообщение Телеграм, которое запоминает ответы вместо отправки."""
+
+    def __init__(self, user: SimpleNamespace) -> None:
+        self.from_user = user
+        self.replies: list[str] = []
+
+    async def reply_text(self, text: str, **kwargs: Any) -> None:
+        self.replies.append(text)
+
+
+def import_bot() -> None:
+    """Сделать пакет бота ``src`` импортируемым. Пакет бота не устанавливается."""
+
+    if str(BOT_PATH) not in sys.path:
+        sys.path.insert(0, str(BOT_PATH))
+
+
+def make_update(user_id: int) -> SimpleNamespace:
+    user = SimpleNamespace(id=user_id)
+    message = FakeMessage(user)
+    return SimpleNamespace(effective_user=user, effective_message=message, message=message)
+
+
+def bench_handlers(
+        server: FakeBARS,
+        *,
+        iterations: int,
+        concurrency: int = 20,
+        commands: tuple[str, ...] = COMMANDS,
+        rate_limit: bool = False) -> list[Result]:
+    """Бенчмарк обработчиков команд Телеграм бота с общим транспортом, кэшем и датабазой бота.
+
+    Запросы транспорта бота перенаправляются на ``server``. Каждый обработчик вызывается ``iterations`` раз
+    от имени ``concurrency`` пользователей. Ограничитель запросов бота по умолчанию отключается,
+    иначе он, а не обработчики, определяет результат.
+    """
+
+    import_bot()
+    from src import commands as bot_commands, general, templates  # pyright: ignore
+    from src.storage import SQLiteStorage, UserCache  # pyright: ignore
+
+    saved = general.DB_PATH, general.JSON_DB_PATH, general.USERS, general.TRANSPORT.rate_limiter
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        general.DB_PATH = Path(directory) / 'db.sqlite3'
+        general.JSON_DB_PATH = Path(directory) / 'db.json'
+        storage = SQLiteStorage(general.DB_PATH)
+        storage.set_many(
+            (i, {**templates.USER_DICT, 'sessionid': f'session{i}', 'pupilid': PUPILID}) for i in range(concurrency)
+        )
+        if not rate_limit:
+            general.TRANSPORT.rate_limiter = None
+        server.redirect(general.TRANSPORT)
+
+        async def run() -> None:
+            general.USERS = UserCache(storage)
+            try:
+                for command in commands:
+                    handler = getattr(bot_commands, command)
+
+                    def operations(count: int, handler=handler) -> list:
+                        return [(lambda update=make_update(i % concurrency): handler(update, None)) for i in range(count)]
+
+                    result = await measure_async(f'/{command} x{concurrency}', operations(iterations), concurrency)
+                    result.peak_memory = await peak_memory_async(
+                        lambda: measure_async(command, operations(concurrency), concurrency)
+                    )
+                    results.append(result)
+            finally:
+                await general.TRANSPORT.aclose()
+                await general.USERS.close()
+
+        try:
+            asyncio.run(run())
+        finally:
+            general.DB_PATH, general.JSON_DB_PATH, general.USERS, general.TRANSPORT.rate_limiter = saved
+    return results
+
+
+def bench_storage(*, iterations: int, users: tuple[int, ...] = USERS, seed: int = 0) -> list[Result]:
+    """Бенчмарк хранилищ пользователей бота: чтение и запись записи случайного пользователя,
+    как при обработке одной команды, для датабазы из ``users`` пользователей.
+
+    Стоимость ``JsonStorage`` растёт с числом пользователей, ``SQLiteStorage`` - нет. ``UserCache`` замеряется
+    для уже кэшированных пользователей: запись в хранилище происходит пакетами вне цикла событий.
+    """
+
+    import_bot()
+    from src import templates  # pyright: ignore
+    from src.storage import JsonStorage, SQLiteStorage, UserCache  # pyright: ignore
+
+    rng = random.Random(seed)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in users:
+            records = [
+                (i, {**templates.USER_DICT, 'sessionid': f'session{i}', 'pupilid': PUPILID}) for i in range(count)
+            ]
+            backends = (
+                ('json', JsonStorage(Path(directory) / f'{count}.json')),
+                ('sqlite', SQLiteStorage(Path(directory) / f'{count}.sqlite3')),
+            )
+            for label, storage in backends:
+                with storage:
+                    storage.set_many(records)
+
+                    def command(storage=storage) -> None:
+                        user_id = rng.randrange(count)
+                        user = storage.get(user_id)
+                        user['current_operation'] = 'sessionid'
+                        storage.set(user_id, user)
+
+                    results.append(measure(f'storage {label} x{count}', [command] * iterations))
+
+            async def cached(count: int = count) -> Result:
+                cache = UserCache(SQLiteStorage(Path(directory) / f'{count}.sqlite3'), maxsize=count)
+                active = [rng.randrange(count) for _ in range(min(count, 1000))]
+                for user_id in active:
+                    await cache.get(user_id)
+
+                async def command() -> None:
+                    user_id = rng.choice(active)
+                    user = await cache.get(user_id)
+                    user['current_operation'] = 'sessionid'
+                    cache.set(user_id, user)
+
+                result = await measure_async(f'storage cache x{count}', [command] * iterations, 1)
+                await cache.close()
+                return result
+
+            results.append(asyncio.run(cached()))
+    return results
+
+
+def bench_update_processor(
+        *,
+        updates: int = 400,
+        chats: int = 100,
+        workers: int = 32,
+        latency: float = 0.02) -> list[Result]:
+    """Бенчмарк обработки ``updates`` обновлений от ``chats`` чатов, каждое из которых ждёт ответа сайта
+    ``latency`` секунд: по одному (как ``Application`` по умолчанию) и через ``ChatOrderedUpdateProcessor``.
+    Задержка - время от получения обновления до конца его обработки.
+    """
+
+    import_bot()
+    from telegram.ext import SimpleUpdateProcessor
+    from src.processing import ChatOrderedUpdateProcessor  # pyright: ignore
+
+    async def run(name: str, processor: Any) -> Result:
+        received = asyncio.get_running_loop().time()
+        latencies = []
+
+        async def handle() -> None:
+            await asyncio.sleep(latency)
+            latencies.append(asyncio.get_running_loop().time() - received)
+
+        chat_updates = [SimpleNamespace(effective_chat=SimpleNamespace(id=i % chats)) for i in range(updates)]
+        tasks = [asyncio.create_task(processor.process_update(update, handle())) for update in chat_updates]
+        await asyncio.gather(*tasks)
+        return Result(name, latencies, asyncio.get_running_loop().time() - received)
+
+    return [
+        asyncio.run(run(f'updates x{updates} по одному', SimpleUpdateProcessor(1))),
+        asyncio.run(run(f'updates x{updates} {workers} обработчиков', ChatOrderedUpdateProcessor(workers))),
+    ]
@@ -0,0 +1,65 @@
+import asyncio
+import itertools
+from collections.abc import Sequence
+
+from BARS import BClient, BClientAsync, BTransport, ResiliencePolicy, ENDPOINTS
+
+from .common import ARGUMENTS, Result, measure_threaded, measure_async, peak_memory
+from .fake_server import FakeBARS
+
+
+def bench_sync(
+        server: FakeBARS,
+        *,
+        requests: int,
+        threads: int = 1,
+        endpoints: Sequence[str] = tuple(ENDPOINTS),
+        retries: int = 0) -> Result:
+    """Бенчмарк ``BClient``: ``requests`` запросов по кругу ко всем ``endpoints`` в ``threads`` потоках."""
+
+    policy = ResiliencePolicy(retries=retries, backoff=0)
+
+    def run(count: int) -> Result:
+        with BTransport(max_connections=max(threads, 1)) as transport:
+            clients = [
+                BClient(f'session{i}', base_url=server.url, transport=transport, policy=policy) for i in range(max(threads, 1))
+            ]
+            names = itertools.islice(itertools.cycle(endpoints), count)
+            operations = [
+                (lambda client=clients[i % len(clients)], name=name: getattr(client, name)(*ARGUMENTS.get(name, ())))
+                for i, name in enumerate(names)
+            ]
+            return measure_threaded(f'BClient x{threads}', operations, threads)
+
+    result = run(requests)
+    result.peak_memory = peak_memory(lambda: run(min(requests, 10 * len(endpoints))))
+    return result
+
+
+def bench_async(
+        server: FakeBARS,
+        *,
+        requests: int,
+        concurrency: int = 50,
+        endpoints: Sequence[str] = tuple(ENDPOINTS),
+        retries: int = 0) -> Result:
+    """Бенчмарк ``BClientAsync``: ``requests`` запросов по кругу ко всем ``endpoints``, не более ``concurrency`` одновременно.
+
+    Каждый запрос выполняется от имени своей сессии, чтобы одинаковые запросы не объединялись.
+    """
+
+    policy = ResiliencePolicy(retries=retries, backoff=0)
+
+    async def run(count: int) -> Result:
+        async with BTransport(max_connections=concurrency) as transport:
+            names = itertools.islice(itertools.cycle(endpoints), count)
+            operations = [
+                (lambda client=BClientAsync(f'session{i}', base_url=server.url, transport=transport, policy=policy), name=name:
+                    getattr(client, name)(*ARGUMENTS.get(name, ())))
+                for i, name in enumerate(names)
+            ]
+            return await measure_async(f'BClientAsync x{concurrency}', operations, concurrency)
+
+    result = asyncio.run(run(requests))
+    result.peak_memory = peak_memory(lambda: asyncio.run(run(min(requests, 10 * len(endpoints)))))
+    return result
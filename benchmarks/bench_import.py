@@ -0,0 +1,50 @@
+import sys
+import subprocess
+from pathlib import Path
+
+from .common import Result, measure
+
+ROOT: Path = Path(__file__).parent.parent
+
+# Название -> код, время импорта которого замеряется в новом процессе.
+SCENARIOS: dict[str, str] = {
+    'import BARS': 'import BARS',
+    'import BARS (модели)': 'import BARS; BARS.DiaryDay, BARS.HomeworkDay, BARS.ScheduleDay',
+    'import BARS (клиенты)': 'import BARS; BARS.BClient, BARS.BClientAsync',
+}
+
+
+def import_time(code: str) -> float:
+    """Суммарное время импортов в секундах при выполнении ``code`` в новом процессе, по данным ``-X importtime``.
+
+    Время запуска интерпретатора (``site`` и ``encodings``) не учитывается.
+    """
+
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if name.startswith(' ') and not name.startswith('  ') and name.strip() not in ('site', 'encodings'):
+            total += int(cumulative)  # Только импорты верхнего уровня, вложенные уже входят в них
+    return total / 1_000_000
+
+
+def bench_import(*, iterations: int) -> list[Result]:
+    """Бенчмарк холодного импорта ``BARS``: каждый замер - новый процесс интерпретатора.
+
+    В ``latencies`` записывается время импортов по ``-X importtime``, без запуска интерпретатора.
+    """
+
+    results = []
+    for name, code in SCENARIOS.items():
+        times = []
+        result = measure(name, [lambda: times.append(import_time(code))] * iterations)
+        result.latencies = times
+        result.elapsed = sum(times)
+        results.append(result)
+    return results
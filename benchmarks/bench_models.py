@@ -0,0 +1,210 @@
+import re
+import json
+import importlib.util
+from collections.abc import Sequence, Callable, Iterator
+from typing import Any
+
+from BARS import ENDPOINTS, DECODERS, SummaryMarks, MarksTable
+from BARS._html import clean_html
+
+from .common import Result, measure, peak_memory
+from .fake_server import FIXTURES_PATH
+
+
+def load_fixture(name: str) -> bytes:
+    """Получить записанный ответ для метода клиента."""
+
+    return (FIXTURES_PATH / (ENDPOINTS[name].path.rsplit('/', 1)[-1] + '.json')).read_bytes()
+
+
+def bench_de_json(
+        *,
+        iterations: int,
+        rounds: int = 5,
+        endpoints: Sequence[str] = tuple(ENDPOINTS),
+        lazy: bool = False) -> list[Result]:
+    """Бенчмарк преобразования записанных ответов в объекты библиотеки (``de_json`` всего дерева моделей).
+
+    ``de_json`` изменяет переданные словари, поэтому каждая итерация получает свою заранее декодированную копию.
+    Декодирование JSON не входит в замеры.
+    Замер повторяется ``rounds`` раз, в результат попадает самый быстрый, чтобы сравнение между запусками было устойчивым.
+    Если ``lazy``, замеряется создание ленивых объектов (``BARS.LazyList`` и ``view``) без обращения к вложенным.
+    """
+
+    results = []
+    for name in endpoints:
+        endpoint = ENDPOINTS[name]
+        if endpoint.model is None:
+            continue
+
+        raw = load_fixture(name)
+        result = None
+        for _ in range(rounds):
+            copies = [json.loads(raw) for _ in range(iterations)]
+            attempt = measure(
+                f'{'view' if lazy else 'de_json'} {endpoint.model.__name__}',
+                [lambda data=data: endpoint.parse(data, '', lazy) for data in copies]
+            )
+            if result is None or attempt.elapsed < result.elapsed:
+                result = attempt
+        data = json.loads(raw)
+        result.peak_memory = peak_memory(lambda: endpoint.parse(data, '', lazy))
+        results.append(result)
+    return results
+
+
+def bench_decoders(*, iterations: int, rounds: int = 5, endpoints: Sequence[str] = tuple(ENDPOINTS)) -> list[Result]:
+    """Бенчмарк декодирования записанных ответов каждым установленным декодером из ``BARS.DECODERS``."""
+
+    decoders = []
+    for decoder in DECODERS.values():
+        try:
+            decoders.append(decoder())
+        except ImportError:
+            continue
+
+    results = []
+    for name in endpoints:
+        raw = load_fixture(name)
+        for decoder in decoders:
+            result = None
+            for _ in range(rounds):
+                attempt = measure(
+                    f'decode {decoder.name} {ENDPOINTS[name].path.rsplit('/', 1)[-1]}',
+                    [lambda: decoder.loads(raw)] * iterations
+                )
+                if result is None or attempt.elapsed < result.elapsed:
+                    result = attempt
+            result.peak_memory = peak_memory(lambda: decoder.loads(raw))
+            results.append(result)
+    return results
+
+
+def legacy_remove_html_tags(text: str, replace_p_with: str = '\n') -> str:
+    """Прежняя реализация ``remove_html_tags`` для строк: BeautifulSoup для каждой ссылки. Требует ``beautifulsoup4`` и ``lxml``."""
+
+    from bs4 import BeautifulSoup
+
+    links = re.findall(r'<a href="[^"]+">.+[</a>]', text)
+    for link in links:
+        tag = BeautifulSoup(link, 'lxml').find('a')
+        text = text.replace(link, f'[{tag.text}]({tag.get('href')}) ')  # type: ignore
+    text = re.sub(r'<[^>]+>', '', text.replace('<p', f'{replace_p_with}<p'))
+    if replace_p_with == ' ':
+        text = text.replace('  ', ' ')
+    return text.strip()
+
+
+def _strings(data: Any) -> Iterator[str]:
+    if isinstance(data, str):
+        yield data
+    elif isinstance(data, list):
+        for item in data:
+            yield from _strings(item)
+    elif isinstance(data, dict):
+        for value in data.values():
+            yield from _strings(value)
+
+
+def bench_html(*, iterations: int, rounds: int = 5, endpoints: Sequence[str] = ('get_homework', 'get_diary')) -> list[Result]:
+    """Бенчмарк очистки HTML: все строки записанного ответа (неделя) за одну операцию.
+
+    Сравниваются прежняя реализация на BeautifulSoup (если установлена), ``clean_html`` без кэша
+    и ``clean_html`` с кэшем, как при повторной отрисовке одной и той же недели.
+    """
+
+    implementations: dict[str, Callable[[str], str]] = {
+        'bs4': legacy_remove_html_tags,
+        'regex': clean_html.__wrapped__,
+        'regex+cache': clean_html,
+    }
+    if importlib.util.find_spec('bs4') is None:
+        del implementations['bs4']
+
+    results = []
+    for name in endpoints:
+        strings = list(_strings(json.loads(load_fixture(name))))
+        for label, implementation in implementations.items():
+            def operation() -> None:
+                for string in strings:
+                    implementation(string)
+
+            result = None
+            for _ in range(rounds):
+                attempt = measure(f'html {label} {ENDPOINTS[name].model.__name__}', [operation] * iterations)  # type: ignore
+                if result is None or attempt.elapsed < result.elapsed:
+                    result = attempt
+            result.peak_memory = peak_memory(operation)
+            results.append(result)
+    return results
+
+
+def bench_remove_html_tags(*, iterations: int, rounds: int = 5, endpoints: Sequence[str] = ('get_homework', 'get_diary')) -> list[Result]:
+    """Бенчмарк очистки недели объектов, как в обработчиках бота: ``remove_html_tags`` на месте и ``batch_without_html_tags``.
+
+    Кэш ``clean_html`` заполняется до замеров, поэтому замеряется в основном обход объектов.
+    """
+
+    implementations: dict[str, Callable[[list], Any]] = {
+        'remove_html_tags': lambda week: [day.remove_html_tags() for day in week],
+        'batch_without_html_tags': lambda week: type(week[0]).batch_without_html_tags(week),
+    }
+
+    results = []
+    for name in endpoints:
+        endpoint = ENDPOINTS[name]
+        data = json.loads(load_fixture(name))
+        for label, implementation in implementations.items():
+            implementation(endpoint.parse(data, ''))
+            result = None
+            for _ in range(rounds):
+                weeks = [endpoint.parse(data, '') for _ in range(iterations)]
+                attempt = measure(
+                    f'{label} {endpoint.model.__name__}',  # type: ignore
+                    [lambda week=week: implementation(week) for week in weeks]
+                )
+                if result is None or attempt.elapsed < result.elapsed:
+                    result = attempt
+            week = endpoint.parse(data, '')
+            result.peak_memory = peak_memory(lambda: implementation(week))  # type: ignore
+            results.append(result)  # type: ignore
+    return results
+
+
+def bench_marks_table(*, pupils: int = 30, quarters: int = 4, rounds: int = 5) -> list[Result]:
+    """Бенчмарк статистики по сводным оценкам класса за год: ``pupils`` x ``quarters`` ответов ``get_summary_marks``.
+
+    Сравнивает дерево объектов (``SummaryMarks.de_json`` и средние по ``Mark``) с ``BARS.MarksTable``,
+    построенной из ответов без создания объектов. Память - пиковое выделение при построении и хранении всех данных.
+    """
+
+    responses = [json.loads(load_fixture('get_summary_marks')) for _ in range(pupils * quarters)]
+
+    def objects() -> list:
+        marks = [SummaryMarks.de_json(response) for response in responses]
+        sums: dict[str, list[float]] = {}
+        for summary in marks:
+            for discipline in summary.disciplines:
+                total = sums.setdefault(discipline.discipline, [0.0, 0])
+                for mark in discipline.marks:
+                    total[0] += mark.mark
+                    total[1] += 1
+        return marks
+
+    def table() -> MarksTable:
+        result = MarksTable()
+        for response in responses:
+            result.extend(MarksTable.from_summary_marks(response))
+        result.mean()
+        return result
+
+    results = []
+    for label, operation in (('SummaryMarks', objects), ('MarksTable', table)):
+        result = None
+        for _ in range(rounds):
+            attempt = measure(f'marks {label} x{len(responses)}', [operation])
+            if result is None or attempt.elapsed < result.elapsed:
+                result = attempt
+        result.peak_memory = peak_memory(operation)  # type: ignore
+        results.append(result)  # type: ignore
+    return results
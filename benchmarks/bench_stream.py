@@ -0,0 +1,47 @@
+from collections.abc import Iterator
+from typing import Any
+
+from BARS import BClient, BTransport, ResiliencePolicy
+
+from .common import ARGUMENTS, Result, measure, peak_memory
+from .fake_server import FakeBARS
+
+# Метод, возвращающий ответ целиком -> потоковый метод.
+STREAMS: dict[str, str] = {
+    'get_month_schedule': 'iter_month_schedule',
+    'get_school_info': 'iter_school_employees',
+}
+
+
+def bench_stream(*, iterations: int, bandwidth: int = 500_000, latency: float = 0.0) -> list[Result]:
+    """Бенчмарк потоковых методов ``BClient`` против обычных на сервере с ограниченной скоростью ``bandwidth``.
+
+    Для каждого метода замеряется время до получения результата, для потокового - также время до первого объекта.
+    Память - пиковое выделение за один вызов, при котором объекты потокового метода не сохраняются.
+    """
+
+    results = []
+    policy = ResiliencePolicy(retries=0)
+    with FakeBARS(bandwidth=bandwidth, latency=latency) as server, BTransport() as transport:
+        client = BClient('sessionid', base_url=server.url, transport=transport, policy=policy)
+        for name, stream in STREAMS.items():
+            arguments = ARGUMENTS.get(name, ())
+
+            def full(name: str = name, arguments: tuple = arguments) -> None:
+                getattr(client, name)(*arguments)
+
+            def first(stream: str = stream, arguments: tuple = arguments) -> None:
+                items: Iterator[Any] = getattr(client, stream)(*arguments)
+                next(items)
+                items.close()  # type: ignore
+
+            def drain(stream: str = stream, arguments: tuple = arguments) -> None:
+                for _ in getattr(client, stream)(*arguments):
+                    pass
+
+            for label, operation in ((name, full), (f'{stream} (первый)', first), (stream, drain)):
+                result = measure(label, [operation] * iterations)
+                result.peak_memory = peak_memory(operation)
+                results.append(result)
+    return results
+
@@ -0,0 +1,195 @@
+import sys
+import math
+import time
+import json
+import asyncio
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from collections.abc import Callable, Awaitable, Iterable
+from typing import Any, Optional, TextIO
+
+# Аргументы методов клиентов, совпадающие с записанными ответами.
+DATE: str = '2024-09-02'
+PUPILID: int = 123456
+ARGUMENTS: dict[str, tuple] = {
+    'get_diary': (DATE,),
+    'get_week_schedule': (DATE,),
+    'get_month_schedule': (DATE,),
+    'get_schedule_report_link': (DATE,),
+    'get_summary_marks': (DATE,),
+    'get_attendace_data': (PUPILID, DATE, '2024-10-27'),
+    'get_progress_data': (PUPILID, DATE, '2024-10-27'),
+    'get_homework': (DATE,),
+}
+
+
+@dataclass(slots=True)
+class Result:
+    """Класс, представляющий результат одного бенчмарка.
+
+    Attributes:
+        name (`str`): Название бенчмарка.
+        latencies (list[`float`]): Время каждой операции в секундах.
+        elapsed (`float`): Общее время в секундах.
+        errors (`int`): Кол-во операций, завершившихся ошибкой.
+        peak_memory (`int`, optional): Пиковое выделение памяти в байтах за отдельный прогон.
+    """
+
+    name: str
+    latencies: list[float] = field(repr=False)
+    elapsed: float
+    errors: int = 0
+    peak_memory: Optional[int] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def rps(self) -> float:
+        """Операций в секунду."""
+
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 50)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.latencies, 99)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        del data['latencies']
+        data.update(count=self.count, rps=self.rps, p50=self.p50, p99=self.p99)
+        return data
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Процентиль методом ближайшего ранга."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Пиковое выделение памяти в байтах во время вызова ``func``."""
+
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def peak_memory_async(factory: Callable[[], Awaitable[Any]]) -> int:
+    """Пиковое выделение памяти в байтах во время выполнения ``factory()``."""
+
+    tracemalloc.start()
+    try:
+        await factory()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, operations: Iterable[Callable[[], Any]]) -> Result:
+    """Последовательно выполнить операции, замеряя время каждой. Ошибки считаются, но не прерывают замер."""
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for operation in operations:
+        begin = time.perf_counter()
+        try:
+            operation()
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - begin)
+    return Result(name, latencies, time.perf_counter() - started, errors)
+
+
+def measure_threaded(name: str, operations: Iterable[Callable[[], Any]], threads: int) -> Result:
+    """Выполнить операции в ``threads`` потоках, замеряя время каждой."""
+
+    if threads <= 1:
+        return measure(name, operations)
+
+    def timed(operation: Callable[[], Any]) -> tuple[float, bool]:
+        begin = time.perf_counter()
+        try:
+            operation()
+            return time.perf_counter() - begin, True
+        except Exception:
+            return time.perf_counter() - begin, False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        outcomes = list(executor.map(timed, operations))
+    elapsed = time.perf_counter() - started
+    return Result(name, [latency for latency, _ in outcomes], elapsed, sum(not ok for _, ok in outcomes))
+
+
+async def measure_async(name: str, operations: Iterable[Callable[[], Awaitable[Any]]], concurrency: int) -> Result:
+    """Выполнить операции, не более ``concurrency`` одновременно, замеряя время каждой."""
+
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(operation: Callable[[], Awaitable[Any]]) -> None:
+        nonlocal errors
+        async with semaphore:
+            begin = time.perf_counter()
+            try:
+                await operation()
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - begin)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(operation) for operation in operations))
+    return Result(name, latencies, time.perf_counter() - started, errors)
+
+
+def report(results: list[Result], file: TextIO = sys.stdout) -> None:
+    """Вывести результаты таблицей."""
+
+    header = f"{'Бенчмарк':<40} {'Опер.':>7} {'Ошибки':>7} {'Опер./с':>10} {'p50, мс':>9} {'p99, мс':>9} {'Память, КБ':>11}"
+    print(header, file=file)
+    print('-' * len(header), file=file)
+    for result in results:
+        memory = f'{result.peak_memory / 1024:.0f}' if result.peak_memory is not None else '-'
+        print(
+            f'{result.name:<40} {result.count:>7} {result.errors:>7} {result.rps:>10.1f} '
+            f'{result.p50 * 1000:>9.3f} {result.p99 * 1000:>9.3f} {memory:>11}',
+            file=file
+        )
+
+
+def dump(results: list[Result], path: str) -> None:
+    """Сохранить результаты в JSON для сравнения между запусками."""
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([result.as_dict() for result in results], f, ensure_ascii=False, indent=2)
+
+
+def compare(results: list[Result], path: str, file: TextIO = sys.stdout) -> None:
+    """Сравнить результаты с сохранёнными через ``dump`` (например, до изменения)."""
+
+    with open(path, encoding='utf-8') as f:
+        baseline = {item['name']: item for item in json.load(f)}
+
+    header = f"{'Бенчмарк':<40} {'Было, опер./с':>14} {'Стало, опер./с':>15} {'Ускорение':>10}"
+    print(header, file=file)
+    print('-' * len(header), file=file)
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None or not before['rps']:
+            continue
+        print(f"{result.name:<40} {before['rps']:>14.1f} {result.rps:>15.1f} {result.rps / before['rps']:>9.2f}x", file=file)
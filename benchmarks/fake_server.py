@@ -0,0 +1,217 @@
+import json
+import time
+import random
+import argparse
+import threading
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Optional, Self, Type
+from types import TracebackType
+
+import httpx
+
+from BARS import BTransport
+
+FIXTURES_PATH: Path = Path(__file__).parent / 'fixtures'
+
+EXPIRED_SESSIONID: str = 'expired'
+
+CHUNK_SIZE: int = 4096  # Размер части тела ответа при ограничении скорости
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # По умолчанию 5: при всплеске соединений клиенты ждут повторного SYN
+
+
+class FakeBARS:
+    """Класс, представляющий локальный сервер, имитирующий сайт БАРС.
+
+    Отвечает записанными ответами из ``fixtures`` на все адреса, которые использует ``BARS.ENDPOINTS``.
+    Ответ выбирается по последней части адреса, например ``GetDiary`` -> ``fixtures/GetDiary.json``.
+    Запросы с sessionid ``expired`` получают ошибку авторизации, неизвестные адреса - ответ 404.
+
+    Args:
+        host (`str`, optional): Адрес сервера.
+        port (`int`, optional): Порт сервера. По умолчанию выбирается свободный.
+        fixtures (`Path`, optional): Папка с записанными ответами.
+        latency (`float`, optional): Задержка ответа в секундах.
+        jitter (`float`, optional): Случайная добавка к задержке в секундах (от 0 до ``jitter``).
+        error_rate (`float`, optional): Доля запросов, получающих ответ ``error_status``.
+        error_status (`int`, optional): Код ответа для внедрённых ошибок.
+        bandwidth (`int`, optional): Скорость отправки тела ответа в байтах в секунду. По умолчанию без ограничения.
+        seed (`int`, optional): Начальное значение генератора случайных чисел для воспроизводимости.
+
+    Attributes:
+        url (`str`): Адрес сервера для ``base_url`` клиентов.
+        requests (`int`): Кол-во обработанных запросов.
+        errors (`int`): Кол-во внедрённых ошибок.
+    """
+
+    def __init__(
+            self,
+            *,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            fixtures: Path = FIXTURES_PATH,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            error_status: int = 502,
+            bandwidth: Optional[int] = None,
+            seed: Optional[int] = None) -> None:
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.errors = 0
+
+        self._fixtures: dict[str, bytes] = {
+            path.stem: path.read_bytes() for path in sorted(Path(fixtures).glob('*.json'))
+        }
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Названия адресов, для которых есть записанные ответы."""
+
+        return list(self._fixtures)
+
+    def fixture(self, name: str) -> bytes:
+        """Получить записанный ответ по названию адреса."""
+
+        return self._fixtures[name]
+
+    def start(self) -> Self:
+        """Запустить сервер в фоновом потоке."""
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='FakeBARS', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Остановить сервер."""
+
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def redirect(self, transport: BTransport) -> None:
+        """Перенаправить все запросы транспорта на этот сервер, независимо от ``base_url`` клиентов.
+
+        Нужен для кода, который создаёт клиентов сам, например для обработчиков Телеграм бота.
+        """
+
+        host, port = self._server.server_address[:2]
+
+        def rewrite(request: httpx.Request) -> None:
+            request.url = request.url.copy_with(scheme='http', host=host, port=port)
+
+        async def arewrite(request: httpx.Request) -> None:
+            rewrite(request)
+
+        transport._client = httpx.Client(
+            limits=transport.limits, timeout=transport.timeout, event_hooks={'request': [rewrite]}
+        )
+        transport._async_client = httpx.AsyncClient(
+            limits=transport.limits, timeout=transport.timeout, event_hooks={'request': [arewrite]}
+        )
+
+    def _respond(self, path: str, sessionid: Optional[str]) -> tuple[int, bytes]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return self.error_status, b'<html>Bad Gateway</html>'
+        if sessionid == EXPIRED_SESSIONID:
+            return 200, json.dumps({'faultcode': 'Server.UserNotAuthenticated', 'faultstring': ''}).encode()
+
+        body = self._fixtures.get(path.rstrip('/').rsplit('/', 1)[-1])
+        if body is None:
+            return 404, b'<html>Not Found</html>'
+        return 200, body
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, как у настоящего сайта
+            disable_nagle_algorithm = True
+
+            def _handle(self) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+
+                morsel = SimpleCookie(self.headers.get('Cookie', '')).get('sessionid')
+                status, body = server._respond(self.path.split('?', 1)[0], morsel.value if morsel else None)
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json' if status == 200 else 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if server.bandwidth is None:
+                    self.wfile.write(body)
+                    return
+                for i in range(0, len(body), CHUNK_SIZE):
+                    self.wfile.write(body[i:i + CHUNK_SIZE])
+                    self.wfile.flush()
+                    time.sleep(CHUNK_SIZE / server.bandwidth)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        t: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Локальный сервер, имитирующий сайт БАРС.')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--bandwidth', type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeBARS(
+        port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, bandwidth=args.bandwidth
+    )
+    print(f'FakeBARS: {fake.url}')
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -4,15 +4,16 @@ setup(
     name='BARS',
     version='1.1',
     description='BARS Rest-API',
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     install_requires=[
         'httpx',
         'python-telegram-bot',
         'python-dotenv',
-        'coloredlogs',
-        'beautifulsoup4',
-        'lxml'
+        'coloredlogs'
     ],
+    extras_require={
+        'fast': ['orjson'],
+    },
     include_package_data=True,
     classifiers=[
         'Programming Language :: Python :: 3',
@@ -0,0 +1,68 @@
+import unittest
+import tempfile
+import time
+import httpx
+import BARS
+from pathlib import Path
+
+CLASS_INFO = {
+    'study_level': 9, 'letter': 'А', 'form_master': 'Иванов И.И.', 'form_master_photo': '',
+    'form_master_male': True, 'specialization': '', 'photo': '', 'pupils': []
+}
+
+
+class CacheTests(unittest.TestCase):
+
+    def check_backend(self, cache: BARS.BaseCache):
+        cache.set('a', 'api/SchoolService/getClassYearInfo', None, '1')
+        cache.set('b', 'api/SchoolService/getClassYearInfo', None, '2')
+        cache.set('a', 'api/ScheduleService/GetDiary', {'date': '2024-09-02'}, '3')  # Не кэшируется
+
+        self.assertEqual(cache.get('a', 'api/SchoolService/getClassYearInfo'), '1')
+        self.assertIsNone(cache.get('a', 'api/ScheduleService/GetDiary', {'date': '2024-09-02'}))
+
+        cache.set('c', 'api/SchoolService/getClassYearInfo', None, '4')  # Вытесняет 'b'
+        self.assertIsNone(cache.get('b', 'api/SchoolService/getClassYearInfo'))
+
+        self.assertEqual(cache.invalidate(sessionid='a'), 1)
+        self.assertIsNone(cache.get('a', 'api/SchoolService/getClassYearInfo'))
+
+        cache.ttl['api/SchoolService/getClassYearInfo'] = 0.05
+        cache.set('d', 'api/SchoolService/getClassYearInfo', None, '5')
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('d', 'api/SchoolService/getClassYearInfo'))
+
+    def test_memory_cache(self):
+        self.check_backend(BARS.MemoryCache(maxsize=2))
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = BARS.DiskCache(Path(directory) / 'cache.sqlite', maxsize=2)
+            self.check_backend(cache)
+            cache.close()
+
+    def test_client_uses_cache(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json=CLASS_INFO)
+
+        transport = BARS.BTransport()
+        transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+        cache = BARS.MemoryCache()
+
+        client = BARS.BClient('sessionid', transport=transport, cache=cache)
+        first = client.get_class_info()
+        second = client.get_class_info()
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+        cache.invalidate(endpoint='api/SchoolService/getClassYearInfo')
+        client.get_class_info()
+        self.assertEqual(len(calls), 2)
+        transport.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
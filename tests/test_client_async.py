@@ -0,0 +1,213 @@
+import unittest
+import asyncio
+import time
+import httpx
+import BARS
+
+
+calls: list[str] = []
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    calls.append(request.url.path)
+    await asyncio.sleep(0.2)
+    if request.headers.get('cookie') == 'sessionid=expired':
+        return httpx.Response(200, json={'faultcode': 'Server.UserNotAuthenticated', 'faultstring': ''})
+    match request.url.path.rsplit('/', 1)[-1]:
+        case 'GetDiary' | 'GetWeekSchedule':
+            return httpx.Response(200, json={'days': []})
+        case 'GetHomeworkFromRange':
+            return httpx.Response(200, json=[])
+        case _:
+            return httpx.Response(200, json={'faultcode': 'Server.UserNotAuthenticated', 'faultstring': ''})
+
+
+class GatherTests(unittest.TestCase):
+
+    def run_with_client(self, coro_factory):
+        async def main():
+            transport = BARS.BTransport()
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            client = BARS.BClientAsync('sessionid', transport=transport)
+            try:
+                return await coro_factory(client)
+            finally:
+                await transport.aclose()
+
+        return asyncio.run(main())
+
+    def test_digest_is_concurrent(self):
+        started = time.perf_counter()
+        digest = self.run_with_client(lambda client: client.get_digest('2024-09-02'))
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.6)  # Примерно один запрос, а не четыре
+        self.assertEqual(digest.diary, [])
+        self.assertEqual(digest.homework, [])
+        self.assertEqual(digest.week_schedule, [])
+        self.assertIsNone(digest.summary_marks)
+        self.assertIsInstance(digest.errors['summary_marks'], BARS.exceptions.Unauthorized)
+
+    def test_digest_cancelled_request_is_raised(self):
+        async def cancelled(*args):
+            raise asyncio.CancelledError
+
+        async def run(client):
+            client.get_homework = cancelled
+            return await client.get_digest('2024-09-02')
+
+        with self.assertRaises(asyncio.CancelledError):
+            self.run_with_client(run)
+
+    def test_gather_limit(self):
+        started = time.perf_counter()
+        results = self.run_with_client(
+            lambda client: client.gather(*(client.get_diary(f'2024-09-0{i}') for i in range(1, 5)), limit=2)
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results, [[], [], [], []])
+        self.assertGreaterEqual(elapsed, 0.4)  # Две волны по два запроса
+
+    def test_gather_raises(self):
+        with self.assertRaises(BARS.exceptions.Unauthorized):
+            self.run_with_client(lambda client: client.gather(client.get_total_marks(), return_exceptions=False))
+
+
+class SingleFlightTests(unittest.TestCase):
+
+    def run_with_client(self, coro_factory, coalesce=True):
+        async def main():
+            transport = BARS.BTransport()
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await coro_factory(lambda sessionid: BARS.BClientAsync(sessionid, transport=transport, coalesce=coalesce))
+            finally:
+                await transport.aclose()
+
+        calls.clear()
+        return asyncio.run(main())
+
+    def test_identical_requests_are_coalesced(self):
+        async def double_tap(make_client):
+            first, second = make_client('sessionid'), make_client('sessionid')
+            return await asyncio.gather(first.get_diary('2024-09-02'), second.get_diary('2024-09-02'))
+
+        first, second = self.run_with_client(double_tap)
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_different_requests_are_not_coalesced(self):
+        async def run(make_client):
+            return await asyncio.gather(
+                make_client('a').get_diary('2024-09-02'),
+                make_client('b').get_diary('2024-09-02'),
+                make_client('a').get_diary('2024-09-09')
+            )
+
+        self.run_with_client(run)
+        self.assertEqual(len(calls), 3)
+
+    def test_disabled(self):
+        async def double_tap(make_client):
+            client = make_client('sessionid')
+            return await asyncio.gather(client.get_diary('2024-09-02'), client.get_diary('2024-09-02'))
+
+        self.run_with_client(double_tap, coalesce=False)
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_are_shared(self):
+        async def run(make_client):
+            client = make_client('sessionid')
+            return await asyncio.gather(client.get_total_marks(), client.get_total_marks(), return_exceptions=True)
+
+        results = self.run_with_client(run)
+        self.assertTrue(all(isinstance(result, BARS.exceptions.Unauthorized) for result in results))
+        self.assertEqual(len(calls), 1)
+
+
+class BatchTests(unittest.TestCase):
+
+    def run_batch(self, coro_factory):
+        async def main():
+            transport = BARS.BTransport()
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await coro_factory(transport)
+            finally:
+                await transport.aclose()
+
+        return asyncio.run(main())
+
+    def test_run(self):
+        sessionids = [str(i) for i in range(20)] + ['expired']
+
+        started = time.perf_counter()
+        results = self.run_batch(
+            lambda transport: BARS.BBatchClient(sessionids, transport=transport, concurrency=10).run('get_diary', '2024-09-02')
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([item.sessionid for item in results], sessionids)
+        self.assertTrue(all(item.result == [] for item in results[:-1]))
+        self.assertIsInstance(results[-1].error, BARS.exceptions.Unauthorized)
+        self.assertLess(elapsed, 1.0)  # Три волны по 0.2 секунды
+
+    def test_stream_rate_limit(self):
+        async def collect(transport):
+            transport.rate_limiter = BARS.RateLimiter(rate=10, burst=1)
+            batch = BARS.BBatchClient(['a', 'b', 'c', 'd'], transport=transport)
+            return [item async for item in batch.stream('get_diary', '2024-09-02')]
+
+        started = time.perf_counter()
+        results = self.run_batch(collect)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 4)
+        self.assertGreaterEqual(elapsed, 0.5)  # 4 запроса при 10 запросах в секунду + задержка ответа
+
+    def test_sessions_do_not_leak(self):
+        cookies = []
+
+        async def set_cookie(request: httpx.Request) -> httpx.Response:
+            cookies.append(request.headers.get('cookie'))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={'days': []}, headers={'set-cookie': 'sessionid=server; Path=/'})
+
+        async def main():
+            transport = BARS.BTransport()
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(set_cookie))
+            try:
+                return await BARS.BBatchClient(sessionids, transport=transport, concurrency=5).run('get_diary', '2024-09-02')
+            finally:
+                await transport.aclose()
+
+        sessionids = [str(i) for i in range(20)]
+        results = asyncio.run(main())
+        self.assertTrue(all(item.error is None for item in results))
+        self.assertEqual(sorted(cookies), sorted(f'sessionid={sessionid}' for sessionid in sessionids))
+
+    def test_client_error_is_returned(self):
+        class FailingBatch(BARS.BBatchClient):
+            def _get_client(self, sessionid):
+                if sessionid == 'bad':
+                    raise ValueError(sessionid)
+                return super()._get_client(sessionid)
+
+        async def collect(transport):
+            return await FailingBatch(['a', 'bad'], transport=transport).run('get_diary', '2024-09-02')
+
+        results = self.run_batch(collect)
+        self.assertEqual(results[0].result, [])
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_unknown_method(self):
+        async def collect(transport):
+            return [item async for item in BARS.BBatchClient(['a'], transport=transport).stream('__init__')]
+
+        with self.assertRaises(ValueError):
+            self.run_batch(collect)
+
+
+if __name__ == '__main__':
+    unittest.main()
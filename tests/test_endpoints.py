@@ -0,0 +1,89 @@
+import unittest
+import asyncio
+import datetime
+import httpx
+import BARS
+from BARS.exceptions import Unauthorized
+
+EVENTS = [{'date': '2024-01-01', 'date_str': '01.01.2024', 'theme': 'Новый год'}]
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.headers.get('cookie') == 'sessionid=expired':
+        return httpx.Response(200, json={'faultcode': 'Server.UserNotAuthenticated', 'faultstring': ''})
+    match request.url.path.rsplit('/', 1)[-1]:
+        case 'getEvents':
+            return httpx.Response(200, json=EVENTS)
+        case 'getBirthdays':
+            return httpx.Response(200, json={'unexpected': True})
+        case 'ScheduleReport':
+            return httpx.Response(200, text='"/media/report.pdf"')
+        case _:
+            return httpx.Response(200, json={'faultcode': 'Server.Unknown', 'faultstring': ''})
+
+
+def sync_call(sessionid: str, name: str, *args):
+    transport = BARS.BTransport()
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+    client = BARS.BClient(sessionid, transport=transport, policy=BARS.ResiliencePolicy(retries=0))
+    with transport:
+        return getattr(client, name)(*args)
+
+
+def async_call(sessionid: str, name: str, *args):
+    async def main():
+        transport = BARS.BTransport()
+        transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = BARS.BClientAsync(sessionid, transport=transport, policy=BARS.ResiliencePolicy(retries=0))
+        async with transport:
+            return await getattr(client, name)(*args)
+
+    return asyncio.run(main())
+
+
+class EndpointTests(unittest.TestCase):
+
+    def test_every_method_is_registered(self):
+        for name in BARS.ENDPOINTS:
+            self.assertTrue(callable(getattr(BARS.BClient, name)))
+            self.assertTrue(callable(getattr(BARS.BClientAsync, name)))
+
+    def test_build(self):
+        params, data = BARS.ENDPOINTS['get_diary'].build({'date': '2024-01-01'})
+        self.assertEqual(params, {'date': '2024-01-01', 'is_diary': True})
+        self.assertIsNone(data)
+
+        params, data = BARS.ENDPOINTS['get_progress_data'].build(
+            {'pupilid': 1, 'date_begin': '2024-09-02', 'date_end': '2024-10-27', 'subjectid': None}
+        )
+        self.assertIsNone(params)
+        self.assertEqual(data['web_edu.plugins.corrective_school.corrective_card.actions.StudentPack_id'], 1)
+
+    def test_build_dates(self):
+        endpoint = BARS.ENDPOINTS['get_diary']
+        for value in ('2024-09-02', '2024-09-02T10:30:00', datetime.date(2024, 9, 2), datetime.datetime(2024, 9, 2, 10, 30)):
+            with self.subTest(value):
+                self.assertEqual(endpoint.build({'date': value})[0]['date'], '2024-09-02')
+        with self.assertRaises(ValueError):
+            endpoint.build({'date': '02.09.2024'})
+        with self.assertRaises(TypeError):
+            endpoint.build({'date': 20240902})
+
+    def test_clients_agree(self):
+        for call in (sync_call, async_call):
+            with self.subTest(call=call.__name__):
+                events = call('sessionid', 'get_events')
+                self.assertEqual(events[0].theme, 'Новый год')
+                self.assertEqual(call('sessionid', 'get_birthdays'), [])
+                self.assertEqual(
+                    call('sessionid', 'get_schedule_report_link', '2024-01-01'),
+                    BARS.BClient('sessionid').base_url.rstrip('/') + '/media/report.pdf'
+                )
+                with self.assertRaises(Unauthorized):
+                    call('expired', 'get_events')
+                with self.assertRaises(BARS.exceptions.BClientException):
+                    call('sessionid', 'get_total_marks')
+
+
+if __name__ == '__main__':
+    unittest.main()
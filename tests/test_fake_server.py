@@ -0,0 +1,75 @@
+import unittest
+import asyncio
+import BARS
+from BARS.exceptions import Unauthorized, InternalError
+
+from benchmarks.common import ARGUMENTS, percentile
+from benchmarks.fake_server import FakeBARS
+
+
+class FakeServerTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeBARS().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def make_client(self, sessionid='sessionid', **kwargs) -> BARS.BClient:
+        return BARS.BClient(sessionid, base_url=self.server.url, policy=BARS.ResiliencePolicy(retries=0), **kwargs)
+
+    def test_every_endpoint_has_fixture(self):
+        for name, endpoint in BARS.ENDPOINTS.items():
+            with self.subTest(name):
+                self.assertIn(endpoint.path.rsplit('/', 1)[-1], self.server.endpoints)
+
+    def test_every_endpoint_parses(self):
+        with self.make_client() as client:
+            for name, endpoint in BARS.ENDPOINTS.items():
+                with self.subTest(name):
+                    result = getattr(client, name)(*ARGUMENTS.get(name, ()))
+                    if endpoint.shape in ('list', 'days'):
+                        self.assertTrue(result)
+                        self.assertIsInstance(result[0], endpoint.model)
+                    elif endpoint.shape == 'link':
+                        self.assertTrue(result.startswith(self.server.url.rstrip('/') + '/media/'))
+                    else:
+                        self.assertIsInstance(result, endpoint.model)
+
+    def test_async_client(self):
+        async def main():
+            async with BARS.BClientAsync('sessionid', base_url=self.server.url) as client:
+                return await client.get_digest('2024-09-02')
+
+        digest = asyncio.run(main())
+        self.assertFalse(digest.errors)
+        self.assertEqual(len(digest.week_schedule), 7)
+
+    def test_lazy_client(self):
+        with self.make_client(lazy=True) as client:
+            diary = client.get_diary('2024-09-02')
+        self.assertIsInstance(diary, BARS.LazyList)
+        self.assertIsInstance(diary[0].lessons[0], BARS.DiaryLesson)
+
+    def test_expired_sessionid(self):
+        with self.assertRaises(Unauthorized):
+            self.make_client('expired').get_events()
+
+    def test_error_injection(self):
+        with FakeBARS(error_rate=1.0) as server:
+            client = BARS.BClient('sessionid', base_url=server.url, policy=BARS.ResiliencePolicy(retries=0))
+            with self.assertRaises(InternalError):
+                client.get_events()
+            self.assertEqual(server.errors, 1)
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import subprocess
+import BARS
+
+from benchmarks.bench_import import ROOT, import_time
+
+
+def loaded_modules(code: str) -> set[str]:
+    """Модули, загруженные после выполнения ``code`` в новом процессе."""
+
+    output = subprocess.run(
+        [sys.executable, '-c', f'{code}\nimport sys\nprint(*sys.modules)'], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+class ImportTests(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        modules = loaded_modules('import BARS')
+        self.assertNotIn('httpx', modules)
+        self.assertNotIn('BARS._client', modules)
+        self.assertNotIn('BARS._base', modules)
+
+    def test_models_do_not_load_clients(self):
+        modules = loaded_modules('from BARS import DiaryDay, HomeworkDay, ScheduleDay')
+        self.assertIn('BARS._diary', modules)
+        self.assertNotIn('httpx', modules)
+        self.assertNotIn('asyncio', modules)
+
+    def test_every_name_resolves(self):
+        for name in BARS.__all__:
+            with self.subTest(name):
+                self.assertIsNotNone(getattr(BARS, name))
+        self.assertLessEqual(set(BARS.__all__), set(dir(BARS)))
+        with self.assertRaises(AttributeError):
+            BARS.Missing  # type: ignore
+        self.assertIn('BARS.exceptions', loaded_modules('import BARS; BARS.exceptions.Unauthorized'))
+
+    def test_import_time(self):
+        lazy = min(import_time('import BARS') for _ in range(3))
+        full = min(import_time('import BARS; BARS.BClient, BARS.BClientAsync') for _ in range(3))
+        self.assertLess(lazy, full / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import json
+import httpx
+import BARS
+from BARS.exceptions import InternalError
+
+from benchmarks.bench_models import load_fixture
+
+
+def available_decoders() -> list[BARS.JSONDecoder]:
+    decoders = []
+    for decoder in BARS.DECODERS.values():
+        try:
+            decoders.append(decoder())
+        except ImportError:
+            continue
+    return decoders
+
+
+class DecoderTests(unittest.TestCase):
+
+    def test_default_decoder_is_available(self):
+        self.assertIn(BARS.get_decoder().name, BARS.DECODERS)
+        self.assertIs(BARS.get_decoder(), BARS.get_decoder())
+
+    def test_decoders_agree(self):
+        raw = load_fixture('get_month_schedule')
+        for decoder in available_decoders():
+            with self.subTest(decoder.name):
+                self.assertEqual(decoder.loads(raw), json.loads(raw))
+                self.assertEqual(decoder.loads(raw.decode()), json.loads(raw))
+
+    def test_invalid_json_is_internal_error(self):
+        for decoder in available_decoders():
+            with self.subTest(decoder.name):
+                transport = BARS.BTransport()
+                transport._client = httpx.Client(
+                    transport=httpx.MockTransport(lambda request: httpx.Response(200, text='<html></html>'))
+                )
+                client = BARS.BClient(
+                    'sessionid', transport=transport, decoder=decoder, policy=BARS.ResiliencePolicy(retries=0)
+                )
+                with self.assertRaises(InternalError):
+                    client.get_events()
+
+
+if __name__ == '__main__':
+    unittest.main()
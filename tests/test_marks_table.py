@@ -0,0 +1,62 @@
+import unittest
+import datetime
+import json
+import statistics
+import BARS
+
+from benchmarks.bench_models import load_fixture
+
+
+class MarksTableTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.raw = json.loads(load_fixture('get_summary_marks'))
+        cls.marks = BARS.SummaryMarks.de_json(cls.raw)
+
+    def test_from_objects_and_raw_agree(self):
+        table = BARS.MarksTable.from_summary_marks(self.marks)
+        raw = BARS.MarksTable.from_summary_marks(self.raw)
+        self.assertEqual(list(table), list(raw))
+        self.assertEqual(len(table), sum(len(discipline.marks) for discipline in self.marks.disciplines))
+
+    def test_mean_and_counts(self):
+        table = BARS.MarksTable.from_summary_marks(self.raw)
+        means = table.mean()
+        counts = table.counts_by_discipline()
+        for discipline in self.marks.disciplines:
+            if not discipline.marks:
+                continue
+            values = [mark.mark for mark in discipline.marks]
+            with self.subTest(discipline.discipline):
+                self.assertAlmostEqual(means[discipline.discipline], statistics.mean(values), places=5)
+                self.assertEqual(counts[discipline.discipline][5], values.count(5))
+                self.assertEqual(table.counts(discipline.discipline), counts[discipline.discipline])
+        self.assertEqual(sum(table.counts().values()), len(table))
+
+    def test_weighted_mean_and_rolling(self):
+        table = BARS.MarksTable.from_summary_marks({'discipline_marks': [{'discipline': 'Алгебра', 'marks': [
+            {'date': '2024-09-03', 'description': 'Контрольная работа', 'mark': '2'},
+            {'date': '2024-09-02', 'description': '', 'mark': '5'},
+            {'date': '2024-09-04', 'description': '', 'mark': 'н'},
+            {'date': '2024-09-05', 'description': '', 'mark': '5'},
+        ]}]})
+        self.assertEqual(len(table), 3)
+        self.assertAlmostEqual(table.weighted_mean({'Контрольная работа': 2})['Алгебра'], 14 / 4)
+        self.assertEqual(
+            table.rolling_mean(2, 'Алгебра'),
+            [(datetime.date(2024, 9, 2), 5.0), (datetime.date(2024, 9, 3), 3.5), (datetime.date(2024, 9, 5), 3.5)]
+        )
+        self.assertEqual(table.rolling_mean(2, 'Физика'), [])
+
+    def test_extend(self):
+        table = BARS.MarksTable.from_summary_marks(self.raw)
+        other = BARS.MarksTable.from_progress_data(json.loads(load_fixture('get_progress_data')), series='Ученик')
+        combined = BARS.MarksTable.from_summary_marks(self.raw)
+        combined.extend(other)
+        self.assertEqual(list(combined), list(table) + list(other))
+        self.assertEqual(set(other.descriptions), {'Ученик'})
+
+
+if __name__ == '__main__':
+    unittest.main()
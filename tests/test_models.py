@@ -0,0 +1,195 @@
+import unittest
+import copy
+import threading
+import datetime
+import json
+import BARS
+from BARS._base import _get_cleaner
+
+from benchmarks.bench_models import load_fixture
+
+SUMMARY_MARKS = {
+    'dates': ['2024-09-02'],
+    'discipline_marks': [
+        {'average_mark': '4.50', 'discipline': 'Алгебра', 'marks': [{'date': '2024-09-02', 'description': '', 'mark': '5'}]}
+    ],
+    'subperiod': {'code': '1_1', 'name': '1 четверть'}
+}
+
+
+class DeJsonTests(unittest.TestCase):
+
+    def test_renames_coercions_and_nested(self):
+        marks = BARS.SummaryMarks.de_json(SUMMARY_MARKS)
+        self.assertIsInstance(marks.subperiod, BARS.Subperiod)
+        self.assertIsInstance(marks.disciplines[0], BARS.SummaryMarksDiscipline)
+        self.assertEqual(marks.disciplines[0].average_mark, 4.5)
+        self.assertEqual(marks.disciplines[0].marks[0].mark, 5)
+
+    def test_input_is_not_mutated(self):
+        data = copy.deepcopy(SUMMARY_MARKS)
+        BARS.SummaryMarks.de_json(data)
+        self.assertEqual(data, SUMMARY_MARKS)
+
+    def test_camel_case_renames(self):
+        item = BARS.ProgressData.de_json({
+            'categories': [], 'dates': [], 'subject': 'Алгебра',
+            'series': [{'color': '#000', 'data': [5], 'name': 'Ученик', 'pointWidth': '10'}]
+        })
+        self.assertEqual(item.series[0].point_width, '10')
+
+    def test_missing_lessons_default(self):
+        day = BARS.ScheduleDay.de_json({'date': '2024-09-07', 'is_weekend': True})
+        self.assertEqual(day.lessons, [])
+
+    def test_unknown_attributes_are_dropped(self):
+        event = BARS.Event.de_json({'date': '2024-09-01', 'date_str': '01.09.2024', 'theme': '', 'extra': 1})
+        self.assertFalse(hasattr(event, 'extra'))
+
+
+class SchemaDriftTests(unittest.TestCase):
+
+    def setUp(self):
+        BARS.schema_drift.reset()
+
+    def test_reported_once_per_key_set(self):
+        with self.assertLogs('BARS._drift', level='WARNING') as logs:
+            for i in range(100):
+                BARS.Event.de_json({'date': '', 'date_str': '', 'theme': '', 'extra': i})
+            BARS.Event.de_json({'date': '', 'date_str': '', 'theme': '', 'extra': 0, 'other': 0})
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(BARS.schema_drift.counts[('Event', ('extra',))], 100)
+
+    def test_flush_reports_counters(self):
+        drift = BARS.SchemaDrift(interval=None)
+        with self.assertLogs('BARS._drift', level='WARNING') as logs:
+            for _ in range(5):
+                drift.report(BARS.Event, {'extra': 1})
+            drift.flush()
+            drift.flush()
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn('4', logs.records[1].getMessage())
+
+
+    def test_threads_do_not_lose_counts(self):
+        drift = BARS.SchemaDrift(interval=None)
+
+        def report():
+            for _ in range(5000):
+                drift.report(BARS.Event, {'extra': 1})
+
+        with self.assertLogs('BARS._drift', level='WARNING') as logs:
+            threads = [threading.Thread(target=report) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            drift.flush()
+        self.assertEqual(drift.counts[('Event', ('extra',))], 40000)
+        self.assertIn('39999', logs.records[-1].getMessage())
+
+class LazyViewTests(unittest.TestCase):
+
+    def parse(self, name, lazy):
+        return BARS.ENDPOINTS[name].parse(json.loads(load_fixture(name)), '', lazy)
+
+    def test_nothing_is_materialized_upfront(self):
+        month = self.parse('get_month_schedule', lazy=True)
+        self.assertIsInstance(month, BARS.LazyList)
+        self.assertEqual(month.materialized, 0)
+
+        week = month[0]
+        self.assertIsInstance(week, BARS.ScheduleMonth)
+        self.assertEqual(month.materialized, 1)
+        self.assertEqual(week.days.materialized, 0)
+        self.assertIsInstance(week.days[0].lessons[0], BARS.ScheduleLesson)
+
+    def test_equal_to_eager(self):
+        for name in ('get_month_schedule', 'get_diary', 'get_summary_marks', 'get_school_info', 'get_homework'):
+            with self.subTest(name):
+                self.assertEqual(self.parse(name, lazy=True), self.parse(name, lazy=False))
+
+    def test_slice_and_mutation(self):
+        days = self.parse('get_diary', lazy=True)
+        week = days[:-2]
+        self.assertIsInstance(week, BARS.LazyList)
+        self.assertEqual(len(week), len(days) - 2)
+        self.assertEqual(days.materialized, 0)
+
+        week[0].remove_html_tags()
+        self.assertNotIn('<p>', week[0].lessons[0].theme)
+        del week[0]
+        self.assertEqual(len(week), len(days) - 3)
+
+
+class HtmlTests(unittest.TestCase):
+
+    def test_links_paragraphs_and_entities(self):
+        cases = {
+            '<p>Упр. 124, 125</p>': 'Упр. 124, 125',
+            '<p>№ 312 &mdash; 318</p>': '№ 312 — 318',
+            '<p>См. <a href="https://example.org/rules">презентацию</a></p>': 'См. [презентацию](https://example.org/rules)',
+            '<a href="/a?x=1&amp;y=2"><b>A</b></a> и <a href="/b">B</a>': '[A](/a?x=1&y=2)  и [B](/b)',
+            '<p>Первое</p><p>Второе</p>': 'Первое\nВторое',
+            '&lt;b&gt; &#171;цитата&#187;': '<b> «цитата»',
+            '<pre>код</pre>': 'код',
+            'Петров С.В.': 'Петров С.В.',
+        }
+        for html, expected in cases.items():
+            with self.subTest(html):
+                self.assertEqual(BARS.ClientObject().remove_html_tags(html), expected)
+
+    def test_replace_p_with_is_passed_to_fields(self):
+        lesson = BARS.HomeworkLesson.de_json(json.loads(load_fixture('get_homework'))[0]['homeworks'][0])
+        lesson.remove_html_tags(replace_p_with=' ')
+        self.assertNotIn('\n', lesson.homework)
+        self.assertNotIn('<', lesson.homework)
+
+
+    def test_only_text_fields_are_visited(self):
+        cleaner = _get_cleaner(BARS.DiaryLesson)
+        names = {name for name, _ in cleaner.fields}
+        self.assertIn('theme', names)
+        self.assertIn('materials', names)
+        self.assertNotIn('id', names)
+        self.assertNotIn('is_control_work', names)
+        self.assertEqual(dict(_get_cleaner(BARS.DiaryDay).fields), {'date': 'str', 'lessons': 'objects'})
+
+    def test_without_html_tags_does_not_mutate(self):
+        days = BARS.ENDPOINTS['get_homework'].parse(json.loads(load_fixture('get_homework')), '')
+        original = copy.deepcopy(days)
+        cleaned = BARS.HomeworkDay.batch_without_html_tags(days)
+
+        self.assertEqual(days, original)
+        for day in days:
+            day.remove_html_tags()
+        self.assertEqual(cleaned, days)
+        self.assertIsNot(cleaned[0].homeworks[0], days[0].homeworks[0])
+
+    def test_lazy_view(self):
+        raw = json.loads(load_fixture('get_diary'))
+        lazy = BARS.ENDPOINTS['get_diary'].parse(raw, '', lazy=True)
+        eager = BARS.ENDPOINTS['get_diary'].parse(raw, '')
+        self.assertEqual(BARS.DiaryDay.batch_without_html_tags(lazy[:-2]), BARS.DiaryDay.batch_without_html_tags(eager[:-2]))
+
+class DateTests(unittest.TestCase):
+
+    def test_parsed_dates_and_times(self):
+        day = BARS.ENDPOINTS['get_diary'].parse(json.loads(load_fixture('get_diary')), '')[0]
+        lesson = day.lessons[0]
+        self.assertEqual(day.parsed_date, datetime.date.fromisoformat(day.date))
+        self.assertEqual(lesson.parsed_time_begin, datetime.time.fromisoformat(lesson.time_begin))
+        self.assertIs(lesson.parsed_date, day.parsed_date)
+
+    def test_missing_time(self):
+        lesson = BARS.ScheduleLesson(id=1, date='2024-09-02', discipline='Алгебра', index=1, is_control_work=False)
+        self.assertIsNone(lesson.parsed_time_begin)
+        self.assertEqual(lesson.parsed_date, datetime.date(2024, 9, 2))
+
+    def test_summary_marks_dates(self):
+        marks = BARS.SummaryMarks.de_json(SUMMARY_MARKS)
+        self.assertEqual(marks.parsed_dates, [datetime.date(2024, 9, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import random
+import unittest
+from types import SimpleNamespace
+
+from benchmarks.bench_bot import import_bot
+
+import_bot()
+from src.processing import ChatOrderedUpdateProcessor, chat_key  # noqa: E402 pyright: ignore
+
+
+class ChatOrderedUpdateProcessorTests(unittest.TestCase):
+
+    def test_chat_key(self):
+        chat, user = SimpleNamespace(id=1), SimpleNamespace(id=2)
+        self.assertEqual(chat_key(SimpleNamespace(effective_chat=chat, effective_user=user)), 1)
+        self.assertEqual(chat_key(SimpleNamespace(effective_chat=None, effective_user=user)), 2)
+        self.assertIsNone(chat_key(object()))
+
+    def test_order_and_limit(self):
+        rng = random.Random(0)
+        handled: dict[int, list[int]] = {chat: [] for chat in range(5)}
+        running = peak = 0
+
+        async def handle(chat: int, index: int) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(rng.random() / 1000)
+            handled[chat].append(index)
+            running -= 1
+
+        async def main():
+            processor = ChatOrderedUpdateProcessor(3)
+            tasks = []
+            for index in range(100):
+                chat = rng.randrange(5)
+                update = SimpleNamespace(effective_chat=SimpleNamespace(id=chat))
+                tasks.append(asyncio.create_task(processor.process_update(update, handle(chat, index))))
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        for chat, indexes in handled.items():
+            self.assertEqual(indexes, sorted(indexes), chat)
+        self.assertEqual(sum(map(len, handled.values())), 100)
+        self.assertEqual(peak, 3)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            ChatOrderedUpdateProcessor(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import asyncio
+import time
+import httpx
+import BARS
+from BARS.exceptions import InternalError, CircuitOpenError
+
+CLASS_INFO = {
+    'study_level': 9, 'letter': 'А', 'form_master': 'Иванов И.И.', 'form_master_photo': '',
+    'form_master_male': True, 'specialization': '', 'photo': '', 'pupils': []
+}
+
+
+class FlakySite:
+    """Сайт, отвечающий ошибкой на первые ``failures`` запросов."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls <= self.failures:
+            return httpx.Response(502, text='<html>Bad Gateway</html>')
+        return httpx.Response(200, json=CLASS_INFO)
+
+
+def make_client(site: FlakySite, **kwargs) -> BARS.BClient:
+    transport = BARS.BTransport()
+    transport._client = httpx.Client(transport=httpx.MockTransport(site))
+    return BARS.BClient('sessionid', transport=transport, **kwargs)
+
+
+class ResilienceTests(unittest.TestCase):
+
+    def test_get_is_retried(self):
+        site = FlakySite(failures=2)
+        client = make_client(site, policy=BARS.ResiliencePolicy(retries=2, backoff=0))
+        self.assertEqual(client.get_class_info().letter, 'А')
+        self.assertEqual(site.calls, 3)
+
+    def test_retries_exhausted(self):
+        site = FlakySite(failures=10)
+        client = make_client(site, policy=BARS.ResiliencePolicy(retries=2, backoff=0))
+        with self.assertRaises(InternalError):
+            client.get_class_info()
+        self.assertEqual(site.calls, 3)
+
+    def test_post_is_not_retried(self):
+        site = FlakySite(failures=1)
+        client = make_client(site, policy=BARS.ResiliencePolicy(retries=2, backoff=0))
+        with self.assertRaises(InternalError):
+            client.get_attendace_data(1, '2000-01-01', '3000-01-01')
+        self.assertEqual(site.calls, 1)
+
+    def test_breaker_fails_fast(self):
+        site = FlakySite(failures=100)
+        breaker = BARS.CircuitBreaker(window=4, min_requests=4, reset_timeout=0.2)
+        client = make_client(site, policy=BARS.ResiliencePolicy(retries=0, breaker=breaker))
+
+        for _ in range(4):
+            with self.assertRaises(InternalError):
+                client.get_class_info()
+        self.assertEqual(breaker.state, 'open')
+
+        with self.assertRaises(CircuitOpenError):
+            client.get_class_info()
+        self.assertEqual(site.calls, 4)
+
+        site.failures = 0
+        time.sleep(0.25)
+        self.assertEqual(client.get_class_info().letter, 'А')  # Пробный запрос
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_cancelled_probe_does_not_stick(self):
+        breaker = BARS.CircuitBreaker(window=1, min_requests=1, reset_timeout=0.1)
+        breaker.record(False)
+        self.assertEqual(breaker.state, 'open')
+
+        async def hang(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(10)
+            return httpx.Response(200, json=CLASS_INFO)
+
+        async def main():
+            transport = BARS.BTransport()
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(hang))
+            client = BARS.BClientAsync(
+                'sessionid', transport=transport, policy=BARS.ResiliencePolicy(breaker=breaker), coalesce=False
+            )
+
+            await asyncio.sleep(0.15)
+            probe = asyncio.create_task(client.get_class_info())
+            await asyncio.sleep(0.05)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+            self.assertEqual(breaker.state, 'half-open')
+            with self.assertRaises(CircuitOpenError):
+                await client.get_class_info()
+
+            await asyncio.sleep(0.15)
+            self.assertTrue(breaker.allow())  # Новый пробный запрос
+            await transport.aclose()
+
+        asyncio.run(main())
+
+    def test_stale_cache_is_served(self):
+        site = FlakySite(failures=0)
+        cache = BARS.MemoryCache(ttl={'api/SchoolService/getClassYearInfo': 0.05})
+        client = make_client(site, cache=cache, policy=BARS.ResiliencePolicy(retries=0))
+        client.get_class_info()
+
+        time.sleep(0.1)
+        site.failures = 100
+        self.assertEqual(client.get_class_info().letter, 'А')
+        self.assertEqual(site.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import json
+import asyncio
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.bench_bot import import_bot, make_update
+
+import_bot()
+from src import general  # noqa: E402 pyright: ignore
+from src.storage import JsonStorage, SQLiteStorage, UserCache, migrate_json  # noqa: E402 pyright: ignore
+
+
+class StorageTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_backends(self):
+        for storage in (JsonStorage(self.path / 'db.json'), SQLiteStorage(self.path / 'db.sqlite3')):
+            with self.subTest(type(storage).__name__), storage:
+                self.assertIsNone(storage.get(1))
+                storage.set(1, {'sessionid': 'a', 'week': {'0': ['Математика']}})
+                storage.set_many([(2, {'sessionid': 'b'}), (1, {'sessionid': 'c'})])
+                self.assertEqual(storage.get(1), {'sessionid': 'c'})
+                self.assertIn(2, storage)
+                self.assertNotIn(3, storage)
+                self.assertEqual(sorted(storage.ids()), [1, 2])
+                self.assertEqual(len(storage), 2)
+
+    def test_sqlite_wal(self):
+        with SQLiteStorage(self.path / 'db.sqlite3') as storage:
+            storage.set(1, {'sessionid': 'a'})
+            connection = sqlite3.connect(self.path / 'db.sqlite3')
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            connection.close()
+
+    def test_migrate_json(self):
+        json_path = self.path / 'db.json'
+        json_path.write_text(json.dumps({'1': {'sessionid': 'a'}, '2': {'sessionid': 'b'}}))
+        with SQLiteStorage(self.path / 'db.sqlite3') as storage:
+            self.assertEqual(migrate_json(json_path, storage), 2)
+            self.assertEqual(storage.get(2), {'sessionid': 'b'})
+            self.assertFalse(json_path.exists())
+            self.assertTrue((self.path / 'db.json.bak').exists())
+            self.assertEqual(migrate_json(json_path, storage), 0)
+
+
+class CountingStorage(JsonStorage):
+    """Хранилище, которое считает обращения."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.reads = 0
+        self.batches: list[list[int]] = []
+
+    def get(self, user_id):
+        self.reads += 1
+        return super().get(user_id)
+
+    def set_many(self, users):
+        users = list(users)
+        self.batches.append([user_id for user_id, _ in users])
+        super().set_many(users)
+
+
+class UserCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = CountingStorage(Path(self.directory.name) / 'db.json')
+        self.storage.set_many([(1, {'n': 1}), (2, {'n': 2})])
+        self.storage.batches.clear()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_behind(self):
+        async def main():
+            cache = UserCache(self.storage, flush_interval=0.05)
+            user = await cache.get(1)
+            self.assertIs(await cache.get(1), user)
+            self.assertIsNone(await cache.get(3))
+            for i in range(10):
+                cache.set(1, {'n': i})
+                cache.set(3, {'n': i})
+            self.assertEqual(self.storage.batches, [])
+            self.assertEqual(self.storage.reads, 2)
+            await asyncio.sleep(0.2)
+            self.assertEqual(len(self.storage.batches), 1)
+            self.assertEqual(sorted(self.storage.batches[0]), [1, 3])
+            self.assertEqual(self.storage.get(3), {'n': 9})
+            await cache.close()
+
+        asyncio.run(main())
+
+    def test_flush_on_close(self):
+        async def main():
+            cache = UserCache(self.storage, flush_interval=60)
+            cache.set(2, {'n': 20})
+            await cache.close()
+
+        asyncio.run(main())
+        self.assertEqual(self.storage.get(2), {'n': 20})
+
+    def test_eviction_keeps_changes(self):
+        async def main():
+            cache = UserCache(self.storage, maxsize=1, flush_interval=60)
+            cache.set(1, {'n': 10})
+            self.assertEqual(await cache.get(2), {'n': 2})
+            self.assertEqual(await cache.get(1), {'n': 10})
+            await cache.flush()
+            self.assertEqual(len(cache), 1)
+            await cache.close()
+
+        asyncio.run(main())
+        self.assertEqual(self.storage.get(1), {'n': 10})
+
+
+class UserStateTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.saved = general.USERS
+        general.USERS = UserCache(SQLiteStorage(Path(self.directory.name) / 'db.sqlite3'))
+
+    def tearDown(self):
+        general.USERS = self.saved
+        self.directory.cleanup()
+
+    def test_no_lost_updates(self):
+        async def increment(key: str) -> None:
+            async with general.user_state(make_update(1)) as user:
+                value = user[key]
+                await asyncio.sleep(0)  # Ожидание сети в обработчике
+                user[key] = value + 1
+
+        async def main():
+            general.USERS.set(1, {'a': 0, 'b': 0})
+            await asyncio.gather(*(increment(key) for key in 'ab' * 50))
+            await general.USERS.flush()
+
+        asyncio.run(main())
+        self.assertEqual(general.USERS.storage.get(1), {'a': 50, 'b': 50})
+        general.USERS.storage.close()
+
+    def test_changes_discarded_on_error(self):
+        async def main():
+            general.USERS.set(1, {'sessionid': 'a', 'week': {'days': [1]}})
+            with self.assertRaises(RuntimeError):
+                async with general.user_state(make_update(1)) as user:
+                    user['sessionid'] = 'b'
+                    user['week']['days'].append(2)
+                    raise RuntimeError
+            self.assertEqual(await general.USERS.get(1), {'sessionid': 'a', 'week': {'days': [1]}})
+            await general.USERS.close()
+
+        asyncio.run(main())
+
+    def test_unknown_user(self):
+        async def main():
+            async with general.user_state(make_update(2)):
+                pass
+
+        with self.assertRaises(KeyError):
+            asyncio.run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
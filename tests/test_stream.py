@@ -0,0 +1,126 @@
+import unittest
+import asyncio
+import json
+import random
+import BARS
+from BARS import _stream
+from BARS._stream import StreamParser
+from BARS.exceptions import Unauthorized, InternalError
+
+from benchmarks.common import DATE
+from benchmarks.fake_server import FakeBARS
+
+
+def parse(body: bytes, path: tuple[str, ...], size: int) -> tuple[list, StreamParser]:
+    parser = StreamParser(path)
+    items = []
+    for i in range(0, len(body), size):
+        items.extend(parser.feed(body[i:i + size]))
+    items.extend(parser.close())
+    return items, parser
+
+
+class StreamParserTests(unittest.TestCase):
+
+    def test_chunk_boundaries(self):
+        body = FakeBARS().fixture('GetMonthSchedule')
+        expected = [day for week in json.loads(body) for day in week['days']]
+        for size in (1, 2, 3, 7, 64, 4096, len(body)):
+            with self.subTest(size):
+                self.assertEqual(parse(body, ('*', 'days', '*'), size)[0], expected)
+
+    def test_rest_of_object(self):
+        body = json.dumps({'name': 'Школа', 'employees': [{'id': 1}, {'id': 2}], 'count': 10}).encode()
+        items, parser = parse(body, ('employees', '*'), 5)
+        self.assertEqual(items, [{'id': 1}, {'id': 2}])
+        self.assertEqual(parser.rest, {'name': 'Школа', 'count': 10})
+
+    def test_numbers_split_across_chunks(self):
+        rng = random.Random(0)
+        values = [rng.randint(-10 ** 6, 10 ** 6) for _ in range(200)] + [1.5e-3, True, None, 'a\\"b']
+        body = json.dumps({'x': values}, separators=(',', ':')).encode()
+        for size in (1, 3, 11):
+            with self.subTest(size):
+                self.assertEqual(parse(body, ('x', '*'), size)[0], values)
+
+    def test_unexpected_shape(self):
+        body = b'{"faultcode": "Server.UserNotAuthenticated"}'
+        items, parser = parse(body, ('*', 'days', '*'), 4)
+        self.assertEqual(items, [])
+        self.assertEqual(parser.rest, {'faultcode': 'Server.UserNotAuthenticated'})
+
+    def test_large_value_is_decoded_once(self):
+        skipped = {'marks': [{'mark': '5', 'comment': str(i) + ' a\\"]}[{'} for i in range(2000)]}
+        body = json.dumps({'extra': skipped, 'days': [{'a': 1}, {'b': [2]}], 'count': 2}).encode()
+        decoder = _stream._decoder
+        calls = []
+
+        class CountingDecoder(json.JSONDecoder):
+            def raw_decode(self, s, idx=0):
+                calls.append(idx)
+                return decoder.raw_decode(s, idx)
+
+        _stream._decoder = CountingDecoder()
+        try:
+            items, parser = parse(body, ('days', '*'), 7)
+        finally:
+            _stream._decoder = decoder
+        self.assertEqual(items, [{'a': 1}, {'b': [2]}])
+        self.assertEqual(parser.rest, {'extra': skipped, 'count': 2})
+        self.assertLess(len(calls), 20)  # Ключи и значения, а не каждая часть ответа
+
+    def test_truncated(self):
+        for body in (b'[{"days": [{"a": 1}', b'<html></html>', b'[1, 2] 3'):
+            with self.subTest(body), self.assertRaises(ValueError):
+                parse(body, ('*',), 3)
+
+
+class StreamClientTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeBARS(bandwidth=2_000_000).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def make_client(self, sessionid='sessionid', **kwargs) -> BARS.BClient:
+        return BARS.BClient(sessionid, base_url=self.server.url, policy=BARS.ResiliencePolicy(retries=0), **kwargs)
+
+    def test_month_schedule(self):
+        with self.make_client() as client:
+            days = list(client.iter_month_schedule(DATE))
+            expected = [day for week in client.get_month_schedule(DATE) for day in week.days]
+        self.assertEqual(days, expected)
+
+    def test_school_employees(self):
+        with self.make_client(lazy=True) as client:
+            employees = list(client.iter_school_employees())
+            self.assertEqual(len(employees), len(client.get_school_info().employees))
+        self.assertIsInstance(employees[0], BARS.Employee)
+
+    def test_async(self):
+        async def main():
+            async with BARS.BClientAsync('sessionid', base_url=self.server.url) as client:
+                days = [day async for day in client.iter_month_schedule(DATE)]
+                employees = [employee async for employee in client.iter_school_employees()]
+                return days, employees, await client.get_school_info()
+
+        days, employees, info = asyncio.run(main())
+        self.assertIsInstance(days[0], BARS.ScheduleDay)
+        self.assertEqual(employees, list(info.employees))
+
+    def test_expired_sessionid(self):
+        with self.assertRaises(Unauthorized):
+            list(self.make_client('expired').iter_school_employees())
+
+    def test_server_error(self):
+        with FakeBARS(error_rate=1.0) as server:
+            client = BARS.BClient('sessionid', base_url=server.url, policy=BARS.ResiliencePolicy(retries=0))
+            with self.assertRaises(InternalError):
+                next(client.iter_month_schedule(DATE))
+
+
+if __name__ == '__main__':
+    unittest.main()
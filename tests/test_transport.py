@@ -0,0 +1,170 @@
+import unittest
+import asyncio
+import time
+import httpx
+import BARS
+
+
+ATTENDANCE = {'absent': 1, 'absent_bad': 0, 'absent_good': 1, 'ill': 0, 'present': 9, 'total': 10}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith('attendancedata'):
+        return httpx.Response(200, json=ATTENDANCE)
+    return httpx.Response(200, json={'days': []})
+
+
+async def slow_handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(0.3)  # Медленный сайт
+    return handler(request)
+
+
+class TransportTests(unittest.TestCase):
+
+    def test_default_transport_is_shared(self):
+        self.assertIs(BARS.get_default_transport(), BARS.get_default_transport())
+
+    def test_pool_is_reused_between_clients(self):
+        transport = BARS.BTransport(max_connections=10, max_keepalive_connections=5)
+        transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+        pool = transport.client
+
+        with BARS.BClient('first', transport=transport) as client:
+            self.assertEqual(client.get_diary('2024-09-02'), [])
+        with BARS.BClient('second', transport=transport) as client:
+            self.assertEqual(client.get_diary('2024-09-02'), [])
+
+        # Клиент не должен закрывать общий транспорт при выходе из with.
+        self.assertIs(transport.client, pool)
+        self.assertFalse(pool.is_closed)
+        transport.close()
+        self.assertTrue(pool.is_closed)
+
+    def test_async_client_without_context_manager(self):
+        transport = BARS.BTransport()
+
+        async def main():
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            client = BARS.BClientAsync('sessionid', transport=transport)
+            result = await client.get_diary('2024-09-02')
+            await transport.aclose()
+            return result
+
+        self.assertEqual(asyncio.run(main()), [])
+
+    def test_sessions_do_not_leak_between_clients(self):
+        cookies = []
+
+        def set_cookie(request: httpx.Request) -> httpx.Response:
+            cookies.append(request.headers.get('cookie'))
+            return httpx.Response(200, json={'days': []}, headers={'set-cookie': 'sessionid=server; Path=/'})
+
+        transport = BARS.BTransport()
+        transport._client = httpx.Client(transport=httpx.MockTransport(set_cookie))
+        for sessionid in ('first', 'second', 'first'):
+            BARS.BClient(sessionid, transport=transport).get_diary('2024-09-02')
+        self.assertEqual(cookies, ['sessionid=first', 'sessionid=second', 'sessionid=first'])
+        transport.close()
+
+    def test_pool_does_not_store_cookies(self):
+        transport = BARS.BTransport()
+        response = httpx.Response(
+            200, headers={'set-cookie': 'sessionid=server; Path=/'}, request=httpx.Request('GET', 'https://example.com/')
+        )
+        transport.client.cookies.extract_cookies(response)
+        self.assertEqual(len(transport.client.cookies), 0)
+        transport.close()
+
+    def test_chart_endpoints_use_pool(self):
+        transport = BARS.BTransport()
+        transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        client = BARS.BClient('sessionid', transport=transport)
+        attendance = client.get_attendace_data(1, '2000-01-01', '3000-01-01')
+        self.assertEqual(attendance.total, 10)
+        transport.close()
+
+    def test_transport_timeout_is_used(self):
+        timeouts = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions['timeout']['read'])
+            return handler(request)
+
+        transport = BARS.BTransport(timeout=1.5)
+        transport._client = httpx.Client(transport=httpx.MockTransport(record), timeout=transport.timeout)
+
+        BARS.BClient('sessionid', transport=transport).get_diary('2024-09-02')
+        BARS.BClient('sessionid', transport=transport, policy=BARS.ResiliencePolicy(timeout=3.0)).get_diary('2024-09-02')
+        self.assertEqual(timeouts, [1.5, 3.0])
+        transport.close()
+
+    def test_chart_endpoints_do_not_block_event_loop(self):
+        """Максимальная задержка цикла событий во время медленных запросов должна оставаться малой."""
+
+        transport = BARS.BTransport()
+
+        async def heartbeat(stop: asyncio.Event) -> float:
+            max_lag = 0.0
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                max_lag = max(max_lag, time.perf_counter() - start - 0.01)
+            return max_lag
+
+        async def main() -> float:
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+            client = BARS.BClientAsync('sessionid', transport=transport, coalesce=False)  # Каждый вызов - отдельный запрос
+            stop = asyncio.Event()
+            monitor = asyncio.create_task(heartbeat(stop))
+            started = time.perf_counter()
+            await asyncio.gather(*(client.get_attendace_data(1, '2000-01-01', '3000-01-01') for _ in range(10)))
+            elapsed = time.perf_counter() - started
+            stop.set()
+            max_lag = await monitor
+            await transport.aclose()
+            self.assertLess(elapsed, 1.5)  # Запросы выполняются параллельно, а не по очереди
+            return max_lag
+
+        self.assertLess(asyncio.run(main()), 0.1)
+
+
+
+class RateLimiterTests(unittest.TestCase):
+
+    def test_token_bucket(self):
+        bucket = BARS.TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01)
+
+    def test_session_buckets_are_independent(self):
+        limiter = BARS.RateLimiter(session_rate=1, session_burst=1)
+        self.assertEqual(limiter._reserve('a'), 0)
+        self.assertEqual(limiter._reserve('b'), 0)
+        self.assertGreater(limiter._reserve('a'), 0.9)
+        self.assertEqual(limiter.stats.requests, 3)
+        self.assertEqual(limiter.stats.delayed, 1)
+
+    def test_transport_limiter_is_shared(self):
+        limiter = BARS.RateLimiter(rate=20, burst=1)
+        transport = BARS.BTransport(rate_limiter=limiter)
+
+        async def main():
+            transport._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                BARS.BClientAsync(str(i), transport=transport).get_diary('2024-09-02') for i in range(5)
+            ))
+            elapsed = time.perf_counter() - started
+            await transport.aclose()
+            return elapsed
+
+        self.assertGreaterEqual(asyncio.run(main()), 0.19)  # 4 ожидания по 0.05 секунды
+        self.assertEqual(limiter.stats.requests, 5)
+        self.assertAlmostEqual(limiter.stats.max_wait, 0.2, delta=0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import datetime
+import unittest
+
+import BARS
+
+from benchmarks.bench_bot import import_bot
+from benchmarks.fake_server import FakeBARS
+
+import_bot()
+from src.utils import commands_utils  # noqa: E402 pyright: ignore
+
+DATE = datetime.date(2024, 9, 3)
+
+
+class WeekTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with FakeBARS() as server, BARS.BClient('sessionid', base_url=server.url) as client:
+            cls.diary = client.get_diary(DATE)
+            cls.homework = client.get_homework(DATE)
+            cls.schedule = client.get_week_schedule(DATE)
+            cls.total_marks = client.get_total_marks()
+            cls.base_url = client.base_url
+
+    def weeks(self) -> dict[str, dict]:
+        return {
+            'diary': commands_utils.proccess_diary(self.diary, DATE),
+            'homework': commands_utils.proccess_homework(self.homework, self.base_url, DATE),
+            'schedule': commands_utils.proccess_schedule(self.schedule, DATE),
+        }
+
+    def test_render_after_storage(self):
+        for kind, week in self.weeks().items():
+            with self.subTest(kind):
+                render = getattr(commands_utils, f'render_{kind}_day')
+                stored = json.loads(json.dumps(week))
+                self.assertTrue(commands_utils.is_current(stored))
+                self.assertEqual(stored['current_weekday'], DATE.weekday())
+                for i in range(len(week['days'])):
+                    self.assertEqual(render(stored, i), render(week, i))
+                self.assertTrue(render(stored, DATE.weekday()).startswith('*03.09.2024*'))
+                self.assertEqual(render(stored, len(week['days'])), '')
+                self.assertEqual(len(week['strings']), len(set(week['strings'])))
+
+    def test_diary_lesson(self):
+        week = self.weeks()['diary']
+        lesson = self.diary[1].lessons[0]
+        text = commands_utils.render_diary_day(week, 1)
+        self.assertIn(f'*{lesson.discipline}*', text)
+        if lesson.mark:
+            self.assertIn(f'{lesson.mark} - {lesson.mark_type}', text)
+
+    def test_total_marks(self):
+        total_marks = json.loads(json.dumps(commands_utils.proccess_total_marks(self.total_marks)))
+        text = commands_utils.render_total_marks(total_marks, 0)
+        self.assertTrue(text.startswith(f'\n*{self.total_marks.subperiods[0].name}*\n'))
+        self.assertIn(f'{self.total_marks.disciplines[0].discipline}: ', text)
+
+    def test_old_format(self):
+        self.assertFalse(commands_utils.is_current(None))
+        self.assertFalse(commands_utils.is_current({'current_weekday': 0, '0': [{'date': '02.09.2024'}]}))
+        self.assertFalse(commands_utils.is_current({'0': '\n*1 четверть*\n'}))
+
+
+if __name__ == '__main__':
+    unittest.main()